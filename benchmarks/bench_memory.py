@@ -0,0 +1,54 @@
+"""
+Benchmark: retained memory per processed record.
+
+Compares plain dicts from process_information, __slots__ records from
+process_record, and a PROCESSED_DTYPE structured array.
+
+Usage:
+    python benchmarks/bench_memory.py [--records N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.records import records_to_array
+
+
+def retained_bytes(build):
+    """Bytes still allocated after `build()` returns its result"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--records', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.records
+
+    print(f"{'arch':<6}{'dict':>12}{'slots':>12}{'structured':>12}  (bytes/record)")
+    for architecture_type in ['NT', 'ASD', 'ADHD']:
+        arch = CognitiveArchitecture(architecture_type, rng=0)
+        infos = [{'content': f'event {i}', 'temporal_context': 'now'} for i in range(n)]
+        records = [arch.process_record(info) for info in infos]
+        baseline = retained_bytes(lambda: None)
+
+        as_dicts = retained_bytes(lambda: [arch.process_information(i) for i in infos])
+        as_slots = retained_bytes(lambda: [arch.process_record(i) for i in infos])
+        as_array = retained_bytes(lambda: records_to_array(records))
+
+        print(f"{architecture_type:<6}"
+              f"{(as_dicts - baseline) / n:>12.1f}"
+              f"{(as_slots - baseline) / n:>12.1f}"
+              f"{(as_array - baseline) / n:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
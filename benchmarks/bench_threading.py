@@ -0,0 +1,56 @@
+"""
+Benchmark: multi-threaded throughput of a shared CognitiveArchitecture.
+
+One architecture instance serves process_information calls from a pool of
+threads. Compares the global NumPy RNG (shared, serialized state) with
+per-thread generators spawned from a seed.
+
+Usage:
+    python benchmarks/bench_threading.py [--calls N] [--threads 1 2 4 8]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tide.core.architecture import CognitiveArchitecture
+
+
+def _worker(architecture, calls):
+    info = {'content': 'benchmark', 'temporal_context': 'now'}
+    for _ in range(calls):
+        architecture.process_information(info)
+
+
+def measure(architecture_type, rng, threads, calls_per_thread):
+    """Records per second with `threads` workers sharing one instance"""
+    architecture = CognitiveArchitecture(architecture_type, rng=rng)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = [pool.submit(_worker, architecture, calls_per_thread)
+                   for _ in range(threads)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return threads * calls_per_thread / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=20000,
+                        help='process_information calls per thread')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'arch':<6}{'rng':<10}{'threads':>8}{'records/s':>14}{'scaling':>9}")
+    for architecture_type in ['NT', 'ASD', 'ADHD']:
+        for label, rng in [('global', None), ('per-thread', 12345)]:
+            baseline = None
+            for threads in args.threads:
+                rate = measure(architecture_type, rng, threads, args.calls)
+                baseline = baseline or rate
+                print(f"{architecture_type:<6}{label:<10}{threads:>8}"
+                      f"{rate:>14,.0f}{rate / baseline:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
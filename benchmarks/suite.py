@@ -0,0 +1,389 @@
+"""
+Benchmark suite: timings of every TIDE hot path, with regression tracking.
+
+Micro benchmarks time single calls of the core APIs; macro benchmarks time
+population-scale workloads. `run` writes machine-readable JSON, and
+`compare` flags benchmarks whose median time per call grew beyond a
+threshold relative to a stored baseline (exit status 1 on regressions).
+
+A benchmark can also name a reference benchmark, timed in the same run, that
+re-implements the original code of its hot path. `run` reports the ratio to
+the reference and exits with status 1 when it exceeds 1 + threshold, so
+such regressions are caught without a stored baseline from the same machine.
+
+Usage:
+    python benchmarks/suite.py run [--output results.json] [--filter REGEX]
+                                   [--group micro|macro] [--min-time S] [--repeats R]
+                                   [--threshold 0.10]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold 0.10]
+"""
+
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+
+# name -> (group, setup); setup() returns (callable, operations per call)
+BENCHMARKS = {}
+# name -> name of the reference benchmark it must not be slower than
+REFERENCES = {}
+
+
+def benchmark(group, name, reference=None):
+    """Register a benchmark setup function, optionally with a reference"""
+    def register(setup):
+        BENCHMARKS[name] = (group, setup)
+        if reference is not None:
+            REFERENCES[name] = reference
+        return setup
+    return register
+
+
+# Micro benchmarks
+
+@benchmark('micro', 'space.compute_element_position')
+def _element_position():
+    from tide.core.dimensional_space import DimensionalSpace
+    space = DimensionalSpace()
+    return lambda: space.compute_element_position('self', 'ASD'), 1
+
+
+@benchmark('micro', 'space.compute_dimensional_distance')
+def _dimensional_distance():
+    from tide.core.dimensional_space import DimensionalSpace
+    space = DimensionalSpace()
+    return lambda: space.compute_dimensional_distance('self', 'time', 'NT'), 1
+
+
+@benchmark('micro', 'engine.compute_integration')
+def _compute_integration():
+    from tide.core.integration import IntegrationEngine
+    engine = IntegrationEngine('NT', rng=0)
+    self_state, time_state = np.array([0.8, 0.2]), np.array([0.2, 0.8])
+    return lambda: engine.compute_integration(self_state, time_state), 1
+
+
+@benchmark('micro', 'engine.compute_integration_asd',
+           reference='baseline.compute_integration_asd')
+def _compute_integration_asd():
+    from tide.core.integration import IntegrationEngine
+    engine = IntegrationEngine('ASD', rng=0)
+    self_state, time_state = np.array([0.8, 0.2]), np.array([0.2, 0.8])
+    return lambda: engine.compute_integration(self_state, time_state), 1
+
+
+@benchmark('micro', 'baseline.compute_integration_asd')
+def _baseline_compute_integration_asd():
+    """
+    The original IntegrationEngine.compute_integration for ASD: dispatch on
+    the type name, np.linalg.norm, a threshold test and a list append
+    """
+    from tide.config import INTEGRATION_PARAMS
+
+    class Engine:
+        def __init__(self):
+            self.architecture = 'ASD'
+            self.params = INTEGRATION_PARAMS
+            self.integration_history = []
+
+        def compute_integration(self, self_state, time_state):
+            if self.architecture == 'NT':
+                raise NotImplementedError
+            elif self.architecture == 'ASD':
+                phi = self._crystallized_integration(self_state, time_state)
+            else:
+                raise NotImplementedError
+            self.integration_history.append(phi)
+            return phi
+
+        def _crystallized_integration(self, self_state, time_state):
+            distance = np.linalg.norm(self_state - time_state)
+            if distance < self.params['boundary_threshold']:
+                return 0.9
+            else:
+                return 0.2
+
+    engine = Engine()
+    self_state, time_state = np.array([0.8, 0.2]), np.array([0.2, 0.8])
+    return lambda: engine.compute_integration(self_state, time_state), 1
+
+
+@benchmark('micro', 'engine.get_integration_stability')
+def _integration_stability():
+    from tide.core.integration import IntegrationEngine
+    engine = IntegrationEngine('ADHD', rng=0)
+    engine.compute_integration_batch(np.random.default_rng(0).random((1000, 2)),
+                                     np.random.default_rng(1).random((1000, 2)))
+    return engine.get_integration_stability, 1
+
+
+@benchmark('micro', 'architecture.process_information')
+def _process_information():
+    from tide.core.architecture import CognitiveArchitecture
+    arch = CognitiveArchitecture('ADHD', rng=0)
+    info = {'content': 'benchmark', 'temporal_context': 'now'}
+    return lambda: arch.process_information(info), 1
+
+
+@benchmark('micro', 'planning.plan_week')
+def _plan_week():
+    from tide.examples.temporal_planning import TemporalPlanningTask
+    task = TemporalPlanningTask('ADHD', rng=0)
+    return task.plan_week, 1
+
+
+@benchmark('micro', 'planning.evaluate_plan_consistency')
+def _plan_consistency():
+    from tide.examples.temporal_planning import TemporalPlanningTask
+    task = TemporalPlanningTask('ADHD', rng=0)
+    return task.evaluate_plan_consistency, 1
+
+
+@benchmark('micro', 'landscape.compute')
+def _landscape():
+    from tide.visualization.landscape import compute_integration_landscape
+    return lambda: compute_integration_landscape('ADHD', 20, seed=0, cache=None), 1
+
+
+@benchmark('micro', 'mapper.create_integration_landscape')
+def _mapper_landscape():
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from tide.visualization.dimensional_mapper import DimensionalMapper
+    mapper = DimensionalMapper()
+
+    def run():
+        plt.close(mapper.create_integration_landscape(seed=0))
+    return run, 1
+
+
+# Macro benchmarks
+
+@benchmark('macro', 'simulator.population_100k_x_100')
+def _population():
+    from tide.core.simulator import ArchitectureSimulator
+    simulator = ArchitectureSimulator({'NT': 40000, 'ASD': 30000, 'ADHD': 30000},
+                                      state_noise=0.05)
+    return lambda: simulator.simulate(100, record=False, seed=0), 100000 * 100
+
+
+@benchmark('macro', 'architecture.process_batch_100k')
+def _process_batch():
+    from tide.core.architecture import CognitiveArchitecture
+    arch = CognitiveArchitecture('ADHD', rng=0)
+    batch = {'content': np.arange(100000), 'temporal_context': np.full(100000, 'now')}
+    return lambda: arch.process_batch(batch), 100000
+
+
+@benchmark('macro', 'engine.compute_integration_batch_100k')
+def _integration_batch():
+    from tide.core.integration import IntegrationEngine
+    engine = IntegrationEngine('NT', rng=0)
+    rng = np.random.default_rng(0)
+    self_states, time_states = rng.random((100000, 2)), rng.random((100000, 2))
+    return lambda: engine.compute_integration_batch(self_states, time_states), 100000
+
+
+@benchmark('macro', 'planning.encoded_consistency_100k_weeks')
+def _encoded_consistency():
+    from tide.examples.temporal_planning import TemporalPlanningTask
+    task = TemporalPlanningTask('ADHD', rng=0)
+    return lambda: task.evaluate_plan_consistency(100000, encoded=True), 100000
+
+
+@benchmark('macro', 'landscape.compute_500x500')
+def _large_landscape():
+    from tide.visualization.landscape import compute_integration_landscape
+    return lambda: compute_integration_landscape('ADHD', 500, seed=0, cache=None), 1
+
+
+@benchmark('macro', 'sweep.grid_3x14520_points')
+def _sweep():
+    from tide.core.sweep import run_sweep
+    grid = {'boundary_threshold': np.linspace(0.05, 1.5, 30),
+            'processing_flexibility': np.linspace(0, 1, 11),
+            'temporal_consistency': np.linspace(0, 1, 11),
+            'planning_horizon': [1, 7, 30, 90]}
+    # Only the axes a kernel reads are evaluated (the rest are broadcast), so
+    # the operations are the points actually computed, not the grid size
+    evaluated = run_sweep(grid, n_steps=1).computed
+    return lambda: run_sweep(grid, n_steps=100, n_agents=100, state_noise=0.1), evaluated
+
+
+@benchmark('macro', 'analytics.single_pass_10m')
+def _analytics():
+    from tide.core.analytics import (EpisodeAccumulator, RollingAccumulator,
+                                     SpectrumAccumulator, analyze)
+    values = np.random.default_rng(0).random(10 ** 7)
+    return lambda: analyze(values, RollingAccumulator(10000), SpectrumAccumulator(4096),
+                           EpisodeAccumulator(0.9, keep=False)), 10 ** 7
+
+
+def time_benchmark(run, min_time, repeats):
+    """
+    Time `run`, timeit style: calibrate a loop count that lasts at least
+    min_time, then take `repeats` samples of seconds per call.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        samples.append((time.perf_counter() - start) / loops)
+    return samples, loops
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(pattern=None, group=None, min_time=0.2, repeats=5):
+    """Run the selected benchmarks and return the JSON-ready report"""
+    selected = [name for name, (bench_group, _) in BENCHMARKS.items()
+                if not (group and bench_group != group)
+                and not (pattern and not re.search(pattern, name))]
+    # References run with the benchmarks that name them
+    selected += [REFERENCES[name] for name in selected
+                 if name in REFERENCES and REFERENCES[name] not in selected]
+    results = {}
+    for name, (bench_group, setup) in BENCHMARKS.items():
+        if name not in selected:
+            continue
+        run, operations = setup()
+        samples, loops = time_benchmark(run, min_time, repeats)
+        median = statistics.median(samples)
+        results[name] = {
+            'group': bench_group,
+            'median': median,
+            'min': min(samples),
+            'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            'loops': loops,
+            'repeats': repeats,
+            'operations': operations,
+            'ops_per_second': operations / median
+        }
+        print(f"{name:<45}{median * 1e6:>14.2f} us/call"
+              f"{operations / median:>16.4g} ops/s", file=sys.stderr)
+
+    for name, reference in REFERENCES.items():
+        if name in results and reference in results:
+            ratio = results[name]['median'] / results[reference]['median']
+            results[name].update(reference=reference, reference_ratio=ratio)
+            print(f"{name:<45}{ratio:>14.2f} x {reference}", file=sys.stderr)
+
+    import tide
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'tide': tide.__version__,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'min_time': min_time
+        },
+        'results': results
+    }
+
+
+def compare_reports(baseline, current, threshold=0.10):
+    """
+    Compare median seconds per call.
+
+    Returns:
+        List of (name, baseline median, current median, ratio, status)
+        where status is 'regression', 'improvement', 'ok', 'new' or 'missing'
+    """
+    rows = []
+    names = list(dict.fromkeys(list(baseline['results']) + list(current['results'])))
+    for name in names:
+        before = baseline['results'].get(name)
+        after = current['results'].get(name)
+        if before is None or after is None:
+            rows.append((name, before and before['median'], after and after['median'],
+                         None, 'new' if before is None else 'missing'))
+            continue
+        ratio = after['median'] / before['median']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, before['median'], after['median'], ratio, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run benchmarks and write JSON')
+    run.add_argument('--output', '-o', help='JSON file (default: stdout)')
+    run.add_argument('--filter', help='only benchmarks whose name matches this regex')
+    run.add_argument('--group', choices=['micro', 'macro'])
+    run.add_argument('--min-time', type=float, default=0.2,
+                     help='minimum seconds per timing sample')
+    run.add_argument('--repeats', type=int, default=5)
+    run.add_argument('--threshold', type=float, default=0.10,
+                     help='relative slowdown against a reference counted as a regression')
+
+    compare = commands.add_parser('compare', help='flag regressions against a baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10,
+                         help='relative slowdown counted as a regression')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        report = run_suite(args.filter, args.group, args.min_time, args.repeats)
+        text = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+        else:
+            print(text)
+        slower = [name for name, result in report['results'].items()
+                  if result.get('reference_ratio', 0) > 1 + args.threshold]
+        for name in slower:
+            print(f"{name}: slower than {report['results'][name]['reference']}",
+                  file=sys.stderr)
+        return 1 if slower else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare_reports(baseline, current, args.threshold)
+    print(f"{'benchmark':<45}{'baseline us':>14}{'current us':>14}{'ratio':>8}  status")
+    for name, before, after, ratio, status in rows:
+        before = f"{before * 1e6:.2f}" if before is not None else '-'
+        after = f"{after * 1e6:.2f}" if after is not None else '-'
+        ratio = f"{ratio:.2f}" if ratio is not None else '-'
+        print(f"{name:<45}{before:>14}{after:>14}{ratio:>8}  {status}")
+    return 1 if any(row[4] == 'regression' for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,6 +10,11 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/HillaryDanan/TIDE",
     packages=find_packages(),
+    entry_points={
+        "console_scripts": [
+            "tide=tide.cli:main",
+        ],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Science/Research",
@@ -0,0 +1,18 @@
+"""
+Shared test fixtures
+"""
+
+import pytest
+from tide.core.registry import REGISTRY, unregister_architecture
+
+@pytest.fixture(autouse=True)
+def restore_registry():
+    """Remove architectures and styles a test registered, whatever the test order"""
+    names = set(REGISTRY.names())
+    styles = dict(REGISTRY.styles)
+    yield
+    for name in REGISTRY.names():
+        if name not in names:
+            unregister_architecture(name)
+    REGISTRY.styles.clear()
+    REGISTRY.styles.update(styles)
@@ -0,0 +1,79 @@
+"""
+Tests for chunked trajectory analytics
+"""
+
+import pytest
+import numpy as np
+from scipy.signal import welch
+from tide.core.analytics import (EpisodeAccumulator, RollingAccumulator,
+                                 SpectrumAccumulator, analyze, count_episodes,
+                                 power_spectrum, rolling_stats, threshold_episodes)
+from tide.core.history import MemmapHistory
+from tide.core.integration import IntegrationEngine
+
+@pytest.mark.parametrize('window, step, chunk_size', [
+    (100, None, 1000), (100, 7, 997), (64, 200, 333), (1000, 1, 4096)
+])
+def test_rolling_stats_match_full_windows(window, step, chunk_size):
+    values = np.random.default_rng(0).random(20011)
+    stats = rolling_stats(values, window, step, chunk_size=chunk_size)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)[::step or window]
+
+    assert len(stats) == len(windows)
+    np.testing.assert_array_equal(stats.starts, np.arange(len(windows)) * (step or window))
+    np.testing.assert_allclose(stats.mean, windows.mean(axis=1))
+    np.testing.assert_allclose(stats.std, windows.std(axis=1), atol=1e-12)
+    np.testing.assert_array_equal(stats.min, windows.min(axis=1))
+    np.testing.assert_array_equal(stats.max, windows.max(axis=1))
+
+def test_power_spectrum_matches_welch_and_finds_nt_oscillation():
+    values = np.random.default_rng(1).random(50000)
+    for segment, overlap, chunk_size in [(256, 0.5, 1000), (1024, 0.75, 9999), (100, 0.0, 77)]:
+        spectrum = power_spectrum(values, segment, overlap, chunk_size=chunk_size)
+        frequencies, power = welch(values, nperseg=segment, noverlap=int(segment * overlap))
+        np.testing.assert_allclose(spectrum.frequencies, frequencies)
+        np.testing.assert_allclose(spectrum.power, power)
+
+    # NT integration oscillates as sin(0.1 * step)
+    engine = IntegrationEngine('NT')
+    phi = engine.compute_integration_batch(np.zeros((20000, 2)), np.full((20000, 2), 0.3))
+    frequency, _ = power_spectrum(phi, 4096).peak()
+    assert frequency == pytest.approx(0.1 / (2 * np.pi), abs=1 / 4096)
+
+    with pytest.raises(ValueError):
+        power_spectrum(values[:100], 256)
+
+def test_episodes_are_tracked_across_chunks():
+    values = np.random.default_rng(2).random(10007)
+    inside = np.diff(np.concatenate(([0], (values >= 0.7).astype(int), [0])))
+    starts = np.flatnonzero(inside == 1)
+    lengths = np.flatnonzero(inside == -1) - starts
+    expected = lengths >= 2
+
+    for chunk_size in [1, 5, 1000, 10 ** 6]:
+        episodes = threshold_episodes(values, 0.7, min_length=2, chunk_size=chunk_size)
+        np.testing.assert_array_equal(episodes.starts, starts[expected])
+        np.testing.assert_array_equal(episodes.lengths, lengths[expected])
+        assert episodes.occupied == lengths[expected].sum()
+
+    below = threshold_episodes(values, 0.7, above=False)
+    assert below.occupied == np.sum(values < 0.7)
+    counts = count_episodes(values, [0.7, 1.1], min_length=2, chunk_size=333)
+    np.testing.assert_array_equal(counts, [expected.sum(), 0])
+
+def test_single_pass_over_memmap_history(tmp_path):
+    engine = IntegrationEngine('ASD', rng=0,
+                               history=MemmapHistory(str(tmp_path / 'asd.phi'), 'ASD'))
+    rng = np.random.default_rng(3)
+    # Alternate aligned (locked) and misaligned stretches
+    offsets = np.repeat(rng.choice([0.0, 1.0], size=50), 200)
+    self_states = np.zeros((len(offsets), 2))
+    engine.compute_integration_batch(self_states, self_states + offsets[:, None])
+
+    rolling, spectrum, lock_in = analyze(
+        engine.integration_history, RollingAccumulator(200), SpectrumAccumulator(256),
+        EpisodeAccumulator(0.9, min_length=10, keep=False), chunk_size=1024)
+    np.testing.assert_allclose(rolling.mean, np.where(offsets[::200] == 0, 0.9, 0.2))
+    assert spectrum.n_segments > 0
+    runs = np.diff(np.concatenate(([1.0], offsets[::200], [1.0])) == 0)
+    assert lock_in.count == np.sum(runs) // 2 and lock_in.starts is None
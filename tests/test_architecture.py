@@ -53,3 +53,37 @@ def test_information_processing():
     assert 'temporal_flexibility' in nt_result
     assert 'temporal_structure' in asd_result
     assert 'temporal_compression' in adhd_result
+
+def test_batch_processing_matches_records():
+    """Batch columns agree with per-record processing"""
+    batch = {'content': ['a', 'b', 'c'], 'temporal_context': ['now', 'soon', 'later']}
+
+    np.random.seed(0)
+    nt = CognitiveArchitecture('NT')
+    expected = [nt.process_information({'content': c, 'temporal_context': t})
+                for c, t in zip(batch['content'], batch['temporal_context'])]
+    np.random.seed(0)
+    columns = nt.process_batch(batch)
+    np.testing.assert_array_equal(columns['temporal_flexibility'],
+                                  [r['temporal_flexibility'] for r in expected])
+    np.testing.assert_array_equal(columns['self_adaptation'],
+                                  [r['self_adaptation'] for r in expected])
+    assert columns['content'].tolist() == batch['content']
+
+    asd = CognitiveArchitecture('ASD')
+    record = asd.process_information({'content': 'a'})
+    columns = asd.process_batch(batch)
+    assert columns['schedule'][0] == record['temporal_structure']['schedule']
+    assert columns['schedule'][0] is columns['schedule'][2]  # Shared, not rebuilt
+    assert columns['rule_consistency'].tolist() == [record['rule_consistency']] * 3
+
+    adhd = CognitiveArchitecture('ADHD', rng=1)
+    structured = np.zeros(4, dtype=[('content', 'U8'), ('urgency', 'f8')])
+    columns = adhd.process_batch(structured)
+    assert set(columns['intensity_focus']) <= {0.1, 0.9}
+    assert columns['past_discount'].tolist() == [0.9] * 4
+    assert columns['architecture_signature'].tolist() == ['ADHD'] * 4
+
+def test_batch_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        CognitiveArchitecture('NT').process_batch({'content': ['a'], 'temporal_context': []})
@@ -0,0 +1,169 @@
+"""
+Tests for checkpoint and resume
+"""
+
+import threading
+import pytest
+import numpy as np
+from tide import ArchitectureSimulator
+from tide.config import ARCHITECTURE_CONFIGS, INTEGRATION_PARAMS
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.checkpoint import (CheckpointWriter, capture, load_checkpoint, restore,
+                                  save_checkpoint)
+from tide.core.history import MemmapHistory
+from tide.core.integration import IntegrationEngine
+from tide.core.registry import (IntegrationStyle, get_architecture, register_architecture,
+                                register_style, update_architecture)
+
+def _states(n, seed):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 2)), rng.random((n, 2))
+
+@pytest.mark.parametrize('rng', [0, 'generator', 'random_state'])
+def test_engine_and_architecture_resume_bit_identically(tmp_path, rng):
+    """Restored objects sharing a random source continue the same stream"""
+    rng = {'generator': np.random.default_rng(5),
+           'random_state': np.random.RandomState(3)}.get(rng, rng)
+    engine = IntegrationEngine('ADHD', rng=rng)
+    arch = CognitiveArchitecture('ADHD', rng=rng)
+    self_states, time_states = _states(300, 1)
+    for i in range(100):
+        engine.compute_integration(self_states[i], time_states[i])
+    path = str(tmp_path / 'objects.npz')
+    save_checkpoint(path, capture(engine=engine, arch=arch, step=100))
+
+    def run(engine, arch, start):
+        phi = [engine.compute_integration(s, t)
+               for s, t in zip(self_states[start:], time_states[start:])]
+        focus = [arch.process_information({})['intensity_focus'] for _ in range(10)]
+        return phi, focus, engine.get_integration_stability(True)
+
+    expected = run(engine, arch, 100)
+    restored = restore(path)
+    assert restored['step'] == 100
+    assert run(restored['engine'], restored['arch'], restored['step']) == expected
+
+def test_nt_phase_and_memmap_history_resume(tmp_path):
+    """The NT oscillation phase and a memory-mapped history carry over"""
+    self_states, time_states = _states(200, 2)
+    engine = IntegrationEngine('NT', history=MemmapHistory(str(tmp_path / 'nt.phi'), 'NT'))
+    for i in range(80):
+        engine.compute_integration(self_states[i], time_states[i])
+    state = capture(engine=engine)
+    # Work done after the checkpoint is discarded on resume
+    for i in range(80, 120):
+        engine.compute_integration(self_states[i], time_states[i])
+    engine.integration_history.close()
+
+    resumed = restore(state)['engine']
+    phi = [resumed.compute_integration(s, t)
+           for s, t in zip(self_states[80:], time_states[80:])]
+    reference = IntegrationEngine('NT')
+    expected = [reference.compute_integration(s, t)
+                for s, t in zip(self_states, time_states)][80:]
+    assert phi == expected
+    assert resumed.integration_history.total_count == 200
+    assert resumed.get_integration_stability(True) == reference.get_integration_stability(True)
+    resumed.integration_history.close()
+
+CRASH_AT = [None]
+
+def _crashing_integrate(distance, step, params, generator):
+    """Dynamic kernel raising at step CRASH_AT[0], to interrupt runs"""
+    if step == CRASH_AT[0]:
+        raise RuntimeError('simulated crash')
+    return get_architecture('ADHD').style.integrate(distance, step, params, generator)
+
+@pytest.fixture
+def crashing():
+    dynamic = get_architecture('ADHD').style
+    register_style(IntegrationStyle('test_crashing', _crashing_integrate, dynamic.process,
+                                    dynamic.process_batch, dynamic.plan))
+    register_architecture('TEST_CRASHING', dict(ARCHITECTURE_CONFIGS['ADHD'],
+                                                integration_style='test_crashing'),
+                          replace=True)
+    yield CRASH_AT
+    CRASH_AT[0] = None
+
+@pytest.mark.parametrize('state_noise,record', [(0.0, True), (0.05, False), (0.05, True)])
+def test_interrupted_simulation_resumes_identically(tmp_path, crashing, state_noise, record):
+    population = {'NT': 4, 'ASD': 3, 'ADHD': 4, 'TEST_CRASHING': 2}
+    simulator = ArchitectureSimulator(population, state_noise=state_noise, seed=11)
+    expected = simulator.simulate(95, record=record)
+
+    path = str(tmp_path / 'run.npz')
+    crashing[0] = 57
+    with pytest.raises(RuntimeError):
+        simulator.simulate(95, record=record, checkpoint=path, checkpoint_every=10)
+    saved = load_checkpoint(path)
+    assert saved['step'] == 50 and 'phi' not in saved
+    assert (saved['trajectory'] is not None) == record
+    if record:
+        # Recorded rows live in the side file, which holds rows past the checkpoint
+        assert saved['trajectory'] == 'run.phi.npy'
+        np.testing.assert_array_equal(np.sort(np.load(tmp_path / 'run.phi.npy')[:57]),
+                                      np.sort(expected.phi[:57]))
+
+    crashing[0] = None
+    # A checkpoint moved together with its trajectory still resumes
+    moved = tmp_path / 'moved'
+    moved.mkdir()
+    for name in ('run.npz', 'run.phi.npy'):
+        if (tmp_path / name).exists():
+            (tmp_path / name).rename(moved / name)
+    path = str(moved / 'run.npz')
+    result = ArchitectureSimulator.resume(path)
+    np.testing.assert_array_equal(result.mean_phi, expected.mean_phi)
+    np.testing.assert_array_equal(result.stability, expected.stability)
+    np.testing.assert_array_equal(result.agent_types, expected.agent_types)
+    if record:
+        np.testing.assert_array_equal(result.phi, expected.phi)
+    else:
+        assert result.phi is None
+    # The final checkpoint holds the completed run
+    assert load_checkpoint(path)['step'] == 95
+    np.testing.assert_array_equal(ArchitectureSimulator.resume(path).mean_phi,
+                                  expected.mean_phi)
+
+def test_changed_integration_params_are_rejected(tmp_path, monkeypatch):
+    path = str(tmp_path / 'run.npz')
+    expected = ArchitectureSimulator({'ASD': 2}).simulate(20, checkpoint=path)
+    monkeypatch.setitem(INTEGRATION_PARAMS, 'boundary_threshold', 0.2)
+    with pytest.raises(ValueError, match='params'):
+        ArchitectureSimulator.resume(path)
+    monkeypatch.undo()
+    np.testing.assert_array_equal(ArchitectureSimulator.resume(path).phi, expected.phi)
+
+def test_changed_architecture_is_rejected(tmp_path):
+    register_architecture('TEST_CHECKPOINTED', dict(ARCHITECTURE_CONFIGS['NT']),
+                          replace=True)
+    path = str(tmp_path / 'run.npz')
+    ArchitectureSimulator({'TEST_CHECKPOINTED': 2}).simulate(20, checkpoint=path)
+    state = capture(arch=CognitiveArchitecture('TEST_CHECKPOINTED'))
+
+    update_architecture('TEST_CHECKPOINTED', temporal_consistency=0.1)
+    with pytest.raises(ValueError, match='changed'):
+        ArchitectureSimulator.resume(path)
+    with pytest.raises(ValueError, match='changed'):
+        restore(state)
+
+def test_writer_keeps_latest_snapshot(tmp_path):
+    path = str(tmp_path / 'latest.npz')
+    hooks = []
+    with CheckpointWriter(path, before_write=lambda: hooks.append(threading.get_ident())) \
+            as writer:
+        for step in range(50):
+            writer.submit({'step': step, 'values': np.full(1000, step)})
+        writer.flush()
+        assert load_checkpoint(path)['step'] == 49
+        assert writer.writes + writer.replaced == 50
+        # The hook runs on the writer thread, once per write
+        assert len(hooks) == writer.writes and threading.get_ident() not in hooks
+    with pytest.raises(ValueError):
+        writer.submit({'step': 50})
+
+    state = load_checkpoint(path)
+    np.testing.assert_array_equal(state['values'], np.full(1000, 49))
+    np.save(str(tmp_path / 'plain.npy'), np.zeros(3))
+    with pytest.raises(ValueError):
+        load_checkpoint(str(tmp_path / 'plain.npy'))
@@ -0,0 +1,126 @@
+"""
+Tests for the tide command
+"""
+
+import functools
+import io
+import json
+import multiprocessing
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+import numpy as np
+from tide import cli
+from tide.cli import main, run_batch
+from tide.config import ARCHITECTURE_CONFIGS
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.columnar import load_columns
+from tide.core.integration import IntegrationEngine
+from tide.core.registry import register_architecture
+
+def _write_events(path, n):
+    with open(path, 'w') as f:
+        for i in range(n):
+            record = {'id': i, 'content': f'event {i}'}
+            if i % 4 == 0:
+                record['self_state'] = [0.1 * (i % 9), 0.4]
+                record['time_state'] = [0.3, 0.2]
+            f.write(json.dumps(record) + '\n')
+            if i % 50 == 0:
+                f.write('\n')
+    return str(path)
+
+def _read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_records_are_processed_and_integrated_in_order(tmp_path):
+    source = _write_events(tmp_path / 'events.jsonl', 300)
+    stats = run_batch(source, str(tmp_path / 'out.jsonl'), 'NT', chunk_size=64)
+    records = _read_jsonl(tmp_path / 'out.jsonl')
+
+    assert stats['records'] == 300 and stats['chunks'] == 5
+    assert [record['id'] for record in records] == list(range(300))
+    assert set(records[1]) == {'id', 'content', 'temporal_flexibility', 'self_adaptation',
+                               'architecture_signature', 'phi'}
+    # Φ continues across chunk boundaries as one engine's stream would
+    engine = IntegrationEngine('NT')
+    arch = CognitiveArchitecture('NT')
+    expected = [engine.compute_integration(
+        np.asarray(record.get('self_state', arch.self_position)),
+        np.asarray(record.get('time_state', arch.time_position))) for record in records]
+    np.testing.assert_allclose([record['phi'] for record in records], expected)
+
+@pytest.mark.parametrize('architecture', ['ASD', 'ADHD'])
+def test_output_does_not_depend_on_worker_count(tmp_path, architecture):
+    source = _write_events(tmp_path / 'events.jsonl', 500)
+    outputs = []
+    for workers in (1, 2):
+        output = str(tmp_path / f'out{workers}.jsonl')
+        run_batch(source, output, architecture, chunk_size=70, workers=workers, seed=3)
+        with open(output, 'rb') as f:
+            outputs.append(f.read())
+    assert outputs[0] == outputs[1]
+    assert _read_jsonl(tmp_path / 'out1.jsonl')[0]['architecture_signature'] == architecture
+
+def test_modes_and_columnar_output(tmp_path):
+    source = _write_events(tmp_path / 'events.jsonl', 200)
+    run_batch(source, str(tmp_path / 'phi.jsonl'), 'ASD', mode='integrate')
+    assert set(_read_jsonl(tmp_path / 'phi.jsonl')[1]) == {'id', 'content', 'phi'}
+
+    run_batch(source, str(tmp_path / 'columns'), 'ASD', output_format='columnar',
+              chunk_size=32)
+    result = load_columns(str(tmp_path / 'columns'))
+    assert len(result) == 200
+    assert 'schedule' not in result and result['rule_consistency'][0] == 0.9
+    assert result.metadata['mode'] == 'both'
+    with pytest.raises(ValueError):
+        run_batch(source, str(tmp_path / 'columns'), 'ASD', output_format='columnar')
+
+def test_command_line_streams_stdin_to_stdout(monkeypatch, capsysbinary):
+    lines = b'{"content": "a"}\n\n{"content": "b", "phi": 2}\n'
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(lines)))
+    assert main(['-a', 'ADHD', '--stats']) == 0
+    captured = capsysbinary.readouterr()
+    records = [json.loads(line) for line in captured.out.splitlines()]
+    assert [record['content'] for record in records] == ['a', 'b']
+    assert all(0 <= record['phi'] <= 1 for record in records)
+    assert b'2 records' in captured.err and b'records/s' in captured.err
+
+def test_invalid_input_is_reported(monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'{"a": 1}\n\n[1]\n')))
+    assert main([]) == 1
+    # Records are named by their input line, blank lines included
+    assert 'Record 3 is not a JSON object' in capsys.readouterr().err
+    assert main(['-a', 'INVALID']) == 1
+    with pytest.raises(SystemExit):
+        main(['--mode', 'other'])
+
+@pytest.mark.parametrize('state,message', [
+    ('null', 'got null'), ('[0.1]', 'got [0.1]'), ('"near"', 'got "near"'),
+    ('[0.1, null]', 'got [0.1, null]')])
+def test_invalid_states_name_the_record(tmp_path, state, message):
+    lines = ['{"content": "a"}', '', '{"content": "a"}', '  ', '{"content": "a"}']
+    lines[4] = f'{{"content": "b", "time_state": {state}}}'
+    source = tmp_path / 'events.jsonl'
+    source.write_text('\n'.join(lines) + '\n')
+    with pytest.raises(ValueError, match='Record 5 has an invalid time_state: .*' + re.escape(message)):
+        run_batch(str(source), str(tmp_path / 'out.jsonl'), chunk_size=2)
+    # Processing alone does not read the states
+    run_batch(str(source), str(tmp_path / 'out.jsonl'), mode='process')
+
+
+def test_runtime_architectures_need_one_worker_under_spawn(tmp_path, monkeypatch):
+    config = dict(ARCHITECTURE_CONFIGS['NT'])
+    register_architecture('RUNTIME', config)
+    source = tmp_path / 'events.jsonl'
+    source.write_text('{"content": "a"}\n' * 4)
+    spawn = functools.partial(ProcessPoolExecutor,
+                              mp_context=multiprocessing.get_context('spawn'))
+    monkeypatch.setattr(cli, 'ProcessPoolExecutor', spawn)
+    with pytest.raises(ValueError, match='registered or changed at runtime'):
+        run_batch(str(source), str(tmp_path / 'out.jsonl'), architecture='RUNTIME',
+                  chunk_size=2, workers=2)
+    # Built-in architectures are seen by spawned workers
+    run_batch(str(source), str(tmp_path / 'out.jsonl'), chunk_size=2, workers=2)
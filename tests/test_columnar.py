@@ -0,0 +1,92 @@
+"""
+Tests for columnar result export
+"""
+
+import pytest
+import numpy as np
+from tide.config import ARCHITECTURE_CONFIGS
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.columnar import (ColumnWriter, load_columns, save_columns, save_records,
+                                save_replicates, save_signatures, save_simulation)
+from tide.core.replicates import run_replicates
+from tide.core.simulator import ArchitectureSimulator
+
+def test_simulation_round_trip(tmp_path):
+    result = ArchitectureSimulator({'NT': 5, 'ASD': 3, 'ADHD': 4}).simulate(20, seed=0)
+    save_simulation(result, str(tmp_path / 'sim'), metadata={'study': 'test'})
+    loaded = load_columns(str(tmp_path / 'sim'))
+
+    assert isinstance(loaded.columns['mean_phi'], np.memmap)
+    np.testing.assert_array_equal(loaded['agent_type'], result.agent_types)
+    np.testing.assert_array_equal(loaded['phi'], result.phi)
+    assert loaded.metadata == {'study': 'test', 'n_steps': 20}
+    assert loaded.architectures['ASD']['config'] == ARCHITECTURE_CONFIGS['ASD']
+    assert loaded.architectures['NT']['mapping']['self'] == [0.8, 0.2]
+
+    frame = loaded.to_dataframe()
+    assert list(frame.columns) == ['agent_type', 'mean_phi', 'stability']
+    assert np.shares_memory(frame['mean_phi'].to_numpy(), loaded.columns['mean_phi'])
+    assert frame.groupby('agent_type', observed=True).size().to_dict() == \
+        {'ADHD': 4, 'ASD': 3, 'NT': 5}
+
+    with pytest.raises(ValueError):
+        save_simulation(result, str(tmp_path / 'sim'))
+    save_simulation(result, str(tmp_path / 'sim'), overwrite=True)
+
+def test_other_outputs(tmp_path):
+    replicates = run_replicates(ArchitectureSimulator({'NT': 2, 'ADHD': 2}), 3, n_steps=5)
+    save_replicates(replicates, str(tmp_path / 'replicates'))
+    loaded = load_columns(str(tmp_path / 'replicates'))
+    assert len(loaded) == 12
+    np.testing.assert_array_equal(loaded['mean_phi'], replicates.mean_phi.ravel())
+
+    arch = CognitiveArchitecture('ADHD', rng=0)
+    records = [arch.process_record({'content': i}) for i in range(10)]
+    save_records(records, str(tmp_path / 'records'))
+    frame = load_columns(str(tmp_path / 'records')).to_dataframe()
+    assert (frame['architecture'] == 'ADHD').all()
+    assert frame['intensity_focus'].isin([0.1, 0.9]).all()
+    assert frame['adherence'].isna().all()
+
+    save_signatures(['NT', 'ASD'], str(tmp_path / 'signatures'),
+                    consistency={'ASD': 1.0})
+    frame = load_columns(str(tmp_path / 'signatures')).to_dataframe()
+    assert frame['planning_horizon'].tolist() == [30, 90]
+    assert np.isnan(frame['plan_consistency'][0]) and frame['plan_consistency'][1] == 1.0
+
+def test_column_writer_appends_batches(tmp_path):
+    path = str(tmp_path / 'appended')
+    with ColumnWriter(path, ['NT'], {'batches': 3}) as writer:
+        for start, architectures in ((0, ['ASD', 'NT', 'ASD', 'NT']),
+                                     (4, ['ASD', 'NT', 'ADHD', 'NT']),
+                                     (6, ['NT', 'NT', 'NT', 'NT'])):
+            writer.append({'phi': np.arange(start, start + 4, dtype=float),
+                           'flag': np.arange(start, start + 4) % 2 == 0,
+                           'architecture': np.array(architectures)})
+        assert not (tmp_path / 'appended' / 'schema.json').exists()
+    result = load_columns(path)
+    assert len(result) == 12 and result.metadata == {'batches': 3}
+    np.testing.assert_array_equal(result['phi'], np.r_[0:4, 4:8, 6:10])
+    assert isinstance(result.columns['phi'], np.memmap)
+    assert result['flag'].dtype == bool
+    assert result['architecture'][:6].tolist() == ['ASD', 'NT', 'ASD', 'NT', 'ASD', 'NT']
+    assert result.categories('architecture') == ['ASD', 'NT', 'ADHD']
+
+    with pytest.raises(RuntimeError):
+        with ColumnWriter(str(tmp_path / 'failed')) as writer:
+            writer.append({'phi': np.zeros(3)})
+            raise RuntimeError('interrupted')
+    with pytest.raises(ValueError):
+        load_columns(str(tmp_path / 'failed'))
+    with ColumnWriter(str(tmp_path / 'mismatched')) as writer:
+        writer.append({'phi': np.zeros(3)})
+        with pytest.raises(ValueError):
+            writer.append({'stability': np.zeros(3)})
+        with pytest.raises(ValueError):
+            writer.append({'phi': np.zeros((3, 2))})
+
+def test_invalid_inputs(tmp_path):
+    with pytest.raises(ValueError):
+        save_columns(str(tmp_path / 'bad'), {'objects': np.array([{}, []], dtype=object)})
+    with pytest.raises(ValueError):
+        load_columns(str(tmp_path / 'missing'))
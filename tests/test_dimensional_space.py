@@ -0,0 +1,123 @@
+"""
+Tests for dimensional space mapping
+"""
+
+import pytest
+import numpy as np
+from tide.core.dimensional_space import DimensionalSpace
+
+def test_element_positions():
+    """Known elements map to their architecture positions, others to neutral"""
+    space = DimensionalSpace()
+
+    np.testing.assert_array_equal(space.compute_element_position('self', 'ASD'), [0.2, 0.8])
+    np.testing.assert_array_equal(space.compute_element_position('time', 'ADHD'), [0.8, 0.2])
+    np.testing.assert_array_equal(space.compute_element_position('social', 'NT'), [0.5, 0.5])
+    np.testing.assert_array_equal(space.compute_element_position('unknown', 'NT'), [0.5, 0.5])
+
+    with pytest.raises(ValueError):
+        space.compute_element_position('self', 'INVALID')
+
+def test_bulk_queries_match_single_lookups():
+    """Bulk position and distance queries agree with per-element calls"""
+    space = DimensionalSpace()
+    elements = ['self', 'time', 'emotion', 'logic', 'social', 'unknown']
+    pairs = [(a, b) for a in elements for b in elements]
+
+    for arch in ['NT', 'ASD', 'ADHD']:
+        expected = [space.compute_element_position(e, arch) for e in elements]
+        np.testing.assert_array_equal(space.positions(elements, arch), expected)
+
+        expected = [np.linalg.norm(space.compute_element_position(a, arch) -
+                                   space.compute_element_position(b, arch))
+                    for a, b in pairs]
+        np.testing.assert_allclose(space.distances(pairs, arch), expected)
+
+        ids = space.element_ids(elements)
+        id_pairs = np.stack(np.meshgrid(ids, ids, indexing='ij'), axis=-1).reshape(-1, 2)
+        np.testing.assert_array_equal(space.distances(id_pairs, arch),
+                                      space.distances(pairs, arch))
+
+def test_returned_positions_are_independent():
+    """Mutating a returned position must not corrupt the shared table"""
+    space = DimensionalSpace()
+    position = space.compute_element_position('self', 'NT')
+    position[:] = 0.0
+    np.testing.assert_array_equal(space.compute_element_position('self', 'NT'), [0.8, 0.2])
+
+def test_standalone_spaces_of_any_dimensionality():
+    space = DimensionalSpace({
+        'A': {'self': [1, 0, 0], 'time': [0, 1, 0]},
+        'B': {'self': [0, 0, 1], 'memory': [1, 1, 1]}
+    }, dimensions=['x', 'y', 'z'])
+    assert space.ndim == 3 and space.dimensions == ('x', 'y', 'z')
+    assert space.elements == ['self', 'time', 'memory']
+    assert space.feature_vectors == {}
+    np.testing.assert_array_equal(space.compute_element_position('time', 'B'), [0.5] * 3)
+    np.testing.assert_array_equal(space.positions(['self', 'unknown'], 'B'),
+                                  [[0, 0, 1], [0.5, 0.5, 0.5]])
+    assert space.compute_dimensional_distance('self', 'time', 'A') == pytest.approx(np.sqrt(2))
+    np.testing.assert_allclose(space.distances([('self', 'memory')], 'B'), [np.sqrt(2)])
+    matrix = space.distance_matrix('A')
+    positions = space.registry.positions[space.registry.index('A')]
+    np.testing.assert_allclose(matrix, np.linalg.norm(
+        positions[:, np.newaxis] - positions[np.newaxis], axis=-1))
+    assert matrix.shape == (4, 4) and not matrix.flags.writeable
+
+    with pytest.raises(ValueError):
+        space.compute_element_position('self', 'NT')
+    with pytest.raises(ValueError):
+        DimensionalSpace({'A': {'self': [1, 0], 'time': [0, 1, 0]}})
+
+def test_nearest_element_queries_match_brute_force():
+    rng = np.random.default_rng(0)
+    names = [f'element_{i}' for i in range(2000)]
+    positions = rng.random((2000, 16))
+    space = DimensionalSpace.from_arrays(names, positions, ['NT', 'ASD'])
+
+    distances = np.linalg.norm(positions - positions[7], axis=1)
+    order = np.argsort(distances)[1:6]
+    nearest = space.nearest_elements('element_7', k=5, architecture='ASD')
+    assert [name for name, _ in nearest] == [names[i] for i in order]
+    np.testing.assert_allclose([d for _, d in nearest], distances[order])
+
+    radius = np.sort(distances)[30]
+    within = space.elements_within('element_7', radius)
+    inside = np.flatnonzero((distances <= radius) & (np.arange(2000) != 7))
+    assert sorted(name for name, _ in within) == sorted(names[i] for i in inside)
+    assert [d for _, d in within] == sorted(d for _, d in within)
+
+    point = rng.random(16)
+    assert space.nearest_elements(point, k=1)[0][0] == names[
+        np.argmin(np.linalg.norm(positions - point, axis=1))]
+    with pytest.raises(ValueError):
+        space.nearest_elements([0.5, 0.5])
+    for k in (0, -1):
+        with pytest.raises(ValueError, match='k must be'):
+            space.nearest_elements('element_7', k=k)
+
+def test_neighbour_queries_on_empty_spaces_and_unknown_elements():
+    empty = DimensionalSpace.from_arrays([], np.empty((0, 3)))
+    assert empty.nearest_elements([0.1, 0.2, 0.3], k=3) == []
+    assert empty.elements_within([0.1, 0.2, 0.3], 1.0) == []
+
+    space = DimensionalSpace()
+    for query in (lambda e: space.nearest_elements(e),
+                  lambda e: space.elements_within(e, 0.5),
+                  lambda e: empty.nearest_elements(e)):
+        with pytest.raises(ValueError, match='Unknown element'):
+            query('no_such_element')
+
+def test_registry_index_follows_updates():
+    from tide.config import ARCHITECTURE_CONFIGS
+    from tide.core.registry import register_architecture, update_architecture
+
+    register_architecture('TEST_INDEXED', dict(ARCHITECTURE_CONFIGS['NT']), mapping={
+        'self': [0.0, 0.0], 'time': [0.1, 0.0], 'emotion': [1.0, 1.0]})
+    space = DimensionalSpace()
+    assert space.nearest_elements('self', 1, 'TEST_INDEXED')[0][0] == 'time'
+    index = space.element_index('TEST_INDEXED')
+    assert space.element_index('TEST_INDEXED') is index
+
+    update_architecture('TEST_INDEXED', mapping={'emotion': [0.0, 0.05]})
+    assert space.nearest_elements('self', 1, 'TEST_INDEXED') == [('emotion', 0.05)]
@@ -0,0 +1,91 @@
+"""
+Tests for the multi-architecture ensemble executor
+"""
+
+import threading
+from concurrent.futures import CancelledError
+import pytest
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.ensemble import EnsembleExecutor, FastestWins, SignatureWeighted
+
+class BlockedArchitecture(CognitiveArchitecture):
+    """Answers only once released"""
+
+    def __init__(self, architecture_type):
+        super().__init__(architecture_type)
+        self.release = threading.Event()
+
+    def process_information(self, information):
+        self.release.wait(5)
+        return super().process_information(information)
+
+def test_signature_weighted_combination():
+    with EnsembleExecutor(['NT', 'ASD', 'ADHD'], rng=0) as ensemble:
+        result = ensemble.process({'content': 'test', 'temporal_context': 'now'})
+    assert result.complete
+    assert list(ensemble.members) == ['NT', 'ASD', 'ADHD']
+    assert set(result.outputs) == {'NT', 'ASD', 'ADHD'}
+    combined = result.combined
+    # Fields a single member produces pass through unchanged
+    assert combined['rule_consistency'] == pytest.approx(result.outputs['ASD']['rule_consistency'])
+    assert combined['intensity_focus'] == pytest.approx(result.outputs['ADHD']['intensity_focus'])
+    assert combined['architecture_signature'] == list(result.outputs)
+
+    combine = SignatureWeighted('processing_flexibility')
+    signatures = {'a': {'processing_flexibility': 1.0}, 'b': {'processing_flexibility': 3.0}}
+    assert combine({'a': {'x': 0.0, 'tag': 'a'}, 'b': {'x': 1.0, 'tag': 'b'}},
+                   signatures) == {'x': 0.75, 'tag': 'b', 'architecture_signature': ['a', 'b']}
+
+def test_budget_returns_partial_results():
+    slow = BlockedArchitecture('ASD')
+    ensemble = EnsembleExecutor({'fast': 'NT', 'slow': slow}, budget=0.05)
+    result = ensemble.process({'content': 'test'})
+    assert result.late == ['slow'] and not result.complete
+    assert list(result.outputs) == ['fast']
+    assert 'temporal_flexibility' in result.combined
+
+    slow.release.set()
+    ensemble.close()
+    ensemble._pool.shutdown(wait=True)
+    stats = ensemble.latency_stats()
+    assert stats['slow']['late'] == 1 and stats['slow']['calls'] == 1
+    assert stats['slow']['p50_s'] >= 0.05 > stats['fast']['p50_s']
+
+def test_close_cancels_queued_members():
+    slow = BlockedArchitecture('ASD')
+    ensemble = EnsembleExecutor({'slow': slow, 'queued': 'NT'}, max_workers=1)
+    results = []
+    request = threading.Thread(target=lambda: results.append(ensemble.process({})))
+    request.start()
+    while not ensemble._pending:
+        pass
+    ensemble.close()
+    slow.release.set()
+    request.join(5)
+    ensemble._pool.shutdown(wait=True)
+    assert list(results[0].outputs) == ['slow']
+    assert isinstance(results[0].errors['queued'], CancelledError)
+    assert ensemble.latency_stats()['queued']['calls'] == 0
+    assert not ensemble._pending
+
+def test_fastest_wins_and_errors():
+    slow = BlockedArchitecture('ASD')
+    with EnsembleExecutor([slow, 'NT', 'NT'], combiner=FastestWins()) as ensemble:
+        assert list(ensemble.members) == ['ASD', 'NT', 'NT#2']
+        result = ensemble.process({'content': 'test'})
+        slow.release.set()
+    assert result.late == [] and 'ASD' not in result.outputs
+    assert result.combined == result.outputs[next(iter(result.outputs))]
+
+    class Broken(CognitiveArchitecture):
+        def process_information(self, information):
+            raise RuntimeError('broken')
+
+    with EnsembleExecutor({'ok': 'ADHD', 'broken': Broken('NT')}) as ensemble:
+        result = ensemble.process({'content': 'test'})
+        assert isinstance(result.errors['broken'], RuntimeError)
+        assert list(result.outputs) == ['ok']
+        assert ensemble.latency_stats()['broken']['errors'] == 1
+
+    with pytest.raises(ValueError):
+        EnsembleExecutor([])
@@ -0,0 +1,60 @@
+"""
+Tests for headless batch figure export
+"""
+
+import pytest
+import matplotlib
+import matplotlib.pyplot as plt
+from tide.visualization.export import FigureSpec, export_figures, summarize_timings
+
+def test_export_in_process(tmp_path):
+    specs = [
+        FigureSpec('architecture_comparison', str(tmp_path / 'comparison.png'),
+                   elements=['self', 'time']),
+        FigureSpec('integration_landscape', str(tmp_path / 'landscape.svg'),
+                   resolution=8, seed=0),
+    ]
+    results = export_figures(specs)
+
+    assert [r.path for r in results] == [s.path for s in specs]
+    assert (tmp_path / 'comparison.png').read_bytes()[:4] == b'\x89PNG'
+    assert b'<svg' in (tmp_path / 'landscape.svg').read_bytes()
+    assert all(r.build_seconds > 0 and r.save_seconds > 0 for r in results)
+    # Figures are closed once saved
+    assert plt.get_fignums() == []
+    assert summarize_timings(results)['integration_landscape']['count'] == 1
+
+def test_export_keeps_the_callers_backend(tmp_path, monkeypatch):
+    """An interactive session is not switched to a headless backend"""
+    switches = []
+    monkeypatch.setattr(matplotlib, 'use', lambda *args, **kwargs: switches.append(args))
+    backend = matplotlib.get_backend()
+    export_figures([FigureSpec('integration_landscape', str(tmp_path / 'landscape.pdf'),
+                               resolution=8, seed=0)])
+    assert switches == [] and matplotlib.get_backend() == backend
+    assert (tmp_path / 'landscape.pdf').read_bytes()[:4] == b'%PDF'
+
+def test_export_across_workers(tmp_path):
+    specs = [FigureSpec('integration_landscape', str(tmp_path / f'landscape_{seed}.png'),
+                        dpi=50, resolution=8, seed=seed)
+             for seed in range(4)]
+    results = export_figures(specs, workers=2)
+    assert [r.path for r in results] == [s.path for s in specs]
+    assert all((tmp_path / f'landscape_{seed}.png').exists() for seed in range(4))
+
+def test_spec_validation():
+    with pytest.raises(ValueError):
+        FigureSpec('histogram', 'out.png')
+    with pytest.raises(ValueError):
+        FigureSpec('integration_landscape', 'out.gif')
+
+def test_every_figure_is_styled_without_touching_global_style():
+    from tide.visualization.dimensional_mapper import DimensionalMapper
+    mapper = DimensionalMapper()
+    with matplotlib.rc_context():
+        plt.style.use('default')
+        fig = mapper.create_architecture_comparison(elements=['self', 'time'])
+        # The style applies to each figure, even after the caller resets it
+        assert fig.axes[0].xaxis.get_gridlines()[0].get_visible()
+        assert not matplotlib.rcParams['axes.grid']
+        plt.close(fig)
@@ -0,0 +1,148 @@
+"""
+Tests for bounded integration history
+"""
+
+import pytest
+import numpy as np
+from tide.config import INTEGRATION_PARAMS
+from tide.core.history import IntegrationHistory, MemmapHistory
+from tide.core.integration import IntegrationEngine
+
+def test_history_is_bounded_and_ordered():
+    """Only the most recent values are retained, oldest first"""
+    history = IntegrationHistory(capacity=5)
+    for value in range(12):
+        history.append(value)
+
+    assert len(history) == 5
+    assert history.total_count == 12
+    assert history.tolist() == [7, 8, 9, 10, 11]
+
+def test_streaming_moments_match_numpy():
+    """Running window and lifetime moments agree with a full recompute"""
+    rng = np.random.default_rng(0)
+    history = IntegrationHistory(capacity=64)
+    seen = []
+    for size in rng.integers(1, 100, size=40):
+        values = rng.random(size)
+        if size % 2:
+            history.extend(values)
+        else:
+            for value in values:
+                history.append(value)
+        seen.extend(values)
+
+    np.testing.assert_allclose(history.to_array(), seen[-64:])
+    assert history.window_std() == pytest.approx(np.std(seen[-64:]))
+    assert history.lifetime_std() == pytest.approx(np.std(seen))
+
+def test_appends_defer_moments_until_read():
+    """Reads interleaved with appends, and checkpoints between folds"""
+    rng = np.random.default_rng(4)
+    history = IntegrationHistory(capacity=16)
+    seen = []
+    for i, value in enumerate(rng.random(100)):
+        history.append(value)
+        seen.append(value)
+        if i % 7 == 0:
+            assert history.window_std() == pytest.approx(np.std(seen[-16:]))
+            assert history.lifetime_std() == pytest.approx(np.std(seen))
+    assert history._pending == 1  # Values appended since the last read
+
+    restored = IntegrationHistory.from_state(history.get_state())
+    tail = rng.random(5)
+    history.extend(tail)
+    restored.extend(tail)
+    assert restored.lifetime_std() == history.lifetime_std()
+    assert restored.window_std() == history.window_std()
+
+def test_constant_stream_is_perfectly_stable():
+    """A locked ASD stream should report (numerically) zero spread"""
+    engine = IntegrationEngine('ASD')
+    aligned = np.array([0.2, 0.8])
+    for _ in range(250):
+        engine.compute_integration(aligned, aligned)
+
+    assert engine.get_integration_stability() == pytest.approx(1.0)
+    assert engine.get_integration_stability(windowed=True) == pytest.approx(1.0)
+
+def test_engine_stability_windowed_and_lifetime():
+    """Lifetime stability covers every step, windowed only the recent ones"""
+    np.random.seed(3)
+    engine = IntegrationEngine('ADHD')
+    states = np.random.random((500, 2))
+    phi = engine.compute_integration_batch(states, states[::-1])
+
+    window = engine.integration_history.capacity
+    assert len(engine.integration_history) == window
+    assert engine.get_integration_stability() == pytest.approx(1.0 - np.std(phi))
+    assert engine.get_integration_stability(windowed=True) == pytest.approx(
+        1.0 - np.std(phi[-window:])
+    )
+
+def test_memmap_history_matches_in_memory(tmp_path):
+    """A file-backed engine produces the same Φ and stability"""
+    path = str(tmp_path / 'history.bin')
+    history = MemmapHistory(path, 'ADHD', INTEGRATION_PARAMS, chunk_size=64)
+    engine = IntegrationEngine('ADHD', rng=0, history=history)
+    reference = IntegrationEngine('ADHD', rng=0)
+
+    rng = np.random.default_rng(1)
+    states = rng.random((2, 300, 2))
+    for i in range(150):
+        engine.compute_integration(states[0, i], states[1, i])
+        reference.compute_integration(states[0, i], states[1, i])
+    engine.compute_integration_batch(states[0], states[1])
+    reference.compute_integration_batch(states[0], states[1])
+
+    assert len(history) == history.total_count == 450
+    np.testing.assert_array_equal(history.window(), reference.integration_history.to_array())
+    for windowed in (False, True):
+        assert engine.get_integration_stability(windowed) == pytest.approx(
+            reference.get_integration_stability(windowed))
+
+    # Slices are views of the mapped file
+    assert np.shares_memory(history[10:20], history.values)
+    assert not history.values.flags.writeable
+
+def test_memmap_history_reopens(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    with MemmapHistory(path, 'NT', {'temporal_window': 100}, capacity=10,
+                       chunk_size=16) as history:
+        history.extend(np.arange(40.0))
+        history.append(40.0)
+
+    finished = MemmapHistory.open(path)
+    assert isinstance(finished.values, np.memmap)
+    assert finished.architecture == 'NT' and finished.params == {'temporal_window': 100}
+    np.testing.assert_array_equal(finished.values, np.arange(41.0))
+    assert finished.lifetime_std() == pytest.approx(np.std(np.arange(41.0)))
+    assert finished.window_std() == pytest.approx(np.std(np.arange(31.0, 41.0)))
+    with pytest.raises(ValueError):
+        finished.append(1.0)
+
+    resumed = MemmapHistory.open(path, mode='r+')
+    resumed.extend([41.0, 42.0])
+    resumed.close()
+    assert MemmapHistory.open(path).tolist() == list(np.arange(43.0))
+
+    with pytest.raises(ValueError):
+        IntegrationEngine('ASD', history=MemmapHistory.open(path))
+
+def test_memmap_header_survives_an_unclosed_run(tmp_path):
+    """A history never closed reopens at its last periodic header"""
+    path = str(tmp_path / 'history.bin')
+    history = MemmapHistory(path, 'ADHD', chunk_size=1000, header_every=32)
+    for value in range(70):
+        history.append(float(value))
+    history.extend(np.arange(70.0, 75.0))
+    history._data.flush()  # Pages a dead process leaves in the OS cache
+
+    reopened = MemmapHistory.open(path)
+    assert reopened.total_count == 64
+    np.testing.assert_array_equal(reopened.values, np.arange(64.0))
+    assert reopened.lifetime_std() == pytest.approx(np.std(np.arange(64.0)))
+    history.extend(np.arange(75.0, 100.0))
+    assert MemmapHistory.open(path).total_count == 100
+    with pytest.raises(ValueError):
+        MemmapHistory(path, header_every=0)
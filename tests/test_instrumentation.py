@@ -0,0 +1,91 @@
+"""
+Tests for hot-path instrumentation
+"""
+
+import json
+import threading
+import pytest
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.instrumentation import instrument, is_active
+from tide.core.integration import IntegrationEngine
+from tide.core.registry import get_architecture
+from tide.examples.temporal_planning import TemporalPlanningTask
+
+def test_probes_are_installed_only_while_active():
+    original = CognitiveArchitecture.__dict__['process_information']
+    integrate = get_architecture('NT').integrate
+    with instrument():
+        assert is_active()
+        assert CognitiveArchitecture.__dict__['process_information'] is not original
+        assert get_architecture('NT').integrate is not integrate
+    assert not is_active()
+    assert CognitiveArchitecture.__dict__['process_information'] is original
+    assert get_architecture('NT').integrate is integrate
+
+    with instrument():
+        with pytest.raises(ValueError):
+            instrument().start()
+
+def test_report_and_trace(tmp_path):
+    arch = CognitiveArchitecture('ASD', rng=0)
+    engine = IntegrationEngine('ADHD', rng=0)
+    task = TemporalPlanningTask('NT')
+    with instrument() as profile:
+        for _ in range(10):
+            arch.process_information({'content': 'test'})
+            engine.compute_integration(arch.self_position, arch.time_position)
+        task.plan_week()
+
+    report = profile.report()
+    assert report['CognitiveArchitecture.process_information']['calls'] == 10
+    assert report['CognitiveArchitecture._create_rigid_schedule']['calls'] == 10
+    assert report['integrate_collapsed_pair']['calls'] == 10
+    assert report['plan_dynamic']['calls'] == 1
+    row = report['IntegrationEngine.compute_integration']
+    assert 0 < row['p50_s'] <= row['p99_s'] <= row['max_s'] <= row['total_s']
+    assert 'process_crystallized' in profile.format_report()
+
+    path = tmp_path / 'trace.json'
+    profile.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert len(events) == sum(r['calls'] for r in report.values())
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+def test_trace_can_be_disabled():
+    with instrument(trace=False) as profile:
+        CognitiveArchitecture('NT').process_information({'content': 'test'})
+    assert profile.report()['process_dynamic']['calls'] == 1
+    with pytest.raises(ValueError):
+        profile.chrome_trace()
+
+def test_trace_buffer_is_capped_and_threads_can_be_excluded():
+    arch = CognitiveArchitecture('NT', rng=0)
+    with instrument(max_events=5) as profile:
+        for _ in range(10):
+            arch.process_information({'content': 'test'})
+    assert len(profile.events) == 5
+    calls = sum(entry['calls'] for entry in profile.report().values())
+    assert profile.dropped_events == calls - 5
+    assert profile.report()['process_dynamic']['calls'] == 10
+    assert profile.chrome_trace()['otherData']['dropped_events'] == calls - 5
+
+    with instrument(current_thread=True) as profile:
+        worker = threading.Thread(target=arch.process_information, args=({'content': 'x'},))
+        worker.start()
+        worker.join()
+        arch.process_information({'content': 'test'})
+    assert profile.report()['process_dynamic']['calls'] == 1
+
+def test_latency_samples_are_bounded():
+    engine = IntegrationEngine('ASD', rng=0)
+    with instrument(trace=False, max_samples=50) as profile:
+        for _ in range(500):
+            engine.compute_integration([0.2, 0.3], [0.4, 0.1])
+    stats = profile.stats['IntegrationEngine.compute_integration']
+    assert stats.calls == 500 and len(stats.samples) == 50
+    row = profile.report()['IntegrationEngine.compute_integration']
+    assert row['calls'] == 500
+    assert row['p50_s'] <= row['p99_s'] <= row['max_s']
+    assert row['total_s'] == pytest.approx(row['mean_s'] * 500)
+    with pytest.raises(ValueError):
+        instrument(max_samples=0)
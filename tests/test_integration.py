@@ -0,0 +1,39 @@
+"""
+Tests for integration engine functionality
+"""
+
+import pytest
+import numpy as np
+from tide.core.integration import IntegrationEngine
+
+def _random_states(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, 2)), rng.random((n, 2))
+
+@pytest.mark.parametrize('architecture', ['NT', 'ASD', 'ADHD'])
+def test_batch_matches_sequential(architecture):
+    """Batch integration should reproduce pair-by-pair integration"""
+    self_states, time_states = _random_states(50)
+
+    np.random.seed(42)
+    sequential = IntegrationEngine(architecture)
+    expected = [sequential.compute_integration(s, t)
+                for s, t in zip(self_states, time_states)]
+
+    np.random.seed(42)
+    batched = IntegrationEngine(architecture)
+    phi = batched.compute_integration_batch(self_states[:20], time_states[:20])
+    phi = np.concatenate([
+        phi, batched.compute_integration_batch(self_states[20:], time_states[20:])
+    ])
+
+    assert phi.shape == (50,)
+    np.testing.assert_array_equal(phi, expected)
+    np.testing.assert_array_equal(batched.integration_history,
+                                  sequential.integration_history)
+
+def test_batch_rejects_mismatched_shapes():
+    """Batch integration requires matching (N, d) arrays"""
+    engine = IntegrationEngine('NT')
+    with pytest.raises(ValueError):
+        engine.compute_integration_batch(np.zeros((3, 2)), np.zeros((4, 2)))
@@ -0,0 +1,64 @@
+"""
+Tests for integration landscape surfaces
+"""
+
+import pytest
+import numpy as np
+from tide.visualization.landscape import LandscapeCache, compute_integration_landscape
+
+def reference_landscape(architecture, resolution=20):
+    """The original cell-by-cell plotting loop"""
+    internal = np.linspace(0, 1, resolution)
+    external = np.linspace(0, 1, resolution)
+    I, E = np.meshgrid(internal, external)
+    Z = np.zeros_like(I)
+    for i in range(resolution):
+        for j in range(resolution):
+            if architecture == 'NT':
+                Z[i, j] = np.exp(-((I[i, j] - 0.8)**2 + (E[i, j] - 0.2)**2))
+            elif architecture == 'ASD':
+                Z[i, j] = np.exp(-((I[i, j] - 0.2)**2 + (E[i, j] - 0.2)**2))
+            elif architecture == 'ADHD':
+                Z[i, j] = np.exp(-((I[i, j] - 0.8)**2 + (E[i, j] - 0.8)**2))
+                Z[i, j] += 0.2 * np.random.normal()
+    return Z
+
+def test_matches_original_loop():
+    for arch in ['NT', 'ASD']:
+        _, _, Z = compute_integration_landscape(arch, cache=None)
+        np.testing.assert_allclose(Z, reference_landscape(arch))
+
+    # Row-major noise draws from the global RNG reproduce the loop exactly
+    np.random.seed(7)
+    expected = reference_landscape('ADHD')
+    np.random.seed(7)
+    _, _, Z = compute_integration_landscape('ADHD')
+    np.testing.assert_allclose(Z, expected)
+
+def test_resolution_and_seed():
+    I, E, Z = compute_integration_landscape('NT', resolution=64, cache=None)
+    assert I.shape == E.shape == Z.shape == (64, 64)
+    assert not Z.flags.writeable
+
+    a = compute_integration_landscape('ADHD', resolution=32, seed=3, cache=None)
+    b = compute_integration_landscape('ADHD', resolution=32, seed=3, cache=None)
+    np.testing.assert_array_equal(a.strength, b.strength)
+
+    with pytest.raises(ValueError):
+        compute_integration_landscape('NT', resolution=1)
+    with pytest.raises(ValueError):
+        compute_integration_landscape('INVALID')
+
+def test_cache_reuses_surfaces():
+    cache = LandscapeCache(maxsize=2)
+    first = compute_integration_landscape('NT', cache=cache)
+    # The seed does not matter for noise-free surfaces
+    assert compute_integration_landscape('NT', seed=5, cache=cache) is first
+    compute_integration_landscape('ADHD', seed=1, cache=cache)
+    compute_integration_landscape('ADHD', cache=cache)  # Unseeded noise: not cached
+    assert cache.info() == {'hits': 1, 'misses': 2, 'size': 2, 'maxsize': 2}
+
+    compute_integration_landscape('ASD', cache=cache)  # Evicts NT
+    assert compute_integration_landscape('NT', cache=cache) is not first
+    cache.clear()
+    assert len(cache) == 0
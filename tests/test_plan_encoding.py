@@ -0,0 +1,61 @@
+"""
+Tests for bitset plan encoding
+"""
+
+import pytest
+import numpy as np
+from tide.examples.plan_encoding import (PlanEncoder, plan_consistency, plan_similarity,
+                                         popcount, MAX_ACTIVITIES)
+from tide.examples.temporal_planning import TemporalPlanningTask
+
+def test_round_trip_and_popcount():
+    task = TemporalPlanningTask('ASD')
+    plan = task.plan_week()
+    encoded = task.encoder.encode([plan])
+    assert encoded.codes.dtype == np.uint64
+    assert {day: set(acts) for day, acts in encoded.decode(0).items()} == \
+        {day: set(acts) for day, acts in plan.items()}
+
+    codes = np.array([0, 1, 2**63, 2**64 - 1, 0b1011], dtype=np.uint64)
+    np.testing.assert_array_equal(popcount(codes), [0, 1, 1, 64, 3])
+
+def test_similarity_matches_set_jaccard():
+    for arch in ['NT', 'ASD', 'ADHD']:
+        task = TemporalPlanningTask(arch, rng=5)
+        plans = [task.plan_week() for _ in range(50)]
+        encoded = task.encoder.encode(plans)
+        expected = np.mean([task._compare_plans(plans[0], p) for p in plans[1:]])
+        assert plan_consistency(encoded) == pytest.approx(expected)
+
+    # Days missing from either plan are skipped, as in _compare_plans
+    task = TemporalPlanningTask('NT')
+    plans = [{'Monday': ['work'], 'Tuesday': ['rest']},
+             {'Monday': ['work', 'rest']},
+             {'Sunday': ['work']}]
+    e = task.encoder.encode(plans)
+    similarity = plan_similarity(e.codes[:1], e.present[:1], e.codes[1:], e.present[1:])
+    np.testing.assert_allclose(similarity, [task._compare_plans(plans[0], p)
+                                            for p in plans[1:]])
+
+def test_vectorized_monte_carlo():
+    assert TemporalPlanningTask('ASD').evaluate_plan_consistency(10000, encoded=True) == 1.0
+
+    task = TemporalPlanningTask('ADHD', rng=0)
+    plans = task.sample_plans(20000)
+    assert plans.codes.shape == (20000, 8)
+    assert not plans.present[:, 1].any()  # ADHD never plans Monday
+    today = plans.decode(0)['TODAY']
+    assert [entry.split(':')[0] for entry in today] == ['NOW', 'Maybe later', 'If time']
+    assert len({entry.split(': ')[1] for entry in today}) == 3
+
+    # Same statistic as planning week by week
+    looped = TemporalPlanningTask('ADHD', rng=0).evaluate_plan_consistency(2000)
+    assert plan_consistency(plans) == pytest.approx(looped, abs=0.01)
+
+def test_vocabulary_limit():
+    encoder = PlanEncoder()
+    encoder.encode([{'Monday': [f'activity {i}' for i in range(MAX_ACTIVITIES)]}])
+    with pytest.raises(ValueError):
+        encoder.bit('one too many')
+    with pytest.raises(ValueError):
+        encoder.encode([{'Someday': ['rest']}])
@@ -0,0 +1,61 @@
+"""
+Tests for all-pairs plan similarity
+"""
+
+import pytest
+import numpy as np
+from tide.examples import plan_similarity as similarity_module
+from tide.examples.plan_encoding import PlanEncoder, plan_similarity
+from tide.examples.plan_similarity import PlanSimilarity, concatenate_plans
+from tide.examples.temporal_planning import TemporalPlanningTask
+
+@pytest.fixture
+def plans():
+    encoder = PlanEncoder()
+    return concatenate_plans([
+        TemporalPlanningTask(arch, rng=seed, encoder=encoder).sample_plans(150)
+        for seed, arch in enumerate(['NT', 'ASD', 'ADHD'])
+    ])
+
+@pytest.fixture(params=['grouped', 'blocked'])
+def engine(request, plans, monkeypatch):
+    if request.param == 'blocked':
+        monkeypatch.setattr(similarity_module, 'MAX_CACHED_PLANS', 0)
+    return PlanSimilarity(plans, block_size=64)
+
+def brute_force(plans):
+    return plan_similarity(plans.codes[:, np.newaxis], plans.present[:, np.newaxis],
+                           plans.codes[np.newaxis], plans.present[np.newaxis])
+
+def test_matrix_matches_brute_force(plans, engine):
+    expected = brute_force(plans)
+    np.testing.assert_array_equal(engine.matrix(), expected)
+    for rows, cols, tile in engine.tiles():
+        np.testing.assert_array_equal(tile, expected[rows, cols])
+    # NT and ASD plans never change from week to week
+    assert engine.matrix()[0, 1] == 1.0
+
+def test_top_k_matches_brute_force(plans, engine):
+    expected = brute_force(plans)
+    for exclude_self in (True, False):
+        indices, scores = engine.top_k(7, exclude_self=exclude_self)
+        reference = expected.copy()
+        if exclude_self:
+            np.fill_diagonal(reference, -np.inf)
+            assert not (indices == np.arange(len(plans))[:, np.newaxis]).any()
+        np.testing.assert_array_equal(scores, -np.sort(-reference, axis=1)[:, :7])
+        np.testing.assert_array_equal(scores, np.take_along_axis(expected, indices, axis=1))
+        assert all(len(set(row)) == 7 for row in indices.tolist())
+
+    indices, scores = engine.top_k(3, queries=[0, 400])
+    assert indices.shape == scores.shape == (2, 3)
+
+def test_validation(plans):
+    engine = PlanSimilarity(plans)
+    with pytest.raises(ValueError):
+        engine.top_k(len(plans))
+    with pytest.raises(ValueError):
+        engine.matrix(out=np.empty((2, 2)))
+    with pytest.raises(ValueError):
+        concatenate_plans([TemporalPlanningTask('NT').sample_plans(2),
+                           TemporalPlanningTask('ASD').sample_plans(2)])
@@ -0,0 +1,53 @@
+"""
+Tests for compact result records
+"""
+
+import pytest
+import numpy as np
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.records import ProcessedInformation, records_to_array
+
+INFO = {'content': 'test', 'temporal_context': 'future planning', 'priority': 2}
+
+@pytest.mark.parametrize('architecture', ['NT', 'ASD', 'ADHD'])
+def test_record_dict_view_matches_processed_dict(architecture):
+    """Compact records read like the dicts from process_information"""
+    np.random.seed(0)
+    expected = CognitiveArchitecture(architecture).process_information(INFO)
+    np.random.seed(0)
+    record = CognitiveArchitecture(architecture).process_record(INFO)
+
+    assert isinstance(record, ProcessedInformation)
+    assert not hasattr(record, '__dict__')
+    assert record.as_dict() == expected
+    assert dict(record).keys() == expected.keys()
+    assert record['priority'] == 2
+    with pytest.raises(KeyError):
+        record['missing']
+
+def test_constant_substructures_are_shared():
+    asd = CognitiveArchitecture('ASD')
+    first, second = asd.process_record(INFO), asd.process_record(INFO)
+    assert first['temporal_structure'] is second['temporal_structure']
+    # The dict view still hands out an independent schedule
+    first.as_dict()['temporal_structure']['schedule'].clear()
+    assert len(second['temporal_structure']['schedule']) == 10
+
+def test_behavioral_signature_record_is_cached():
+    nt = CognitiveArchitecture('NT')
+    signature = nt.behavioral_signature()
+    assert signature is nt.behavioral_signature()
+    assert signature.as_dict() == nt.get_behavioral_signature()
+
+def test_structured_array_packing():
+    records = [CognitiveArchitecture(arch, rng=0).process_record(INFO)
+               for arch in ['NT', 'ASD', 'ADHD']]
+    array = records_to_array(records)
+
+    assert array.dtype.itemsize == 57
+    assert array['architecture'].tolist() == [0, 1, 2]
+    assert array['rule_consistency'][1] == 0.9
+    assert array['future_discount'][2] == 0.8
+    assert np.isnan(array['intensity_focus'][0])
+    # Plain dicts pack identically
+    assert records_to_array(r.as_dict() for r in records).tobytes() == array.tobytes()
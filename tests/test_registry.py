@@ -0,0 +1,133 @@
+"""
+Tests for the architecture registry
+"""
+
+import pytest
+import numpy as np
+from tide.config import ARCHITECTURE_CONFIGS
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.dimensional_space import DimensionalSpace
+from tide.core.integration import IntegrationEngine
+from tide.core.registry import (REGISTRY, get_architecture, register_architecture,
+                                 unregister_architecture, update_architecture)
+from tide.examples.temporal_planning import TemporalPlanningTask
+
+BALANCED = {
+    'self_dimension': 'external',
+    'time_dimension': 'external',
+    'integration_style': 'crystallized',
+    'processing_flexibility': 0.5,
+    'temporal_consistency': 0.7,
+    'planning_horizon': 14
+}
+
+def test_builtin_architectures_are_compiled():
+    for index, arch in enumerate(['NT', 'ASD', 'ADHD']):
+        spec = get_architecture(arch)
+        assert spec.index == index
+        assert spec.config is ARCHITECTURE_CONFIGS[arch]
+    assert get_architecture('ASD').legend == 'Self: External\nTime: External'
+    with pytest.raises(ValueError):
+        get_architecture('INVALID')
+
+def test_custom_architecture_needs_no_core_edits():
+    """A registered architecture works everywhere the built-ins do"""
+    register_architecture('TEST_BALANCED', BALANCED, mapping={
+        'self': [0.4, 0.6], 'time': [0.3, 0.7], 'intuition': [0.7, 0.3]
+    })
+
+    space = DimensionalSpace()
+    np.testing.assert_array_equal(space.compute_element_position('self', 'TEST_BALANCED'),
+                                  [0.4, 0.6])
+    np.testing.assert_array_equal(space.compute_element_position('intuition', 'TEST_BALANCED'),
+                                  [0.7, 0.3])
+    # New elements do not disturb existing architectures
+    np.testing.assert_array_equal(space.compute_element_position('intuition', 'NT'),
+                                  [0.5, 0.5])
+    np.testing.assert_array_equal(space.compute_element_position('self', 'NT'), [0.8, 0.2])
+
+    arch = CognitiveArchitecture('TEST_BALANCED')
+    result = arch.process_information({'content': 'test'})
+    assert result['rule_consistency'] == 0.7
+    assert result['architecture_signature'] == 'TEST_BALANCED'
+    assert arch.get_behavioral_signature()['planning_horizon'] == 14
+
+    engine = IntegrationEngine('TEST_BALANCED')
+    assert engine.compute_integration(arch.self_position, arch.time_position) == 0.9
+    assert 'Monday' in TemporalPlanningTask('TEST_BALANCED').plan_week()
+
+def test_registration_is_validated():
+    with pytest.raises(ValueError):
+        register_architecture('NT', ARCHITECTURE_CONFIGS['NT'])
+    with pytest.raises(ValueError):
+        register_architecture('TEST_BAD_STYLE', dict(BALANCED, integration_style='flow'))
+    with pytest.raises(ValueError):
+        register_architecture('TEST_MISSING', {'integration_style': 'dynamic'})
+
+def test_replacing_updates_live_instances():
+    register_architecture('TEST_REPLACED', BALANCED)
+    arch = CognitiveArchitecture('TEST_REPLACED')
+    register_architecture('TEST_REPLACED', dict(BALANCED, integration_style='dynamic'),
+                          replace=True)
+    assert 'temporal_flexibility' in arch.process_information({'content': 'test'})
+
+def test_updates_reach_live_instances_incrementally():
+    register_architecture('TEST_UPDATED', BALANCED, mapping={'self': [0.4, 0.6],
+                                                             'time': [0.3, 0.7]})
+    register_architecture('TEST_UNTOUCHED', BALANCED)
+    population = [CognitiveArchitecture('TEST_UPDATED') for _ in range(10000)]
+    untouched = CognitiveArchitecture('TEST_UNTOUCHED')
+    signature = population[0].behavioral_signature()
+    geometry = untouched._geometry()
+    spec = get_architecture('TEST_UPDATED')
+    other_row = REGISTRY.positions[get_architecture('NT').index].copy()
+
+    # Config-only change: the mapping and its geometry are untouched
+    update_architecture('TEST_UPDATED', temporal_consistency=0.4)
+    assert spec.versions == {'config': 1, 'mapping': 0}
+    assert population[-1].config['temporal_consistency'] == 0.4
+    assert population[-1].behavioral_signature()['temporal_consistency'] == 0.4
+    assert population[-1].behavioral_signature() is not signature
+    assert population[0].process_information({'content': 'x'})['rule_consistency'] == 0.4
+
+    update_architecture('TEST_UPDATED', mapping={'time': [0.4, 0.6]})
+    assert spec.versions == {'config': 1, 'mapping': 1}
+    assert population[-1].integration_distance == 0.0
+    np.testing.assert_array_equal(population[0].time_position, [0.4, 0.6])
+    np.testing.assert_array_equal(
+        DimensionalSpace().compute_element_position('time', 'TEST_UPDATED'), [0.4, 0.6])
+    # Geometry is shared by every instance and computed once per version
+    assert population[0]._geometry() is population[-1]._geometry()
+    # Other architectures keep their cached values and table rows
+    assert untouched._geometry() is geometry
+    np.testing.assert_array_equal(REGISTRY.positions[get_architecture('NT').index],
+                                  other_row)
+
+    # Re-applying the same values is not a change
+    version = REGISTRY.version
+    update_architecture('TEST_UPDATED', temporal_consistency=0.4,
+                        mapping={'time': [0.4, 0.6]})
+    assert REGISTRY.version == version
+    assert spec.versions == {'config': 1, 'mapping': 1}
+
+def test_style_update_rebinds_kernels():
+    register_architecture('TEST_RESTYLED', BALANCED)
+    arch = CognitiveArchitecture('TEST_RESTYLED')
+    update_architecture('TEST_RESTYLED', integration_style='dynamic')
+    assert get_architecture('TEST_RESTYLED').style.name == 'dynamic'
+    assert 'temporal_flexibility' in arch.process_information({'content': 'test'})
+
+def test_unregistering_compacts_the_tables():
+    register_architecture('TEST_REMOVED', BALANCED, mapping={'self': [0.1, 0.1]})
+    register_architecture('TEST_KEPT', BALANCED, mapping={'self': [0.3, 0.3]})
+    kept = get_architecture('TEST_KEPT')
+    n_rows = len(REGISTRY.positions)
+
+    unregister_architecture('TEST_REMOVED')
+    assert 'TEST_REMOVED' not in REGISTRY and 'TEST_REMOVED' not in ARCHITECTURE_CONFIGS
+    assert len(REGISTRY.positions) == n_rows - 1
+    assert REGISTRY.specs[kept.index] is kept
+    np.testing.assert_array_equal(
+        DimensionalSpace().compute_element_position('self', 'TEST_KEPT'), [0.3, 0.3])
+    with pytest.raises(ValueError):
+        unregister_architecture('TEST_REMOVED')
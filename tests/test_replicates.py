@@ -0,0 +1,27 @@
+"""
+Tests for parallel replicate runs
+"""
+
+import numpy as np
+from tide import ArchitectureSimulator
+from tide.core.replicates import run_replicates
+
+def test_replicates_independent_of_worker_count():
+    """Results are bit-identical for a root seed regardless of sharding"""
+    sim = ArchitectureSimulator({'NT': 5, 'ADHD': 5}, state_noise=0.05)
+
+    serial = run_replicates(sim, n_replicates=6, n_steps=30, root_seed=123)
+    sharded = run_replicates(sim, n_replicates=6, n_steps=30, root_seed=123,
+                             shard_size=4)
+    parallel = run_replicates(sim, n_replicates=6, n_steps=30, root_seed=123,
+                              workers=2)
+
+    for other in (sharded, parallel):
+        np.testing.assert_array_equal(serial.mean_phi, other.mean_phi)
+        np.testing.assert_array_equal(serial.stability, other.stability)
+
+    # Replicates differ from one another, and from another root seed
+    assert not np.array_equal(serial.mean_phi[0], serial.mean_phi[1])
+    other_seed = run_replicates(sim, n_replicates=6, n_steps=30, root_seed=124)
+    assert not np.array_equal(serial.mean_phi, other_seed.mean_phi)
+    assert set(serial.summary()) == {'NT', 'ADHD'}
@@ -0,0 +1,52 @@
+"""
+Tests for population simulation
+"""
+
+import pytest
+import numpy as np
+from tide import ArchitectureSimulator
+from tide.core.integration import IntegrationEngine
+from tide.core.dimensional_space import DimensionalSpace
+
+def test_deterministic_agents_match_engine():
+    """NT and ASD agents follow the same trajectory as a standalone engine"""
+    space = DimensionalSpace()
+    sim = ArchitectureSimulator(['ASD', 'NT', 'ASD', 'NT'])
+    result = sim.simulate(n_steps=60)
+
+    for arch, column in [('ASD', 0), ('NT', 1)]:
+        engine = IntegrationEngine(arch)
+        self_pos, time_pos = space.positions(['self', 'time'], arch)
+        expected = [engine.compute_integration(self_pos, time_pos) for _ in range(60)]
+        np.testing.assert_allclose(result.phi[:, column], expected)
+        assert result.stability[column] == pytest.approx(
+            engine.get_integration_stability())
+
+    assert result.agent_types.tolist() == ['ASD', 'NT', 'ASD', 'NT']
+    assert result.phi.shape == (60, 4)
+
+def test_seeded_runs_are_reproducible():
+    """Same seed gives identical trajectories; recording is optional"""
+    population = {'NT': 10, 'ASD': 10, 'ADHD': 10}
+    first = ArchitectureSimulator(population, state_noise=0.05, seed=7).simulate(40)
+    second = ArchitectureSimulator(population, state_noise=0.05, seed=7).simulate(
+        40, record=False)
+
+    assert second.phi is None
+    np.testing.assert_array_equal(first.mean_phi, second.mean_phi)
+    np.testing.assert_array_equal(first.stability, second.stability)
+    np.testing.assert_allclose(first.stability, 1.0 - first.phi.std(axis=0))
+
+def test_architectures_keep_expected_ordering():
+    """ASD is the most stable population, ADHD the least"""
+    sim = ArchitectureSimulator({'NT': 50, 'ASD': 50, 'ADHD': 50}, seed=0)
+    summary = sim.simulate(200, record=False).summary()
+
+    assert summary['ASD']['stability'] > summary['NT']['stability']
+    assert summary['NT']['stability'] > summary['ADHD']['stability']
+
+def test_unknown_architecture_rejected():
+    with pytest.raises(ValueError):
+        ArchitectureSimulator({'INVALID': 3}).simulate(5)
+    with pytest.raises(ValueError):
+        ArchitectureSimulator().simulate(5)
@@ -0,0 +1,70 @@
+"""
+Tests for the asyncio streaming pipeline
+"""
+
+import asyncio
+import pytest
+import numpy as np
+from tide.core.architecture import CognitiveArchitecture
+from tide.core.streaming import StreamingPipeline
+
+async def _events(n, delay=0.0):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield {'content': f'event {i}', 'temporal_context': 'now'}
+
+async def _collect(pipeline, source):
+    return [record async for record in pipeline.run(source)]
+
+def test_pipeline_processes_every_record_in_order():
+    pipeline = StreamingPipeline(CognitiveArchitecture('NT', rng=0), batch_size=16)
+    records = asyncio.run(_collect(pipeline, _events(100)))
+
+    assert [r['content'] for r in records] == [f'event {i}' for i in range(100)]
+    assert all('temporal_flexibility' in r and 0 <= r['phi'] <= 1 for r in records)
+    assert pipeline.engine.integration_history.total_count == 100
+
+def test_latency_bound_flushes_partial_batches():
+    """A slow stream is not held back waiting for a full batch"""
+    async def scenario():
+        pipeline = StreamingPipeline(CognitiveArchitecture('ASD'),
+                                     batch_size=1000, max_latency=0.01)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async for record in pipeline.run(_events(3, delay=0.005)):
+            return record, loop.time() - start
+
+    record, elapsed = asyncio.run(scenario())
+    assert record['rule_consistency'] == 0.9
+    assert elapsed < 0.5
+
+def test_backpressure_bounds_buffered_batches():
+    """A stalled consumer stops the pipeline from draining the source"""
+    pulled = []
+
+    async def source():
+        for i in range(1000):
+            pulled.append(i)
+            yield {'content': i}
+
+    async def scenario():
+        pipeline = StreamingPipeline(CognitiveArchitecture('ADHD', rng=0),
+                                     batch_size=10, max_pending_batches=2)
+        stream = pipeline.run(source())
+        await stream.__anext__()
+        await asyncio.sleep(0.05)  # Consumer stalls
+        await stream.aclose()
+
+    asyncio.run(scenario())
+    # One batch being consumed, two queued, one being filled
+    assert len(pulled) <= 50
+
+def test_source_errors_propagate():
+    async def broken():
+        yield {'content': 'ok'}
+        raise RuntimeError('stream failed')
+
+    pipeline = StreamingPipeline(CognitiveArchitecture('NT'), batch_size=4)
+    with pytest.raises(RuntimeError):
+        asyncio.run(_collect(pipeline, broken()))
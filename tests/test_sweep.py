@@ -0,0 +1,101 @@
+"""
+Tests for vectorized parameter sweeps
+"""
+
+import pytest
+import numpy as np
+from tide.config import ARCHITECTURE_CONFIGS, INTEGRATION_PARAMS
+from tide.core.kernels import collapsed_kernel
+from tide.core.registry import (IntegrationStyle, get_architecture, register_architecture,
+                                register_style)
+from tide.core.simulator import ArchitectureSimulator
+from tide.core.sweep import SweepCache, run_sweep
+
+GRID = {
+    'boundary_threshold': [0.1, 0.3, 0.5, 1.0],
+    'processing_flexibility': [0.2, 0.8],
+    'planning_horizon': [1, 30, 90]
+}
+
+def test_sweep_matches_nested_loops():
+    """Each grid point equals a simulator run with the same parameters"""
+    result = run_sweep(GRID, ['NT', 'ASD'], n_steps=40, n_agents=3)
+    assert result.shape == (2, 4, 2, 3)
+
+    simulator = ArchitectureSimulator({'ASD': 3})
+    default = INTEGRATION_PARAMS['boundary_threshold']
+    try:
+        for index, threshold in enumerate(GRID['boundary_threshold']):
+            INTEGRATION_PARAMS['boundary_threshold'] = threshold
+            expected = simulator.simulate(40, record=False, seed=0)
+            np.testing.assert_allclose(result.mean_phi[1, index],
+                                       expected.mean_phi.mean())
+            np.testing.assert_allclose(result.stability[1, index],
+                                       expected.stability.mean())
+    finally:
+        INTEGRATION_PARAMS['boundary_threshold'] = default
+
+    # NT does not read the threshold: one evaluation broadcast everywhere
+    assert np.all(result.mean_phi[0] == result.mean_phi[0, 0, 0, 0])
+    assert result.computed == 1 + 4
+    point = result.point('ASD', boundary_threshold=0.1, processing_flexibility=0.8,
+                         planning_horizon=30)
+    assert point['mean_phi'] == pytest.approx(0.2)
+
+def test_memoized_sweeps_only_compute_new_points(tmp_path):
+    settings = dict(architectures=['ASD', 'ADHD'], n_steps=30, n_agents=4,
+                    state_noise=0.1, seed=3)
+    first = run_sweep(GRID, cache=str(tmp_path), **settings)
+    assert (first.computed, first.cached) == (5, 0)
+
+    repeated = run_sweep(GRID, cache=SweepCache(str(tmp_path)), **settings)
+    assert (repeated.computed, repeated.cached) == (0, 5)
+    np.testing.assert_array_equal(repeated.mean_phi, first.mean_phi)
+
+    extended = dict(GRID, boundary_threshold=[0.1, 0.2, 0.3, 0.5, 1.0, 1.5],
+                    temporal_consistency=[0.2, 0.9])
+    result = run_sweep(extended, cache=str(tmp_path), **settings)
+    assert (result.computed, result.cached) == (2, 5)
+    fresh = run_sweep(extended, **settings)
+    np.testing.assert_array_equal(result.mean_phi, fresh.mean_phi)
+    np.testing.assert_array_equal(result.stability, fresh.stability)
+
+    # Different run settings are a different memo entry
+    assert run_sweep(GRID, cache=str(tmp_path), **dict(settings, seed=4)).cached == 0
+
+def _noisy_threshold(distance, step, params, generator):
+    """Collapsed integration whose noise scales with the threshold"""
+    noise = generator.normal(0, 1, size=np.shape(distance)) * params['boundary_threshold']
+    return collapsed_kernel(distance, noise)
+
+def test_noisy_kernels_do_not_depend_on_the_other_points(tmp_path):
+    collapsed = get_architecture('ADHD').style
+    register_style(IntegrationStyle('test_noisy_threshold', _noisy_threshold,
+                                    collapsed.process, collapsed.process_batch,
+                                    collapsed.plan,
+                                    integrate_params=('boundary_threshold',)))
+    register_architecture('TEST_NOISY', dict(ARCHITECTURE_CONFIGS['ADHD'],
+                                             integration_style='test_noisy_threshold'))
+    settings = dict(architectures=['TEST_NOISY'], n_steps=20, n_agents=5, state_noise=0.1)
+    first = run_sweep({'boundary_threshold': [0.1, 0.5]}, cache=str(tmp_path), **settings)
+    extended = run_sweep({'boundary_threshold': [0.1, 0.3, 0.5]}, **settings)
+    np.testing.assert_array_equal(extended.mean_phi[:, [0, 2]], first.mean_phi)
+    memoized = run_sweep({'boundary_threshold': [0.1, 0.3, 0.5]}, cache=str(tmp_path),
+                         **settings)
+    assert (memoized.computed, memoized.cached) == (1, 2)
+    np.testing.assert_array_equal(memoized.mean_phi, extended.mean_phi)
+    assert len(np.unique(extended.mean_phi)) == 3
+
+def test_sweep_columns_and_validation():
+    result = run_sweep({'boundary_threshold': [0.2, 0.6]}, ['ASD', 'NT'], n_steps=5)
+    columns = result.as_columns()
+    assert columns['architecture'].tolist() == ['ASD', 'ASD', 'NT', 'NT']
+    assert columns['boundary_threshold'].tolist() == [0.2, 0.6, 0.2, 0.6]
+    np.testing.assert_array_equal(columns['mean_phi'], result.mean_phi.ravel())
+
+    with pytest.raises(ValueError):
+        run_sweep({'unknown_parameter': [1, 2]})
+    with pytest.raises(ValueError):
+        run_sweep({'boundary_threshold': []})
+    with pytest.raises(ValueError):
+        run_sweep({'boundary_threshold': [0.5]}, seed=None)
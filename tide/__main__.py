@@ -0,0 +1,8 @@
+"""
+`python -m tide`: same as the `tide` command (see tide.cli)
+"""
+
+import sys
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,318 @@
+"""
+Command-line batch processing.
+
+`tide` streams JSON Lines records through an architecture's information
+processing and integration and writes JSON Lines or a columnar result set:
+
+    tide events.jsonl -a ADHD --workers 8 --stats > processed.jsonl
+    zcat events.jsonl.gz | tide -a ASD --mode integrate -f columnar -o phi/
+
+Input is read as chunks of raw lines. Each chunk is parsed, run through
+CognitiveArchitecture.process_batch and the architecture's integration
+kernel (as in IntegrationEngine.compute_integration_batch), and serialized
+in one pass - in worker processes when `--workers` is above 1, with at
+most two chunks per worker in flight so memory stays bounded. Chunk i
+draws from the i-th child of np.random.SeedSequence(seed) and integrates
+at the stream positions of its records, so the output is the same for
+any worker count.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from .config import INTEGRATION_PARAMS
+from .core.architecture import CognitiveArchitecture
+from .core.kernels import state_distance
+from .core.registry import get_architecture
+from .core.streaming import record_states
+
+MODES = ('both', 'process', 'integrate')
+FORMATS = ('jsonl', 'columnar')
+_IO_BUFFER = 1 << 20
+_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+
+def _read_chunks(stream, chunk_size: int) -> Iterable[Tuple[int, List[bytes], Tuple]]:
+    """
+    (first line number, non-blank lines, indices of the blank lines skipped)
+    for every `chunk_size` raw lines
+    """
+    first_line = 1
+    while True:
+        lines = list(islice(stream, chunk_size))
+        if not lines:
+            return
+        blank = tuple(index for index, line in enumerate(lines) if line.isspace())
+        if blank:
+            kept = [line for line in lines if not line.isspace()]
+            if kept:
+                yield first_line, kept, blank
+        else:
+            yield first_line, lines, blank
+        first_line += len(lines)
+
+
+def _line_numbers(first_line: int, blank: Tuple, count: int) -> List[int]:
+    """Input line numbers of a chunk's `count` records"""
+    skipped = set(blank)
+    numbers, index = [], 0
+    while len(numbers) < count:
+        if index not in skipped:
+            numbers.append(first_line + index)
+        index += 1
+    return numbers
+
+
+def _parse(lines: List[bytes], numbers: List[int]) -> List[Dict]:
+    """Records of a chunk, decoded in one call as a JSON array"""
+    try:
+        records = json.loads(b'[' + b','.join(lines) + b']')
+    except ValueError:
+        records = None
+    if records is None or len(records) != len(lines) or not all(
+            isinstance(record, dict) for record in records):
+        # Decode line by line to report the offending record
+        for number, line in zip(numbers, lines):
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise ValueError(f"Record {number} is not valid JSON: {error}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"Record {number} is not a JSON object")
+        raise ValueError(f"Records {numbers[0]}-{numbers[-1]} are not one JSON object "
+                         f"per line")
+    return records
+
+
+def _process_chunk(task: Tuple) -> Tuple[int, object]:
+    """
+    Parse, process and serialize one chunk (executed in a worker process).
+
+    Returns:
+        (records, output): JSONL bytes, or name -> array of the scalar
+        output columns for columnar output
+    """
+    architecture, mode, columnar, seed, index, offset, first_line, blank, lines = task
+    numbers = _line_numbers(first_line, blank, len(lines))
+    records = _parse(lines, numbers)
+    generator = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+    arch = CognitiveArchitecture(architecture, rng=generator)
+
+    columns = {}
+    if mode != 'integrate':
+        columns = arch.process_batch({'content': [record.get('content')
+                                                   for record in records]})
+        del columns['content']
+    if mode != 'process':
+        # Records are integrated at their positions in the whole stream, so
+        # the NT oscillation phase does not restart with every chunk
+        columns['phi'] = get_architecture(architecture).integrate(
+            state_distance(record_states(records, 'self_state', arch.self_position, numbers),
+                           record_states(records, 'time_state', arch.time_position, numbers)),
+            offset + np.arange(len(records)), INTEGRATION_PARAMS, generator)
+
+    if columnar:
+        # Nested structures (the ASD schedule) have no columnar form
+        return len(records), {name: np.ascontiguousarray(values)
+                              for name, values in columns.items()
+                              if values.dtype.kind in 'biufU'}
+
+    # Columns broadcast from one value (see process_batch) are encoded once
+    # and appended to every record's encoding, unless an input key clashes
+    input_keys = set().union(*records)
+    constant = [name for name, values in columns.items()
+                if values.strides == (0,) and name not in input_keys]
+    names = [name for name in columns if name not in constant]
+    rows = zip(*[columns[name].tolist() for name in names]) if names else ()
+    for record, row in zip(records, rows):
+        record.update(zip(names, row))
+    lines = list(map(_ENCODER.encode, records))
+    if constant and records:
+        suffix = ''.join(f',{_ENCODER.encode(name)}:'
+                         f'{_ENCODER.encode(columns[name][:1].tolist()[0])}'
+                         for name in constant) + '}'
+        lines = [line[:-1] + suffix if len(line) > 2 else '{' + suffix[1:]
+                 for line in lines]
+    lines.append('')
+    return len(records), '\n'.join(lines).encode()
+
+
+def _worker_fingerprint(architecture: str):
+    """Fingerprint of an architecture as a worker process sees it (None if unknown)"""
+    try:
+        return get_architecture(architecture).fingerprint()
+    except ValueError:
+        return None
+
+
+def _ordered_results(tasks: Iterable[Tuple], workers: int, architecture: str):
+    """Chunk outputs in input order, keeping at most 2 chunks per worker in flight"""
+    if workers <= 1:
+        for task in tasks:
+            yield _process_chunk(task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Workers started by 'spawn' (or 'forkserver') import TIDE afresh
+        # and only see architectures registered at import time
+        if pool.submit(_worker_fingerprint, architecture).result() != \
+                get_architecture(architecture).fingerprint():
+            raise ValueError(
+                f"Architecture {architecture} was registered or changed at runtime, "
+                f"so worker processes do not see it; use one worker, or register it "
+                f"when a module that the workers import is loaded")
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(pool.submit(_process_chunk, task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_batch(source: str = '-', output: str = '-', architecture: str = 'NT',
+              mode: str = 'both', output_format: str = 'jsonl',
+              chunk_size: int = 4096, workers: int = 1, seed: int = 0,
+              overwrite: bool = False) -> Dict[str, float]:
+    """
+    Process a JSON Lines stream; the function behind the `tide` command.
+
+    Each record is a JSON object. Its 'content' is processed, and optional
+    'self_state'/'time_state' vectors are integrated (the architecture's
+    own self and time positions otherwise). Invalid records are reported
+    by their line number in the input, blank lines included.
+
+    Args:
+        source: Input file, or '-' for stdin
+        output: Output file ('-' for stdout), or directory for columnar
+            output
+        architecture: Registered architecture type
+        mode: 'process' (process_batch columns), 'integrate' ('phi') or
+            'both'
+        output_format: 'jsonl' (input records extended with the output
+            columns) or 'columnar' (the scalar output columns, see
+            tide.core.columnar)
+        chunk_size: Records per chunk
+        workers: Worker processes; 1 processes in the calling process.
+            Workers must see the architecture as registered here, which
+            rules out architectures registered at runtime on platforms
+            that spawn workers (ValueError)
+        seed: Integer seed; chunk i uses the i-th child SeedSequence
+        overwrite: Replace an existing columnar result set
+
+    Returns:
+        Throughput statistics: records, chunks, bytes, seconds,
+        records_per_second, workers
+    """
+    get_architecture(architecture)  # Raises ValueError for unregistered types
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown format {output_format!r}; expected one of {FORMATS}")
+    if chunk_size < 1 or workers < 1:
+        raise ValueError("chunk_size and workers must be at least 1")
+    columnar = output_format == 'columnar'
+    if columnar and output == '-':
+        raise ValueError("Columnar output needs an output directory")
+
+    start = time.perf_counter()
+    stats = {'records': 0, 'chunks': 0, 'bytes': 0}
+
+    def tasks(stream):
+        offset = 0
+        for index, (first_line, lines, blank) in enumerate(_read_chunks(stream, chunk_size)):
+            stats['bytes'] += sum(map(len, lines))
+            yield architecture, mode, columnar, seed, index, offset, first_line, blank, lines
+            offset += len(lines)
+
+    with ExitStack() as stack:
+        reader = sys.stdin.buffer if source == '-' else stack.enter_context(
+            open(source, 'rb', buffering=_IO_BUFFER))
+        if columnar:
+            # Chunks are appended to the column files as they arrive; the
+            # schema is written only once the last one is in
+            from .core.columnar import ColumnWriter
+            write = stack.enter_context(ColumnWriter(
+                output, [architecture], {'source': source, 'mode': mode, 'seed': seed,
+                                         'chunk_size': chunk_size}, overwrite)).append
+        elif output == '-':
+            stack.callback(sys.stdout.buffer.flush)
+            write = sys.stdout.buffer.write
+        else:
+            write = stack.enter_context(open(output, 'wb', buffering=_IO_BUFFER)).write
+        for count, result in _ordered_results(tasks(reader), workers, architecture):
+            stats['records'] += count
+            stats['chunks'] += 1
+            write(result)
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['records_per_second'] = stats['records'] / max(stats['seconds'], 1e-9)
+    stats['workers'] = workers
+    return stats
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='tide',
+        description="Stream JSON Lines records through a TIDE architecture's "
+                    "information processing and integration.")
+    parser.add_argument('input', nargs='?', default='-',
+                        help="JSONL input file (default: stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="output file, or directory for columnar output "
+                             "(default: stdout)")
+    parser.add_argument('-a', '--architecture', default='NT',
+                        help="architecture type (default: NT)")
+    parser.add_argument('-m', '--mode', choices=MODES, default='both',
+                        help="process records, integrate them, or both (default)")
+    parser.add_argument('-f', '--format', choices=FORMATS, default='jsonl',
+                        dest='output_format', help="output format (default: jsonl)")
+    parser.add_argument('-c', '--chunk-size', type=int, default=4096,
+                        help="records per chunk (default: 4096)")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help="worker processes (default: 1)")
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help="random seed (default: 0)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="replace an existing columnar result set")
+    parser.add_argument('--stats', action='store_true',
+                        help="print throughput statistics to stderr")
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    """Entry point of the `tide` command"""
+    args = build_parser().parse_args(argv)
+    try:
+        stats = run_batch(args.input, args.output, args.architecture, args.mode,
+                          args.output_format, args.chunk_size, args.workers,
+                          args.seed, args.overwrite)
+    except BrokenPipeError:
+        # The reader went away (e.g. `tide ... | head`); silence the
+        # interpreter's own flush of stdout at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (ValueError, OSError) as error:
+        print(f"tide: error: {error}", file=sys.stderr)
+        return 1
+
+    if args.stats:
+        megabytes = stats['bytes'] / 1e6
+        print(f"tide: {stats['records']} records ({megabytes:.1f} MB) in "
+              f"{stats['seconds']:.2f} s: {stats['records_per_second']:,.0f} records/s, "
+              f"{megabytes / max(stats['seconds'], 1e-9):.1f} MB/s "
+              f"({stats['chunks']} chunks, {stats['workers']} workers)",
+              file=sys.stderr)
+    return 0
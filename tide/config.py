@@ -30,6 +30,35 @@ ARCHITECTURE_CONFIGS = {
     }
 }
 
+# Element positions per architecture as [internal, external] coordinates,
+# based on Levinson (2021) dissertation findings.
+# Elements missing from a mapping sit at DEFAULT_POSITION.
+ELEMENT_MAPPINGS = {
+    # Neurotypical dimensional mapping
+    'NT': {
+        'self': (0.8, 0.2),     # Primarily internal
+        'time': (0.2, 0.8),     # Primarily external
+        'emotion': (0.9, 0.1),  # Strongly internal
+        'logic': (0.1, 0.9)     # Strongly external
+    },
+    # ASD dimensional mapping - self shifts to external
+    'ASD': {
+        'self': (0.2, 0.8),     # Shifted to external
+        'time': (0.1, 0.9),     # Strongly external
+        'emotion': (0.9, 0.1),  # Remains internal
+        'logic': (0.0, 1.0)     # Maximally external
+    },
+    # ADHD dimensional mapping - time collapses to internal
+    'ADHD': {
+        'self': (0.9, 0.1),     # Strongly internal
+        'time': (0.8, 0.2),     # Shifted to internal
+        'emotion': (1.0, 0.0),  # Maximally internal
+        'logic': (0.2, 0.8)     # Still external
+    }
+}
+
+DEFAULT_POSITION = (0.5, 0.5)
+
 # Feature dimensions from dissertation findings
 INTERNAL_FEATURES = ['emotion', 'social', 'morality', 'thought', 'polarity']
 EXTERNAL_FEATURES = ['time', 'space', 'number', 'logic', 'structure']
@@ -0,0 +1,396 @@
+"""
+Chunked analytics for long Φ trajectories.
+
+Every analytic is an accumulator that consumes a trajectory in fixed-size
+chunks and keeps only a bounded carry between chunks (less than one window
+or segment of samples). Trajectories of 10^8 samples can therefore be
+analyzed straight from a MemmapHistory or a memory-mapped column. Several
+accumulators can share one pass over the data (see analyze).
+
+- RollingAccumulator: mean, std, min and max over sliding windows
+- SpectrumAccumulator: Welch power spectral density (e.g. the NT
+  oscillation, the ADHD noise floor)
+- EpisodeAccumulator: runs above or below a threshold (e.g. ASD lock-in)
+"""
+
+import numpy as np
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.signal import get_window
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def iter_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterable[np.ndarray]:
+    """
+    Yield a trajectory as float64 chunks.
+
+    Args:
+        source: 1-D array (including np.memmap), IntegrationHistory,
+            MemmapHistory, or an iterable of array chunks
+        chunk_size: Samples per chunk when slicing arrays
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+    if hasattr(source, 'to_array'):
+        source = source.to_array()
+    if isinstance(source, (np.ndarray, list, tuple)):
+        values = np.asarray(source)
+        if values.ndim != 1:
+            raise ValueError(f"Expected a 1-D trajectory, got shape {values.shape}")
+        for start in range(0, len(values), chunk_size):
+            yield np.asarray(values[start:start + chunk_size], dtype=np.float64)
+    else:
+        for chunk in source:
+            yield np.asarray(chunk, dtype=np.float64).ravel()
+
+
+class _Framer:
+    """
+    Cuts a chunked stream into frames of `size` samples every `step`
+    samples, carrying the unfinished tail (< size + step samples) over to
+    the next chunk.
+    """
+
+    def __init__(self, size: int, step: int):
+        if size < 1 or step < 1:
+            raise ValueError(f"Frame size and step must be positive, got {size} and {step}")
+        self.size = size
+        self.step = step
+        self.tail = np.empty(0)
+        self.offset = 0       # Stream index of tail[0]
+        self.next_start = 0   # Stream index of the next frame
+
+    def frames(self, chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (buffer, local_starts, stream_starts) of the frames completed
+            by this chunk; frame i is buffer[local_starts[i]:][:size]
+        """
+        buffer = np.concatenate((self.tail, chunk)) if len(self.tail) else chunk
+        first = self.next_start - self.offset
+        last = len(buffer) - self.size
+        local = (np.arange(first, last + 1, self.step) if last >= first
+                 else np.empty(0, dtype=np.intp))
+        starts = local + self.offset
+        self.next_start += len(local) * self.step
+
+        keep = self.next_start - self.offset
+        if keep < len(buffer):
+            self.tail = buffer[keep:].copy()
+            self.offset = self.next_start
+        else:
+            # Frames further apart than they are long skip samples
+            self.tail = np.empty(0)
+            self.offset += len(buffer)
+        return buffer, local, starts
+
+
+class RollingStats:
+    """
+    Statistics of sliding windows.
+
+    Attributes:
+        starts: (W,) stream index of each window's first sample
+        mean, std, min, max: (W,) statistics of each window
+        window: Window length in samples
+    """
+
+    def __init__(self, starts: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 minimum: np.ndarray, maximum: np.ndarray, window: int):
+        self.starts = starts
+        self.mean = mean
+        self.std = std
+        self.min = minimum
+        self.max = maximum
+        self.window = window
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        return f"RollingStats(windows={len(self)}, window={self.window})"
+
+
+class RollingAccumulator:
+    """
+    Mean, std, min and max of every `window`-sample window starting every
+    `step` samples (default: non-overlapping windows).
+
+    Sums come from per-chunk cumulative sums and extremes from linear-time
+    min/max filters, so the cost per chunk does not grow with the window.
+    """
+
+    def __init__(self, window: int, step: int = None):
+        self.window = window
+        self._framer = _Framer(window, step or window)
+        self._parts: List[Tuple] = []
+
+    def update(self, chunk: np.ndarray):
+        buffer, local, starts = self._framer.frames(chunk)
+        if not len(local):
+            return
+        window = self.window
+        # Shifted by a reference value so the sums of squares stay precise
+        reference = buffer[local[0]:local[-1] + window].mean()
+        shifted = buffer - reference
+        sums = np.concatenate(([0.0], np.cumsum(shifted)))
+        squares = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        total = sums[local + window] - sums[local]
+        variance = (squares[local + window] - squares[local] - total * total / window) / window
+        centre = local + window // 2
+        self._parts.append((
+            starts,
+            total / window + reference,
+            np.sqrt(np.maximum(variance, 0.0)),
+            minimum_filter1d(buffer, window, mode='nearest')[centre],
+            maximum_filter1d(buffer, window, mode='nearest')[centre]
+        ))
+
+    def result(self) -> RollingStats:
+        columns = [np.concatenate(column) if column else np.empty(0)
+                   for column in zip(*self._parts)] or [np.empty(0)] * 5
+        return RollingStats(columns[0].astype(np.int64), *columns[1:], window=self.window)
+
+
+class Spectrum:
+    """
+    Welch power spectral density.
+
+    Attributes:
+        frequencies: (F,) frequencies in cycles per sample times `fs`
+        power: (F,) one-sided power spectral density
+        n_segments: Segments averaged
+    """
+
+    def __init__(self, frequencies: np.ndarray, power: np.ndarray, n_segments: int):
+        self.frequencies = frequencies
+        self.power = power
+        self.n_segments = n_segments
+
+    def peak(self, skip_dc: bool = True) -> Tuple[float, float]:
+        """(frequency, power) of the strongest component"""
+        first = 1 if skip_dc else 0
+        index = first + int(np.argmax(self.power[first:]))
+        return float(self.frequencies[index]), float(self.power[index])
+
+    def band_power(self, low: float, high: float) -> float:
+        """Power integrated over low <= frequency < high"""
+        band = (self.frequencies >= low) & (self.frequencies < high)
+        resolution = self.frequencies[1] - self.frequencies[0]
+        return float(self.power[band].sum() * resolution)
+
+    def __repr__(self) -> str:
+        return f"Spectrum(bins={len(self.power)}, segments={self.n_segments})"
+
+
+class SpectrumAccumulator:
+    """
+    Welch power spectrum: the average periodogram of windowed, overlapping
+    `segment`-sample segments, scaled like scipy.signal.welch
+    (scaling='density').
+
+    Args:
+        segment: Samples per segment (frequency resolution fs / segment)
+        overlap: Fraction of a segment shared with the next one
+        window: Taper, any scipy.signal.get_window spec
+        fs: Sampling frequency (1.0 gives cycles per step)
+        detrend: Subtract each segment's mean
+    """
+
+    def __init__(self, segment: int = 1024, overlap: float = 0.5, window='hann',
+                 fs: float = 1.0, detrend: bool = True):
+        if not 0 <= overlap < 1:
+            raise ValueError(f"Overlap must be in [0, 1), got {overlap}")
+        self.segment = segment
+        self.fs = fs
+        self.detrend = detrend
+        self._taper = get_window(window, segment)
+        self._framer = _Framer(segment, segment - int(segment * overlap))
+        self._sum = np.zeros(segment // 2 + 1)
+        self._count = 0
+
+    def update(self, chunk: np.ndarray):
+        buffer, local, _ = self._framer.frames(chunk)
+        if not len(local):
+            return
+        # Read-only strided view of every window (sliding_window_view needs
+        # NumPy 1.20); indexing it copies only the frames used
+        windows = np.lib.stride_tricks.as_strided(
+            buffer, (len(buffer) - self.segment + 1, self.segment),
+            (buffer.strides[0], buffer.strides[0]), writeable=False)
+        segments = windows[local]
+        if self.detrend:
+            segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.fft.rfft(segments * self._taper, axis=1)
+        self._sum += np.sum(spectra.real ** 2 + spectra.imag ** 2, axis=0)
+        self._count += len(local)
+
+    def result(self) -> Spectrum:
+        if self._count == 0:
+            raise ValueError(f"A spectrum needs at least {self.segment} samples")
+        power = self._sum / (self._count * self.fs * np.sum(self._taper ** 2))
+        # One-sided: fold the negative frequencies (not DC or Nyquist)
+        power[1:(self.segment + 1) // 2] *= 2
+        return Spectrum(np.fft.rfftfreq(self.segment, 1 / self.fs), power, self._count)
+
+
+class Episodes:
+    """
+    Runs of consecutive samples on one side of a threshold.
+
+    Attributes:
+        count: Number of episodes
+        starts: (K,) stream index of each episode's first sample, or None
+            if episodes were only counted
+        lengths: (K,) samples per episode (or None); an episode still open
+            when the stream ends is cut there
+        occupied: Samples inside episodes
+        threshold: Threshold value
+        above: Whether episodes are runs >= threshold (else < threshold)
+        n_samples: Length of the stream
+    """
+
+    def __init__(self, count: int, starts: Optional[np.ndarray], lengths: Optional[np.ndarray],
+                 occupied: int, threshold: float, above: bool, n_samples: int):
+        self.count = count
+        self.starts = starts
+        self.lengths = lengths
+        self.occupied = occupied
+        self.threshold = threshold
+        self.above = above
+        self.n_samples = n_samples
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of samples inside an episode"""
+        return self.occupied / self.n_samples if self.n_samples else 0.0
+
+    def __repr__(self) -> str:
+        return (f"Episodes(count={self.count}, threshold={self.threshold}, "
+                f"above={self.above})")
+
+
+class EpisodeAccumulator:
+    """
+    Episodes of at least `min_length` samples at or above (or below) a
+    threshold, tracked across chunk boundaries.
+
+    Args:
+        threshold: Threshold value
+        above: Count runs >= threshold; False counts runs < threshold
+        min_length: Shortest run counted as an episode
+        keep: Keep episode starts and lengths; False only counts them, so
+            memory stays constant whatever the number of episodes
+    """
+
+    def __init__(self, threshold: float, above: bool = True, min_length: int = 1,
+                 keep: bool = True):
+        self.threshold = threshold
+        self.above = above
+        self.min_length = min_length
+        self.keep = keep
+        self._open: Optional[int] = None  # Start of a run still open
+        self._offset = 0
+        self._count = 0
+        self._occupied = 0
+        self._parts: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    def update(self, chunk: np.ndarray):
+        if not len(chunk):
+            return
+        inside = chunk >= self.threshold if self.above else chunk < self.threshold
+        changes = np.flatnonzero(inside[1:] != inside[:-1]) + 1
+        if inside[0] != (self._open is not None):
+            changes = np.concatenate(([0], changes))
+        rises = changes[inside[changes]] + self._offset
+        falls = changes[~inside[changes]] + self._offset
+        if self._open is not None:
+            rises = np.concatenate(([self._open], rises))
+        self._open = None
+        if len(rises) > len(falls):
+            self._open = int(rises[-1])
+            rises = rises[:-1]
+        self._offset += len(chunk)
+
+        lengths = falls - rises
+        counted = lengths >= self.min_length
+        self._count += int(counted.sum())
+        self._occupied += int(lengths[counted].sum())
+        if self.keep:
+            self._parts.append((rises[counted].astype(np.int64),
+                                lengths[counted].astype(np.int64)))
+
+    def result(self) -> Episodes:
+        # The open run is included without being closed, so result() can
+        # also be read mid-stream
+        count, occupied, parts = self._count, self._occupied, list(self._parts)
+        if self._open is not None and self._offset - self._open >= self.min_length:
+            count += 1
+            occupied += self._offset - self._open
+            parts.append((np.asarray([self._open], dtype=np.int64),
+                          np.asarray([self._offset - self._open], dtype=np.int64)))
+        starts = lengths = None
+        if self.keep:
+            starts = np.concatenate([p[0] for p in parts]) if parts else np.empty(0, np.int64)
+            lengths = np.concatenate([p[1] for p in parts]) if parts else np.empty(0, np.int64)
+        return Episodes(count, starts, lengths, occupied, self.threshold, self.above,
+                        self._offset)
+
+
+Accumulator = Union[RollingAccumulator, SpectrumAccumulator, EpisodeAccumulator]
+
+
+def analyze(source, *accumulators: Accumulator,
+            chunk_size: int = DEFAULT_CHUNK_SIZE) -> List:
+    """
+    Run several accumulators over a trajectory in a single chunked pass.
+
+    Example:
+        rolling, spectrum, lock_in = analyze(
+            MemmapHistory.open('asd_run.phi'),
+            RollingAccumulator(10000), SpectrumAccumulator(4096),
+            EpisodeAccumulator(0.9, min_length=10))
+
+    Returns:
+        Each accumulator's result, in order
+    """
+    for chunk in iter_chunks(source, chunk_size):
+        for accumulator in accumulators:
+            accumulator.update(chunk)
+    return [accumulator.result() for accumulator in accumulators]
+
+
+def rolling_stats(source, window: int, step: int = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> RollingStats:
+    """Rolling mean, std, min and max; see RollingAccumulator"""
+    return analyze(source, RollingAccumulator(window, step), chunk_size=chunk_size)[0]
+
+
+def power_spectrum(source, segment: int = 1024, overlap: float = 0.5, window='hann',
+                   fs: float = 1.0, detrend: bool = True,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Spectrum:
+    """Welch power spectral density; see SpectrumAccumulator"""
+    return analyze(source, SpectrumAccumulator(segment, overlap, window, fs, detrend),
+                   chunk_size=chunk_size)[0]
+
+
+def threshold_episodes(source, threshold: float, above: bool = True, min_length: int = 1,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Episodes:
+    """Episodes on one side of a threshold; see EpisodeAccumulator"""
+    return analyze(source, EpisodeAccumulator(threshold, above, min_length),
+                   chunk_size=chunk_size)[0]
+
+
+def count_episodes(source, thresholds: Sequence[float], above: bool = True,
+                   min_length: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Episode counts for several thresholds in one pass, in constant memory.
+
+    Returns:
+        (len(thresholds),) array of episode counts
+    """
+    accumulators = [EpisodeAccumulator(threshold, above, min_length, keep=False)
+                    for threshold in thresholds]
+    results = analyze(source, *accumulators, chunk_size=chunk_size)
+    return np.asarray([episodes.count for episodes in results], dtype=np.int64)
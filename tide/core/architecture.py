@@ -4,8 +4,13 @@ Cognitive architecture implementation based on dimensional organization patterns
 
 import numpy as np
 from typing import Dict, Any, List
-from ..config import ARCHITECTURE_CONFIGS
 from .dimensional_space import DimensionalSpace
+from .kernels import SCHEDULE_ADHERENCE, PAST_DISCOUNT, FUTURE_DISCOUNT, FOCUS_LEVELS
+from .registry import get_architecture
+from .instrumentation import register_probes
+from .rng import resolve_rng, current_generator, rng_state, restore_rng
+from .records import (ProcessedInformation, TemporalStructure,
+                      TemporalCompression, BehavioralSignature)
 
 class CognitiveArchitecture:
     """
@@ -13,34 +18,85 @@ class CognitiveArchitecture:
     
     Each architecture represents a valid solution to information integration,
     with different dimensional organizations creating distinct processing styles.
+    
+    Thread safety: process_information and get_behavioral_signature never
+    mutate the instance, so one architecture can serve concurrent calls
+    without locking. Construct it with an integer seed (or SeedSequence) to
+    give every thread its own random stream; with the default global RNG or
+    a shared Generator, concurrent calls stay correct but serialize on the
+    shared RNG state and are not reproducible.
     """
     
-    def __init__(self, architecture_type: str = 'NT'):
+    def __init__(self, architecture_type: str = 'NT', rng=None):
         """
         Initialize cognitive architecture.
         
         Args:
-            architecture_type: One of 'NT', 'ASD', 'ADHD'
+            architecture_type: One of 'NT', 'ASD', 'ADHD', or any type
+                added with tide.core.registry.register_architecture
+            rng: Random source - None (global NumPy RNG), an
+                np.random.Generator, or a seed for per-thread generators
         """
-        if architecture_type not in ARCHITECTURE_CONFIGS:
-            raise ValueError(f"Unknown architecture type: {architecture_type}")
+        # Raises ValueError for unregistered types
+        self._spec = get_architecture(architecture_type)
         
         self.type = architecture_type
-        self.config = ARCHITECTURE_CONFIGS[architecture_type]
         self.dimensional_space = DimensionalSpace()
+        self.rng = resolve_rng(rng)
+        self._geometry_cache = None
         self._initialize_architecture()
-    
+
     def _initialize_architecture(self):
         """Set up architecture-specific parameters"""
-        self.self_position = self.dimensional_space.compute_element_position(
-            'self', self.type
+        # Positions, distance and signature are derived from the registry on
+        # access (see _geometry), so runtime updates reach live instances.
+        # Constant sub-structures shared by compact and batch results
+        self._shared_temporal_structure = TemporalStructure(
+            self._create_rigid_schedule({}), SCHEDULE_ADHERENCE
         )
-        self.time_position = self.dimensional_space.compute_element_position(
-            'time', self.type
-        )
-        self.integration_distance = np.linalg.norm(
-            self.self_position - self.time_position
+        self._shared_temporal_compression = TemporalCompression(
+            'now', PAST_DISCOUNT, FUTURE_DISCOUNT
         )
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current config of this architecture type"""
+        return self._spec.config
+
+    @property
+    def self_position(self) -> np.ndarray:
+        return self._geometry()[0]
+
+    @property
+    def time_position(self) -> np.ndarray:
+        return self._geometry()[1]
+
+    @property
+    def integration_distance(self) -> float:
+        return self._geometry()[2]
+
+    def _geometry(self):
+        """
+        Self and time positions and their distance. Computed once per
+        architecture type and mapping version and shared by every instance,
+        so a mapping update never has to visit instances; each instance
+        keeps a reference keyed by the mapping version it was read at.
+        """
+        version = self._spec.versions['mapping']
+        cached = self._geometry_cache
+        if cached is None or cached[0] != version:
+            cached = (version, self._spec.derived('geometry', ('mapping',),
+                                                  self._compute_geometry))
+            self._geometry_cache = cached
+        return cached[1]
+
+    def _compute_geometry(self):
+        self_position = self.dimensional_space.compute_element_position('self', self.type)
+        time_position = self.dimensional_space.compute_element_position('time', self.type)
+        self_position.flags.writeable = False
+        time_position.flags.writeable = False
+        return (self_position, time_position,
+                np.linalg.norm(self_position - time_position))
     
     def process_information(self, information: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -53,32 +109,63 @@ class CognitiveArchitecture:
             Processed information with architecture-specific modifications
         """
         processed = information.copy()
+        # Architecture-specific fields come from the style kernel bound to
+        # this architecture at registration (see tide.core.registry)
+        processed.update(self._spec.process(self, information, False))
+        processed['architecture_signature'] = self.type
+        return processed
+    
+    def process_record(self, information: Dict[str, Any]) -> ProcessedInformation:
+        """
+        Compact variant of process_information.
         
-        if self.type == 'NT':
-            # Flexible processing with dynamic self-time integration
-            processed['temporal_flexibility'] = self._apply_temporal_flexibility(
-                information
-            )
-            processed['self_adaptation'] = self._apply_self_adaptation(information)
-            
-        elif self.type == 'ASD':
-            # Systematic processing with crystallized patterns
-            processed['temporal_structure'] = self._apply_temporal_structure(
-                information
-            )
-            processed['rule_consistency'] = self._apply_rule_consistency(information)
+        Returns a __slots__ record that reads like the processed dict (it is
+        a read-only Mapping; `as_dict()` gives the plain dict). Constant
+        sub-structures - the ASD temporal structure and the ADHD temporal
+        compression - are shared by every record of this architecture.
+        """
+        return ProcessedInformation(information, self.type,
+                                    **self._spec.process(self, information, True))
+    
+    def process_batch(self, batch) -> Dict[str, np.ndarray]:
+        """
+        Process a columnar batch of information records in one vectorized pass.
+        
+        Nested per-record structures are flattened into columns, and columns
+        that are constant for the architecture are zero-copy read-only
+        broadcasts. The ASD schedule is built once per architecture and
+        shared by every record rather than rebuilt.
+        
+        Args:
+            batch: Dict of equal-length arrays (e.g. {'content': [...],
+                'temporal_context': [...]}) or a NumPy structured array
             
-        elif self.type == 'ADHD':
-            # Immediate processing with collapsed temporal dimension
-            processed['temporal_compression'] = self._compress_to_now(information)
-            processed['intensity_focus'] = self._apply_intensity_focus(information)
+        Returns:
+            Dict of columns: the input columns (not copied) plus
+            - NT: temporal_flexibility, self_adaptation
+            - ASD: schedule, adherence, rule_consistency
+            - ADHD: temporal_window, past_discount, future_discount,
+              intensity_focus
+            - all: architecture_signature
+        """
+        columns = _as_columns(batch)
+        n = len(next(iter(columns.values()))) if columns else 0
+        generator = current_generator(self.rng)
         
-        processed['architecture_signature'] = self.type
-        return processed
+        def constant(value):
+            return np.broadcast_to(np.asarray(value), (n,))
+        
+        self._spec.process_batch(self, columns, n, generator, constant)
+        columns['architecture_signature'] = constant(self.type)
+        return columns
+    
+    def _shared_schedule(self) -> List[Dict]:
+        """Rigid schedule built once and shared by all batch records"""
+        return self._shared_temporal_structure.schedule
     
     def _apply_temporal_flexibility(self, info: Dict[str, Any]) -> float:
         """NT: Flexible temporal processing"""
-        return np.random.normal(0.5, 0.2)  # Variable temporal scaling
+        return current_generator(self.rng).normal(0.5, 0.2)  # Variable temporal scaling
     
     def _apply_self_adaptation(self, info: Dict[str, Any]) -> float:
         """NT: Adaptive self-representation"""
@@ -88,7 +175,7 @@ class CognitiveArchitecture:
         """ASD: Structured temporal processing"""
         return {
             'schedule': self._create_rigid_schedule(info),
-            'adherence': 0.9  # High adherence to structure
+            'adherence': SCHEDULE_ADHERENCE
         }
     
     def _apply_rule_consistency(self, info: Dict[str, Any]) -> float:
@@ -99,13 +186,13 @@ class CognitiveArchitecture:
         """ADHD: Collapse temporal dimension to present"""
         return {
             'temporal_window': 'now',
-            'past_discount': 0.9,  # Heavy discounting of past
-            'future_discount': 0.8  # Heavy discounting of future
+            'past_discount': PAST_DISCOUNT,
+            'future_discount': FUTURE_DISCOUNT
         }
     
     def _apply_intensity_focus(self, info: Dict[str, Any]) -> float:
         """ADHD: Intense focus on current stimuli"""
-        return np.random.choice([0.1, 0.9])  # Either no focus or hyperfocus
+        return current_generator(self.rng).choice(FOCUS_LEVELS)
     
     def _create_rigid_schedule(self, info: Dict[str, Any]) -> List[Dict]:
         """Create structured schedule for ASD processing"""
@@ -123,3 +210,55 @@ class CognitiveArchitecture:
             'planning_horizon': self.config['planning_horizon'],
             'self_time_integration': 1.0 / (1.0 + self.integration_distance)
         }
+    
+    def behavioral_signature(self) -> BehavioralSignature:
+        """
+        Compact, cached variant of get_behavioral_signature.
+        Returns the same read-only record on every call until the
+        architecture's config or mapping changes.
+        """
+        return self._spec.derived(
+            'signature', ('config', 'mapping'),
+            lambda: BehavioralSignature(**self.get_behavioral_signature())
+        )
+    
+    def get_state(self) -> Dict[str, Any]:
+        """State for checkpoints: the type and the random source's position"""
+        return {'type': self.type, 'fingerprint': self._spec.fingerprint(),
+                'rng': rng_state(self.rng)}
+    
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], rng=None) -> 'CognitiveArchitecture':
+        """
+        Architecture continuing bit-identically from get_state() output.
+        
+        Args:
+            state: Saved state
+            rng: Random source replacing the saved one (restore() passes
+                sources shared with other restored objects)
+        """
+        from .checkpoint import check_fingerprints
+        check_fingerprints({state['type']: state['fingerprint']})
+        return cls(state['type'], rng=restore_rng(state['rng']) if rng is None else rng)
+
+
+def _as_columns(batch) -> Dict[str, np.ndarray]:
+    """View a dict of sequences or a structured array as a dict of columns"""
+    if isinstance(batch, np.ndarray):
+        if batch.dtype.names is None:
+            raise ValueError("Array batches must be NumPy structured arrays")
+        return {name: batch[name] for name in batch.dtype.names}
+    
+    columns = {name: np.asarray(values) for name, values in batch.items()}
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Batch columns have different lengths: {sorted(lengths)}")
+    return columns
+
+
+register_probes(CognitiveArchitecture, [
+    'process_information', 'process_record', 'process_batch',
+    '_apply_temporal_flexibility', '_apply_self_adaptation', '_apply_temporal_structure',
+    '_apply_rule_consistency', '_compress_to_now', '_apply_intensity_focus',
+    '_create_rigid_schedule', 'get_behavioral_signature'
+])
@@ -0,0 +1,264 @@
+"""
+Checkpoint and resume.
+
+A checkpoint is one .npz file: every array of the saved state is stored
+as a raw .npy entry and the rest of the state (counters, RNG positions,
+architecture fingerprints) as a JSON entry. Files are written next to
+their destination and renamed over it, so a crash mid-write leaves the
+previous checkpoint intact.
+
+CheckpointWriter writes on a background thread. The step loop only takes
+a snapshot (copies of the state that will keep changing) and hands it
+over; if a write is still running when the next snapshot arrives, the
+newer snapshot replaces the one waiting.
+
+Engines, architectures and histories expose get_state()/from_state();
+capture() and restore() checkpoint any mix of them (see also
+ArchitectureSimulator.simulate(checkpoint=...) and
+ArchitectureSimulator.resume).
+"""
+
+import json
+import os
+import threading
+import time
+import numpy as np
+from typing import Any, Callable, Dict, Optional
+
+CHECKPOINT_FORMAT = 'tide-checkpoint'
+CHECKPOINT_VERSION = 1
+_META_KEY = '__meta__'
+
+
+def _split(value, arrays: Dict[str, np.ndarray]):
+    """Replace arrays in a nested state by references into `arrays`"""
+    if isinstance(value, np.ndarray):
+        key = f'a{len(arrays)}'
+        arrays[key] = value
+        return {'__array__': key}
+    if isinstance(value, dict):
+        return {str(k): _split(v, arrays) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_split(v, arrays) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _join(value, arrays):
+    if isinstance(value, dict):
+        if set(value) == {'__array__'}:
+            return arrays[value['__array__']]
+        return {k: _join(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_join(v, arrays) for v in value]
+    return value
+
+
+def save_checkpoint(path: str, state: Dict[str, Any], compress: bool = False):
+    """
+    Atomically write a nested state (dicts, lists, JSON scalars and NumPy
+    arrays) as a checkpoint.
+
+    Args:
+        path: Checkpoint file (conventionally *.npz)
+        state: State to save
+        compress: Deflate the arrays (smaller, slower to write)
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    meta = {'format': CHECKPOINT_FORMAT, 'version': CHECKPOINT_VERSION,
+            'state': _split(state, arrays)}
+    arrays[_META_KEY] = np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8)
+
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'wb') as f:
+        (np.savez_compressed if compress else np.savez)(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """Read a checkpoint written by save_checkpoint"""
+    stored = np.load(path, allow_pickle=False)
+    if not isinstance(stored, np.lib.npyio.NpzFile):
+        raise ValueError(f"{path} is not a TIDE checkpoint")
+    with stored:
+        if _META_KEY not in stored.files:
+            raise ValueError(f"{path} is not a TIDE checkpoint")
+        meta = json.loads(stored[_META_KEY].tobytes().decode())
+        if meta.get('format') != CHECKPOINT_FORMAT:
+            raise ValueError(f"{path} is not a TIDE checkpoint")
+        if meta['version'] > CHECKPOINT_VERSION:
+            raise ValueError(f"{path} has checkpoint version {meta['version']}; "
+                             f"this TIDE reads up to {CHECKPOINT_VERSION}")
+        arrays = {name: stored[name] for name in stored.files if name != _META_KEY}
+    return _join(meta['state'], arrays)
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints to one path on a background thread.
+
+    Args:
+        path: Checkpoint file
+        compress: Deflate the arrays
+        before_write: Called on the writer thread before each write, e.g.
+            to flush data the checkpoint refers to
+
+    Attributes:
+        writes: Checkpoints written
+        replaced: Snapshots superseded before they were written
+        last_write_seconds: Duration of the last write
+    """
+
+    def __init__(self, path: str, compress: bool = False,
+                 before_write: Callable[[], None] = None):
+        self.path = path
+        self.compress = compress
+        self.before_write = before_write
+        self.writes = 0
+        self.replaced = 0
+        self.last_write_seconds = 0.0
+        self._pending: Optional[Dict] = None
+        self._busy = False
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._work, name='tide-checkpoint',
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, state: Dict[str, Any]):
+        """
+        Queue a snapshot without waiting for it to be written. The state
+        must not be modified afterwards (pass copies of live arrays).
+        """
+        with self._condition:
+            self._raise_error()
+            if self._closed:
+                raise ValueError("Checkpoint writer is closed")
+            if self._pending is not None:
+                self.replaced += 1
+            self._pending = state
+            self._condition.notify_all()
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                state, self._pending = self._pending, None
+                self._busy = True
+            try:
+                start = time.perf_counter()
+                if self.before_write is not None:
+                    self.before_write()
+                save_checkpoint(self.path, state, self.compress)
+                self.last_write_seconds = time.perf_counter() - start
+                self.writes += 1
+            except BaseException as error:
+                self._error = error
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def flush(self):
+        """Wait until every submitted snapshot has been written"""
+        with self._condition:
+            while self._pending is not None or self._busy:
+                self._condition.wait()
+            self._raise_error()
+
+    def close(self):
+        """Write the last snapshot and stop the thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self) -> 'CheckpointWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _restorable():
+    from .architecture import CognitiveArchitecture
+    from .history import IntegrationHistory, MemmapHistory
+    from .integration import IntegrationEngine
+    return {cls.__name__: cls for cls in
+            (CognitiveArchitecture, IntegrationEngine, IntegrationHistory, MemmapHistory)}
+
+
+def capture(**objects) -> Dict[str, Any]:
+    """
+    Snapshot named objects for a checkpoint. Engines, architectures and
+    histories are saved with get_state(); anything else (step counters,
+    arrays, JSON values) is saved as-is, so arrays that keep changing
+    should be passed as copies. Objects sharing one random source still
+    share it after restore().
+
+    Example:
+        writer = CheckpointWriter('run.npz')
+        for step in range(start, n_steps):
+            phi = engine.compute_integration(self_state, time_state)
+            if step % 10000 == 0:
+                writer.submit(capture(engine=engine, step=step + 1))
+    """
+    classes = _restorable()
+    saved, shared = {}, {}
+    for name, value in objects.items():
+        if type(value).__name__ not in classes:
+            saved[name] = {'value': value}
+            continue
+        entry = {'class': type(value).__name__, 'state': value.get_state()}
+        rng = getattr(value, 'rng', None)
+        if rng is not None and rng is not np.random:
+            entry['rng'] = shared.setdefault(id(rng), len(shared))
+        saved[name] = entry
+    return {'kind': 'objects', 'objects': saved}
+
+
+def restore(checkpoint) -> Dict[str, Any]:
+    """
+    Objects saved with capture(), from a checkpoint path or loaded state.
+    Restored engines and architectures continue bit-identically.
+    """
+    from .rng import restore_rng
+
+    state = load_checkpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+    if state.get('kind') != 'objects':
+        raise ValueError("Checkpoint was not written with capture()")
+    classes = _restorable()
+    restored, rngs = {}, {}
+    for name, entry in state['objects'].items():
+        if 'class' not in entry:
+            restored[name] = entry['value']
+            continue
+        kwargs = {}
+        if 'rng' in entry:
+            if entry['rng'] not in rngs:
+                rngs[entry['rng']] = restore_rng(entry['state']['rng'])
+            kwargs['rng'] = rngs[entry['rng']]
+        restored[name] = classes[entry['class']].from_state(entry['state'], **kwargs)
+    return restored
+
+
+def check_fingerprints(fingerprints: Dict[str, str]):
+    """Raise ValueError if a saved architecture has changed since"""
+    from .registry import get_architecture
+    for name, fingerprint in fingerprints.items():
+        if get_architecture(name).fingerprint() != fingerprint:
+            raise ValueError(f"Architecture {name} has changed since the checkpoint "
+                             f"was written; resuming would not reproduce the run")
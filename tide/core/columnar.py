@@ -0,0 +1,355 @@
+"""
+Columnar export of simulation outputs.
+
+A result set is a directory holding one .npy file per column plus a
+schema.json describing the columns and the configs of the architectures
+involved. Columns are loaded with mmap_mode='r', so opening a result set
+costs the same whatever its size and every column is a zero-copy view of
+its file. String columns are stored as integer codes with their categories
+in the schema.
+
+save_columns writes a result set from whole arrays; ColumnWriter builds one
+from batches of rows, appending to each column file as batches arrive.
+"""
+
+import json
+import os
+import struct
+import numpy as np
+from typing import Dict, Iterable, Mapping, Sequence
+from .registry import get_architecture
+
+SCHEMA_FILE = 'schema.json'
+SCHEMA_FORMAT = 'tide-columnar'
+SCHEMA_VERSION = 1
+_NPY_HEADER_SIZE = 128  # Bytes reserved for the header of an appended column file
+
+
+def _describe_architectures(names: Iterable[str]) -> Dict[str, Dict]:
+    """Config and element mapping of each named architecture"""
+    described = {}
+    for name in names:
+        spec = get_architecture(name)
+        described[name] = {
+            'config': spec.config,
+            'mapping': {element: list(position)
+                        for element, position in spec.mapping.items()}
+        }
+    return described
+
+
+def save_columns(path: str, columns: Mapping[str, np.ndarray],
+                 architectures: Sequence[str] = (), metadata: Dict = None,
+                 overwrite: bool = False):
+    """
+    Write a columnar result set.
+
+    Args:
+        path: Output directory
+        columns: Name -> array. 1-D arrays sharing the leading length form
+            the table; other arrays (e.g. (T, N) trajectories) are stored
+            alongside. String columns become categorical codes.
+        architectures: Architecture types whose configs go in the schema
+        metadata: Extra JSON-serializable information for the schema
+        overwrite: Replace an existing result set at `path`
+    """
+    _prepare(path, overwrite)
+
+    schema_columns = {}
+    for name, values in columns.items():
+        values = np.asarray(values)
+        entry = {}
+        if values.dtype.kind == 'U' or (values.dtype.kind == 'O' and all(
+                isinstance(value, str) for value in values.ravel().tolist())):
+            categories, codes = np.unique(values.astype(str), return_inverse=True)
+            code_type = np.min_scalar_type(max(len(categories) - 1, 0))
+            values = codes.reshape(values.shape).astype(code_type)
+            entry['categories'] = categories.tolist()
+        elif values.dtype.hasobject:
+            raise ValueError(f"Column {name!r} holds Python objects and cannot be mapped")
+        np.save(os.path.join(path, f'{name}.npy'), values, allow_pickle=False)
+        entry.update(dtype=values.dtype.descr if values.dtype.names else values.dtype.str,
+                     shape=list(values.shape))
+        schema_columns[name] = entry
+
+    _write_schema(path, schema_columns, architectures, metadata)
+
+
+def _prepare(path: str, overwrite: bool):
+    if os.path.exists(os.path.join(path, SCHEMA_FILE)) and not overwrite:
+        raise ValueError(f"Result set already exists at {path}")
+    os.makedirs(path, exist_ok=True)
+
+
+def _write_schema(path: str, schema_columns: Dict[str, Dict],
+                  architectures: Sequence[str], metadata: Dict):
+    lengths = [entry['shape'][0] for entry in schema_columns.values()
+               if len(entry['shape']) == 1]
+    schema = {
+        'format': SCHEMA_FORMAT,
+        'version': SCHEMA_VERSION,
+        'n_rows': max(set(lengths), key=lengths.count) if lengths else 0,
+        'columns': schema_columns,
+        'architectures': _describe_architectures(architectures),
+        'metadata': metadata or {}
+    }
+    # The schema is written last, so a result set without one is incomplete
+    with open(os.path.join(path, SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f, indent=2)
+
+
+def _npy_header(dtype: np.dtype, length: int) -> bytes:
+    """.npy (version 1.0) header of a 1-D array, padded to _NPY_HEADER_SIZE"""
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype),
+                   'fortran_order': False, 'shape': (length,)}).encode('latin1')
+    prefix = np.lib.format.magic(1, 0)
+    size = _NPY_HEADER_SIZE - len(prefix) - 2
+    if len(header) >= size:
+        raise ValueError(f"dtype {dtype} does not fit an appendable column header")
+    return prefix + struct.pack('<H', size) + header.ljust(size - 1) + b'\n'
+
+
+class ColumnWriter:
+    """
+    Write a columnar result set batch by batch.
+
+    Each append() writes its rows to the end of every column file, so memory
+    use does not grow with the result set. The .npy headers and the schema
+    are written by close(); until then the result set is incomplete.
+    String columns become categorical codes, with categories in order of
+    first appearance.
+
+    Args:
+        path: Output directory
+        architectures: Architecture types whose configs go in the schema
+        metadata: Extra JSON-serializable information for the schema
+        overwrite: Replace an existing result set at `path`
+    """
+
+    def __init__(self, path: str, architectures: Sequence[str] = (),
+                 metadata: Dict = None, overwrite: bool = False):
+        _prepare(path, overwrite)
+        self.path = path
+        self.architectures = list(architectures)
+        self.metadata = metadata
+        self.n_rows = 0
+        self._files = {}
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._categories: Dict[str, Dict[str, int]] = {}
+
+    def _open(self, columns: Mapping[str, np.ndarray]):
+        for name, values in columns.items():
+            if values.dtype.kind == 'U':
+                self._categories[name] = {}
+                dtype = np.dtype(np.int32)
+            elif values.dtype.hasobject or values.dtype.names:
+                raise ValueError(f"Column {name!r} cannot be appended")
+            else:
+                dtype = values.dtype
+            self._dtypes[name] = dtype
+            self._files[name] = open(os.path.join(self.path, f'{name}.npy'), 'wb')
+            self._files[name].write(_npy_header(dtype, 0))
+
+    def append(self, columns: Mapping[str, np.ndarray]):
+        """Append a batch of rows: name -> 1-D array, the same names every time"""
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        if not self._dtypes:
+            self._open(columns)
+        if set(columns) != set(self._files):
+            raise ValueError(f"Expected columns {sorted(self._files)}, "
+                             f"got {sorted(columns)}")
+        lengths = {values.shape for values in columns.values()}
+        if len(lengths) > 1 or any(len(shape) != 1 for shape in lengths):
+            raise ValueError("Appended columns must be 1-D and of equal length")
+
+        for name, values in columns.items():
+            categories = self._categories.get(name)
+            if categories is not None:
+                uniques, inverse = np.unique(values, return_inverse=True)
+                codes = [categories.setdefault(value, len(categories))
+                         for value in uniques.tolist()]
+                values = np.asarray(codes, dtype=np.int32)[inverse]
+            np.ascontiguousarray(values, dtype=self._dtypes[name]).tofile(self._files[name])
+        self.n_rows += next(iter(lengths))[0] if lengths else 0
+
+    def close(self):
+        """Finish the column files and write the schema"""
+        schema_columns = {}
+        for name, f in self._files.items():
+            f.seek(0)
+            f.write(_npy_header(self._dtypes[name], self.n_rows))
+            f.close()
+            entry = {}
+            if name in self._categories:
+                entry['categories'] = list(self._categories[name])
+            entry.update(dtype=self._dtypes[name].str, shape=[self.n_rows])
+            schema_columns[name] = entry
+        self._files = {}
+        _write_schema(self.path, schema_columns, self.architectures, self.metadata)
+
+    def __enter__(self) -> 'ColumnWriter':
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave the result set without a schema, i.e. incomplete
+            for f in self._files.values():
+                f.close()
+
+
+class ColumnarResult:
+    """
+    A memory-mapped result set; see load_columns.
+
+    Attributes:
+        schema: Parsed schema.json
+        columns: Name -> read-only np.memmap (codes for categorical columns)
+    """
+
+    def __init__(self, path: str):
+        schema_path = os.path.join(path, SCHEMA_FILE)
+        if not os.path.exists(schema_path):
+            raise ValueError(f"No result set at {path}")
+        with open(schema_path) as f:
+            self.schema = json.load(f)
+        if self.schema.get('format') != SCHEMA_FORMAT:
+            raise ValueError(f"{schema_path} is not a TIDE result schema")
+        self.path = path
+        self.columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+                        for name in self.schema['columns']}
+
+    @property
+    def n_rows(self) -> int:
+        return self.schema['n_rows']
+
+    @property
+    def architectures(self) -> Dict[str, Dict]:
+        """Config and mapping of every architecture in the result set"""
+        return self.schema['architectures']
+
+    @property
+    def metadata(self) -> Dict:
+        return self.schema['metadata']
+
+    def categories(self, name: str):
+        """Categories of a categorical column (None otherwise)"""
+        return self.schema['columns'][name].get('categories')
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """
+        A column; categorical columns are decoded to strings (which
+        materializes them), other columns are zero-copy.
+        """
+        values = self.columns[name]
+        categories = self.categories(name)
+        if categories is not None:
+            return np.asarray(categories)[values]
+        return values
+
+    def __contains__(self, name) -> bool:
+        return name in self.columns
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def to_dataframe(self, columns: Sequence[str] = None):
+        """
+        pandas DataFrame view of the table columns.
+
+        Numeric columns are not copied; categorical columns become
+        pd.Categorical over their stored codes. Columns that are not 1-D of
+        length n_rows (e.g. trajectories) are left out.
+        """
+        import pandas as pd
+
+        names = columns or [name for name, entry in self.schema['columns'].items()
+                            if entry['shape'] == [self.n_rows]]
+        data = {}
+        for name in names:
+            categories = self.categories(name)
+            if categories is None:
+                data[name] = self.columns[name]
+            else:
+                data[name] = pd.Categorical.from_codes(
+                    self.columns[name], categories)
+        return pd.DataFrame(data, copy=False)
+
+    def __repr__(self) -> str:
+        return (f"ColumnarResult({self.path!r}, rows={self.n_rows}, "
+                f"columns={list(self.columns)})")
+
+
+def load_columns(path: str) -> ColumnarResult:
+    """Open a result set; every column is memory-mapped, nothing is read"""
+    return ColumnarResult(path)
+
+
+def save_simulation(result, path: str, metadata: Dict = None, overwrite: bool = False):
+    """
+    Export a SimulationResult: one row per agent, plus the (T, N) Φ
+    trajectories when they were recorded.
+    """
+    columns = {'agent_type': result.agent_types, 'mean_phi': result.mean_phi,
+               'stability': result.stability}
+    if result.phi is not None:
+        columns['phi'] = result.phi
+    save_columns(path, columns, np.unique(result.agent_types).tolist(),
+                 dict(metadata or {}, n_steps=result.n_steps), overwrite)
+
+
+def save_replicates(results, path: str, metadata: Dict = None, overwrite: bool = False):
+    """
+    Export ReplicateResults: one row per (replicate, agent), replicate-major.
+    """
+    n_replicates, n_agents = results.mean_phi.shape
+    columns = {
+        'replicate': np.repeat(np.arange(n_replicates, dtype=np.int32), n_agents),
+        'agent': np.tile(np.arange(n_agents, dtype=np.int32), n_replicates),
+        'agent_type': np.tile(results.agent_types, n_replicates),
+        'mean_phi': results.mean_phi.ravel(),
+        'stability': results.stability.ravel()
+    }
+    root_seed = results.root_seed
+    save_columns(path, columns, np.unique(results.agent_types).tolist(),
+                 dict(metadata or {}, root_seed=root_seed if isinstance(root_seed, int)
+                      else repr(root_seed)), overwrite)
+
+
+def save_records(records, path: str, metadata: Dict = None, overwrite: bool = False):
+    """
+    Export processed information: a PROCESSED_DTYPE array, or records
+    (ProcessedInformation or dicts) packed with records_to_array. One
+    column per field; fields an architecture does not produce are NaN.
+    """
+    from .records import PROCESSED_DTYPE, records_to_array
+    from .registry import REGISTRY
+
+    if not (isinstance(records, np.ndarray) and records.dtype == PROCESSED_DTYPE):
+        records = records_to_array(records)
+    names = [spec.name for spec in REGISTRY.specs]
+    architecture = np.asarray(names)[records['architecture']]
+    columns = {'architecture': architecture}
+    columns.update((field, records[field]) for field in PROCESSED_DTYPE.names[1:])
+    save_columns(path, columns, np.unique(architecture).tolist(), metadata, overwrite)
+
+
+def save_signatures(architectures: Sequence[str], path: str, consistency: Mapping = None,
+                    metadata: Dict = None, overwrite: bool = False):
+    """
+    Export behavioral signatures, one row per architecture, with optional
+    plan consistency per architecture.
+    """
+    from .architecture import CognitiveArchitecture
+
+    signatures = [CognitiveArchitecture(arch).get_behavioral_signature()
+                  for arch in architectures]
+    columns = {'architecture': np.asarray(architectures)}
+    for key in signatures[0] if signatures else []:
+        columns[key] = np.asarray([signature[key] for signature in signatures],
+                                  dtype=np.float64)
+    if consistency is not None:
+        columns['plan_consistency'] = np.asarray(
+            [consistency.get(arch, np.nan) for arch in architectures], dtype=np.float64)
+    save_columns(path, columns, architectures, metadata, overwrite)
@@ -4,8 +4,113 @@ Based on Levinson (2021) dissertation findings on internal/external processing.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+from typing import Dict, List, Mapping, Sequence, Tuple, Union
 from ..config import INTERNAL_FEATURES, EXTERNAL_FEATURES
+from ..config import ELEMENT_MAPPINGS, DEFAULT_POSITION  # Re-exported
+from .registry import REGISTRY
+
+INTERNAL_EXTERNAL = ('internal', 'external')
+
+
+class ElementTable:
+    """
+    Element positions of a standalone space of any dimensionality.
+
+    Holds the same read-only (architectures x elements + 1 x dimensions)
+    position table the architecture registry compiles, with unmapped
+    elements at ID 0. Pairwise distances are computed per query rather
+    than tabulated, since a dense table grows with the square of the
+    element count.
+    """
+
+    def __init__(self, architectures: Sequence[str], elements: Sequence[str],
+                 positions: np.ndarray, default: np.ndarray):
+        self.elements = list(elements)
+        self._element_ids = {element: i + 1 for i, element in enumerate(self.elements)}
+        if len(self._element_ids) != len(self.elements):
+            raise ValueError("Element names must be unique")
+        self._architectures = {name: i for i, name in enumerate(architectures)}
+        table = np.empty((len(self._architectures), len(self.elements) + 1,
+                          len(default)))
+        table[:, 0] = default
+        table[:, 1:] = positions
+        table.flags.writeable = False
+        self.positions = table
+        self.distances = None
+        self.version = 0
+
+    def names(self) -> List[str]:
+        return list(self._architectures)
+
+    def index(self, name: str) -> int:
+        try:
+            return self._architectures[name]
+        except KeyError:
+            raise ValueError(f"Unknown architecture type: {name}") from None
+
+    def element_id(self, element: str) -> int:
+        return self._element_ids.get(element, 0)
+
+
+class ElementIndex:
+    """
+    KD-tree (scipy.spatial.cKDTree) over one architecture's element
+    positions, answering k-nearest and radius queries without scanning
+    every element.
+
+    Queries return element IDs (row i of the tree is element ID i + 1);
+    map them to names with `names`.
+    """
+
+    def __init__(self, elements: Sequence[str], positions: np.ndarray, leafsize: int = 16):
+        self.elements = np.asarray([''] + list(elements), dtype=object)
+        self.positions = positions
+        self.tree = cKDTree(positions, leafsize=leafsize)
+
+    def __len__(self) -> int:
+        return self.tree.n
+
+    def names(self, ids) -> np.ndarray:
+        """Element names of an array of IDs"""
+        return self.elements[ids]
+
+    def nearest(self, points: np.ndarray, k: int = 1,
+                workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k nearest elements to each point.
+
+        Args:
+            points: (d,) point or (m, d) points
+            k: Neighbours per point (capped at the element count)
+            workers: Threads for bulk queries (-1 uses every core)
+
+        Returns:
+            (distances, ids), each (k,) or (m, k), nearest first
+        """
+        k = min(k, len(self))
+        if k == 0:
+            # cKDTree cannot be queried for no neighbours
+            shape = np.shape(points)[:-1] + (0,)
+            return np.empty(shape), np.empty(shape, dtype=np.intp)
+        distances, rows = self.tree.query(points, k=[*range(1, k + 1)], workers=workers)
+        return distances, rows + 1
+
+    def within(self, point: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Elements within `radius` of a point.
+
+        Returns:
+            (distances, ids), nearest first
+        """
+        if not len(self):
+            return np.empty(0), np.empty(0, dtype=np.intp)
+        rows = np.asarray(self.tree.query_ball_point(point, radius), dtype=np.intp)
+        distances = np.linalg.norm(self.positions[rows] - point, axis=-1)
+        order = np.argsort(distances, kind='stable')
+        return distances[order], rows[order] + 1
+
 
 class DimensionalSpace:
     """
@@ -13,16 +118,101 @@ class DimensionalSpace:
     
     Internal dimension: fluid, experiential, social-emotional processing
     External dimension: structured, systematic, logical-temporal processing
+    
+    By default the space is the 2-D [internal, external] space of the
+    registered architectures. Standalone spaces with any number of
+    dimensions and elements are built from `mappings` or with from_arrays.
     """
     
-    def __init__(self):
+    def __init__(self, mappings: Mapping[str, Mapping[str, Sequence[float]]] = None,
+                 dimensions: Union[int, Sequence[str]] = None,
+                 default: Sequence[float] = None):
+        """
+        Args:
+            mappings: Architecture -> element -> position for a standalone
+                space; None uses the registered architectures
+            dimensions: Axis names, or their number (named dim_0, dim_1,
+                ...); defaults to the length of the positions
+            default: Position of unmapped elements (defaults to 0.5 on
+                every axis)
+        """
         self.internal_features = INTERNAL_FEATURES
         self.external_features = EXTERNAL_FEATURES
+        self._indexes = {}
+        if mappings is None:
+            # Positions and distances are compiled by the architecture registry
+            self.registry = REGISTRY
+            self.dimensions = INTERNAL_EXTERNAL
+        else:
+            elements = list(dict.fromkeys(element for mapping in mappings.values()
+                                          for element in mapping))
+            if dimensions is None:
+                first = next((position for mapping in mappings.values()
+                              for position in mapping.values()), DEFAULT_POSITION)
+                dimensions = len(first)
+            n_dims = dimensions if isinstance(dimensions, int) else len(dimensions)
+            default = self._default(default, n_dims)
+            positions = np.empty((len(mappings), len(elements), n_dims))
+            positions[:] = default
+            ids = {element: i for i, element in enumerate(elements)}
+            for row, mapping in enumerate(mappings.values()):
+                for element, position in mapping.items():
+                    if len(position) != n_dims:
+                        raise ValueError(f"Position of {element!r} has {len(position)} "
+                                         f"coordinates, expected {n_dims}")
+                    positions[row, ids[element]] = position
+            self._use_table(list(mappings), elements, positions, dimensions, default)
         self._initialize_space()
     
+    @classmethod
+    def from_arrays(cls, elements: Sequence[str], positions: np.ndarray,
+                    architectures: Sequence[str] = ('NT',),
+                    dimensions: Union[int, Sequence[str]] = None,
+                    default: Sequence[float] = None) -> 'DimensionalSpace':
+        """
+        Standalone space from position arrays, e.g. thousands of elements
+        in 8-64 dimensions.
+
+        Args:
+            elements: E element names
+            positions: (E, d) positions shared by every architecture, or
+                (A, E, d) positions per architecture
+            architectures: A architecture names
+            dimensions: Axis names, or their number
+            default: Position of unmapped elements
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.ndim == 2:
+            positions = np.broadcast_to(positions, (len(architectures),) + positions.shape)
+        if positions.shape[:2] != (len(architectures), len(elements)):
+            raise ValueError(f"Expected ({len(architectures)}, {len(elements)}, d) "
+                             f"positions, got shape {positions.shape}")
+        space = cls()
+        n_dims = positions.shape[2]
+        space._use_table(architectures, elements, positions,
+                         n_dims if dimensions is None else dimensions,
+                         cls._default(default, n_dims))
+        space._initialize_space()
+        return space
+    
+    @staticmethod
+    def _default(default, n_dims: int) -> np.ndarray:
+        return np.full(n_dims, 0.5) if default is None else np.asarray(default, dtype=np.float64)
+    
+    def _use_table(self, architectures, elements, positions, dimensions, default):
+        if isinstance(dimensions, int):
+            dimensions = tuple(f'dim_{i}' for i in range(dimensions))
+        if len(dimensions) != positions.shape[2] or len(default) != positions.shape[2]:
+            raise ValueError(f"Positions have {positions.shape[2]} dimensions, got "
+                             f"{len(dimensions)} names and a {len(default)}-D default")
+        self.registry = ElementTable(architectures, elements, positions, default)
+        self.dimensions = tuple(dimensions)
+    
     def _initialize_space(self):
         """Initialize the dimensional space with empirically-grounded features"""
         self.feature_vectors = {}
+        if self.dimensions != INTERNAL_EXTERNAL:
+            return
         
         # Internal features get positive internal dimension values
         for feature in self.internal_features:
@@ -32,6 +222,21 @@ class DimensionalSpace:
         for feature in self.external_features:
             self.feature_vectors[feature] = np.array([0.0, 1.0])  # [internal, external]
     
+    @property
+    def ndim(self) -> int:
+        """Number of dimensions"""
+        return len(self.dimensions)
+    
+    @property
+    def architectures(self) -> List[str]:
+        """Registered architecture types, in table order"""
+        return self.registry.names()
+    
+    @property
+    def elements(self) -> List[str]:
+        """Interned element names (element ID i + 1 is elements[i])"""
+        return self.registry.elements
+    
     def compute_element_position(self, element: str, architecture: str = 'NT') -> np.ndarray:
         """
         Compute where a cognitive element lives in dimensional space.
@@ -42,46 +247,22 @@ class DimensionalSpace:
             architecture: Cognitive architecture type ('NT', 'ASD', 'ADHD')
             
         Returns:
-            2D position vector [internal_coord, external_coord]
-        """
-        if architecture == 'NT':
-            return self._nt_mapping(element)
-        elif architecture == 'ASD':
-            return self._asd_mapping(element)
-        elif architecture == 'ADHD':
-            return self._adhd_mapping(element)
-        else:
-            raise ValueError(f"Unknown architecture: {architecture}")
+            Position vector ([internal_coord, external_coord] by default)
+        """
+        arch_id = self._architecture_id(architecture)
+        return self.registry.positions[arch_id, self.element_id(element)].copy()
     
     def _nt_mapping(self, element: str) -> np.ndarray:
         """Neurotypical dimensional mapping"""
-        mappings = {
-            'self': np.array([0.8, 0.2]),   # Primarily internal
-            'time': np.array([0.2, 0.8]),   # Primarily external
-            'emotion': np.array([0.9, 0.1]), # Strongly internal
-            'logic': np.array([0.1, 0.9])    # Strongly external
-        }
-        return mappings.get(element, np.array([0.5, 0.5]))
+        return self.compute_element_position(element, 'NT')
     
     def _asd_mapping(self, element: str) -> np.ndarray:
         """ASD dimensional mapping - self shifts to external"""
-        mappings = {
-            'self': np.array([0.2, 0.8]),   # Shifted to external
-            'time': np.array([0.1, 0.9]),   # Strongly external
-            'emotion': np.array([0.9, 0.1]), # Remains internal
-            'logic': np.array([0.0, 1.0])    # Maximally external
-        }
-        return mappings.get(element, np.array([0.5, 0.5]))
+        return self.compute_element_position(element, 'ASD')
     
     def _adhd_mapping(self, element: str) -> np.ndarray:
         """ADHD dimensional mapping - time collapses to internal"""
-        mappings = {
-            'self': np.array([0.9, 0.1]),   # Strongly internal
-            'time': np.array([0.8, 0.2]),   # Shifted to internal
-            'emotion': np.array([1.0, 0.0]), # Maximally internal
-            'logic': np.array([0.2, 0.8])    # Still external
-        }
-        return mappings.get(element, np.array([0.5, 0.5]))
+        return self.compute_element_position(element, 'ADHD')
     
     def compute_dimensional_distance(self, elem1: str, elem2: str, 
                                    architecture: str = 'NT') -> float:
@@ -89,6 +270,145 @@ class DimensionalSpace:
         Compute distance between two elements in dimensional space.
         Useful for understanding integration challenges.
         """
-        pos1 = self.compute_element_position(elem1, architecture)
-        pos2 = self.compute_element_position(elem2, architecture)
-        return np.linalg.norm(pos1 - pos2)
+        arch_id = self._architecture_id(architecture)
+        if self.registry.distances is None:
+            positions = self.registry.positions[arch_id]
+            return np.linalg.norm(positions[self.element_id(elem1)] -
+                                  positions[self.element_id(elem2)])
+        return self.registry.distances[arch_id, self.element_id(elem1),
+                                       self.element_id(elem2)]
+    
+    def element_id(self, element: str) -> int:
+        """Interned integer ID of an element (unmapped elements share ID 0)"""
+        return self.registry.element_id(element)
+    
+    def element_ids(self, elements: Sequence[str]) -> np.ndarray:
+        """Interned integer IDs for a sequence of elements"""
+        lookup = self.registry.element_id
+        return np.fromiter((lookup(e) for e in elements),
+                           dtype=np.intp, count=len(elements))
+    
+    def positions(self, elements, architecture: str = 'NT') -> np.ndarray:
+        """
+        Bulk position lookup.
+        
+        Args:
+            elements: Element names, or an integer array of interned IDs
+            architecture: Cognitive architecture type
+            
+        Returns:
+            (n, ndim) array of positions
+        """
+        ids = self._as_ids(elements)
+        return self.registry.positions[self._architecture_id(architecture), ids]
+    
+    def distances(self, pairs, architecture: str = 'NT') -> np.ndarray:
+        """
+        Bulk distance lookup from the precomputed distance matrix.
+        
+        Args:
+            pairs: Sequence of (elem1, elem2) names, or an (n, 2) integer
+                array of interned IDs
+            architecture: Cognitive architecture type
+            
+        Returns:
+            (n,) array of dimensional distances
+        """
+        pairs = np.asarray(pairs)
+        if pairs.dtype.kind not in 'iu':
+            pairs = self.element_ids(pairs.ravel().tolist()).reshape(pairs.shape)
+        if pairs.ndim != 2 or pairs.shape[1] != 2:
+            raise ValueError(f"Expected (n, 2) element pairs, got shape {pairs.shape}")
+        arch_id = self._architecture_id(architecture)
+        if self.registry.distances is None:
+            positions = self.registry.positions[arch_id]
+            return np.linalg.norm(positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=-1)
+        return self.registry.distances[arch_id][pairs[:, 0], pairs[:, 1]]
+    
+    def distance_matrix(self, architecture: str = 'NT') -> np.ndarray:
+        """
+        Read-only pairwise distance matrix indexed by element ID (computed
+        on each call for standalone spaces)
+        """
+        arch_id = self._architecture_id(architecture)
+        if self.registry.distances is None:
+            # cdist avoids the (E, E, d) array of pairwise differences
+            positions = self.registry.positions[arch_id]
+            matrix = cdist(positions, positions)
+            matrix.flags.writeable = False
+            return matrix
+        return self.registry.distances[arch_id]
+    
+    def element_index(self, architecture: str = 'NT') -> ElementIndex:
+        """
+        KD-tree index of an architecture's elements, built on first use
+        and rebuilt only after the architecture's positions change
+        """
+        key = (self.registry.version, len(self.elements))
+        cached = self._indexes.get(architecture)
+        if cached is None or cached[0] != key:
+            positions = self.registry.positions[self._architecture_id(architecture), 1:]
+            cached = (key, ElementIndex(self.elements, positions))
+            self._indexes[architecture] = cached
+        return cached[1]
+    
+    def nearest_elements(self, element: Union[str, Sequence[float]], k: int = 5,
+                         architecture: str = 'NT') -> List[Tuple[str, float]]:
+        """
+        The k elements nearest to an element or point.
+        
+        Args:
+            element: Element name (excluded from its own neighbours) or a
+                position
+            k: Number of neighbours
+            architecture: Cognitive architecture type
+            
+        Returns:
+            (element, distance) pairs, nearest first (empty for a space
+            without elements)
+
+        Raises:
+            ValueError: If k < 1 or the element is unknown
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        index = self.element_index(architecture)
+        point, own_id = self._query_point(element, architecture)
+        distances, ids = index.nearest(point, k + (own_id > 0))
+        keep = ids != own_id
+        return list(zip(index.names(ids[keep][:k]).tolist(),
+                        distances[keep][:k].tolist()))
+    
+    def elements_within(self, element: Union[str, Sequence[float]], radius: float,
+                        architecture: str = 'NT') -> List[Tuple[str, float]]:
+        """
+        Elements within `radius` of an element or point, nearest first
+        (an element is not its own neighbour). Raises ValueError for an
+        unknown element.
+        """
+        index = self.element_index(architecture)
+        point, own_id = self._query_point(element, architecture)
+        distances, ids = index.within(point, radius)
+        keep = ids != own_id
+        return list(zip(index.names(ids[keep]).tolist(), distances[keep].tolist()))
+    
+    def _query_point(self, element, architecture: str) -> Tuple[np.ndarray, int]:
+        """Position to query from and the element ID to leave out (0 for none)"""
+        if isinstance(element, str):
+            own_id = self.element_id(element)
+            if own_id == 0:
+                raise ValueError(f"Unknown element: {element}")
+            return self.registry.positions[self._architecture_id(architecture), own_id], own_id
+        point = np.asarray(element, dtype=np.float64)
+        if point.shape != (self.ndim,):
+            raise ValueError(f"Expected a {self.ndim}-D point, got shape {point.shape}")
+        return point, 0
+    
+    def _as_ids(self, elements) -> np.ndarray:
+        """Coerce element names or IDs to an integer ID array"""
+        if isinstance(elements, np.ndarray) and elements.dtype.kind in 'iu':
+            return elements
+        return self.element_ids(list(elements))
+    
+    def _architecture_id(self, architecture: str) -> int:
+        return self.registry.index(architecture)
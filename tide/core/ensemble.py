@@ -0,0 +1,287 @@
+"""
+Multi-architecture ensembles.
+
+An EnsembleExecutor fans each input out to several cognitive architectures
+on a thread pool and merges what comes back with a pluggable combiner.
+Every request has a latency budget: members that have not answered by the
+deadline are reported as late and the request returns with the outputs it
+has. Latency is tracked per member.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from numbers import Number
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Union
+import numpy as np
+from .architecture import CognitiveArchitecture
+
+Members = Union[Sequence[Union[str, CognitiveArchitecture]],
+                Mapping[str, Union[str, CognitiveArchitecture]]]
+
+
+class SignatureWeighted:
+    """
+    Combine outputs weighted by each member's behavioral signature.
+
+    Numeric fields become the weighted mean over the members that produced
+    them; other fields are taken from the highest-weighted member that has
+    them.
+
+    Args:
+        key: Signature entry used as the weight
+    """
+
+    first_only = False
+
+    def __init__(self, key: str = 'temporal_consistency'):
+        self.key = key
+
+    def __call__(self, outputs: Dict[str, Dict], signatures: Dict[str, Dict]) -> Dict:
+        weights = {name: float(signatures[name][self.key]) for name in outputs}
+        combined, totals = {}, {}
+        for name in sorted(outputs, key=lambda name: -weights[name]):
+            for field, value in outputs[name].items():
+                if isinstance(value, Number) and not isinstance(value, bool):
+                    combined[field] = combined.get(field, 0.0) + weights[name] * value
+                    totals[field] = totals.get(field, 0.0) + weights[name]
+                elif field not in combined:
+                    combined[field] = value
+        for field, total in totals.items():
+            combined[field] = combined[field] / total if total else np.nan
+        combined['architecture_signature'] = list(outputs)
+        return combined
+
+
+class FastestWins:
+    """Return the first member output to arrive; the rest are not awaited"""
+
+    first_only = True
+
+    def __call__(self, outputs: Dict[str, Dict], signatures: Dict[str, Dict]) -> Dict:
+        return dict(next(iter(outputs.values()))) if outputs else {}
+
+
+class EnsembleResult:
+    """
+    Outcome of one ensemble request.
+
+    Attributes:
+        combined: Combiner output
+        outputs: Member name -> output, in order of arrival
+        late: Members that missed the deadline (their outputs are dropped)
+        errors: Member name -> exception raised
+        elapsed: Seconds the request took
+    """
+
+    def __init__(self, combined: Dict, outputs: Dict[str, Dict], late: List[str],
+                 errors: Dict[str, BaseException], elapsed: float):
+        self.combined = combined
+        self.outputs = outputs
+        self.late = late
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def complete(self) -> bool:
+        """Whether every member contributed"""
+        return not self.late and not self.errors
+
+    def __repr__(self) -> str:
+        return (f"EnsembleResult(members={list(self.outputs)}, late={self.late}, "
+                f"errors={list(self.errors)}, elapsed={self.elapsed:.4f})")
+
+
+class _MemberStats:
+    """Rolling latency samples and counters of one member"""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.calls = 0
+        self.late = 0
+        self.errors = 0
+
+
+class EnsembleExecutor:
+    """
+    Run a set of architectures concurrently on each input.
+
+    Members run process_information on a shared thread pool, which the
+    architectures support without locking (see CognitiveArchitecture).
+
+    Args:
+        members: Architecture types or instances, as a sequence or as a
+            name -> member mapping. Repeated types are numbered ('NT#2').
+        combiner: (outputs, signatures) -> combined dict; defaults to
+            SignatureWeighted(). Combiners with `first_only = True` (e.g.
+            FastestWins) return as soon as one member answers.
+        budget: Default per-request latency budget in seconds (None waits
+            for every member)
+        max_workers: Pool size; defaults to twice the member count, so late
+            members still running do not starve the next request
+        rng: Random source for members given as type names; a seed is
+            split into one child seed per member
+        stats_window: Latency samples kept per member
+    """
+
+    def __init__(self, members: Members, combiner: Callable = None,
+                 budget: float = None, max_workers: int = None, rng=None,
+                 stats_window: int = 10000):
+        if isinstance(members, Mapping):
+            items = list(members.items())
+        else:
+            items, seen = [], {}
+            for member in members:
+                base = member if isinstance(member, str) else member.type
+                seen[base] = seen.get(base, 0) + 1
+                items.append((base if seen[base] == 1 else f"{base}#{seen[base]}", member))
+        if not items:
+            raise ValueError("An ensemble needs at least one member")
+
+        if isinstance(rng, (int, np.random.SeedSequence)):
+            # Independent streams per member rather than one repeated seed
+            if not isinstance(rng, np.random.SeedSequence):
+                rng = np.random.SeedSequence(rng)
+            rngs = rng.spawn(len(items))
+        else:
+            rngs = [rng] * len(items)
+        self.members: Dict[str, CognitiveArchitecture] = {
+            name: (CognitiveArchitecture(member, rng=member_rng) if isinstance(member, str)
+                   else member)
+            for (name, member), member_rng in zip(items, rngs)
+        }
+        self.combiner = combiner or SignatureWeighted()
+        self.budget = budget
+        self._pool = ThreadPoolExecutor(max_workers or 2 * len(self.members),
+                                        thread_name_prefix='tide-ensemble')
+        self._stats = {name: _MemberStats(stats_window) for name in self.members}
+        self._lock = threading.Lock()
+        # Submitted calls not yet finished, cancelled on close()
+        self._pending = set()
+
+    @property
+    def signatures(self) -> Dict[str, Mapping]:
+        """
+        Current behavioral signature of each member (cached per
+        architecture, so config updates are picked up on the next request)
+        """
+        return {name: arch.behavioral_signature() for name, arch in self.members.items()}
+
+    def _run(self, name: str, information: Dict[str, Any], submitted: float) -> Dict:
+        stats = self._stats[name]
+        try:
+            return self.members[name].process_information(information)
+        except BaseException:
+            with self._lock:
+                stats.errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - submitted
+            with self._lock:
+                stats.calls += 1
+                stats.latencies.append(latency)
+
+    def process(self, information: Dict[str, Any], budget: float = None) -> EnsembleResult:
+        """
+        Process one input with every member.
+
+        Args:
+            information: Input passed to each member's process_information
+            budget: Latency budget in seconds for this request (defaults to
+                the executor's)
+
+        Returns:
+            EnsembleResult with the combined output of the members that
+            answered in time
+        """
+        budget = self.budget if budget is None else budget
+        start = time.perf_counter()
+        deadline = None if budget is None else start + budget
+        futures = {self._pool.submit(self._run, name, information, start): name
+                   for name in self.members}
+        with self._lock:
+            self._pending.update(futures)
+        for future in futures:
+            future.add_done_callback(self._finished)
+
+        outputs, errors = {}, {}
+        pending = set(futures)
+        first_only = getattr(self.combiner, 'first_only', False)
+        while pending and not (first_only and outputs):
+            timeout = None if deadline is None else max(deadline - time.perf_counter(), 0)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            # Several members may finish together; keep submission order
+            for future in sorted(done, key=list(futures).index):
+                name = futures[future]
+                if future.cancelled():
+                    # The executor was closed while the call was queued
+                    errors[name] = CancelledError()
+                elif future.exception() is not None:
+                    errors[name] = future.exception()
+                else:
+                    outputs[name] = future.result()
+
+        late = []
+        for future in pending:
+            future.cancel()
+            if not (first_only and outputs):
+                late.append(futures[future])
+        if late:
+            with self._lock:
+                for name in late:
+                    self._stats[name].late += 1
+
+        combined = self.combiner(outputs, self.signatures)
+        return EnsembleResult(combined, outputs, sorted(late, key=list(self.members).index),
+                              errors, time.perf_counter() - start)
+
+    def _finished(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def process_many(self, inputs, budget: float = None) -> List[EnsembleResult]:
+        """Process inputs one after another, each with its own budget"""
+        return [self.process(information, budget) for information in inputs]
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-member latency (seconds from request start to the member's
+        answer, including late answers) over the recent window.
+
+        Returns:
+            Dict of name -> calls, late, errors, mean_s, p50_s, p90_s,
+            p99_s, max_s
+        """
+        report = {}
+        with self._lock:
+            snapshot = {name: (list(stats.latencies), stats.calls, stats.late, stats.errors)
+                        for name, stats in self._stats.items()}
+        for name, (latencies, calls, late, errors) in snapshot.items():
+            row = {'calls': calls, 'late': late, 'errors': errors}
+            if latencies:
+                latencies = np.asarray(latencies)
+                p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+                row.update(mean_s=float(latencies.mean()), p50_s=float(p50),
+                           p90_s=float(p90), p99_s=float(p99),
+                           max_s=float(latencies.max()))
+            report[name] = row
+        return report
+
+    def close(self):
+        """Shut the pool down without waiting for late members"""
+        # Queued calls are cancelled here rather than with
+        # shutdown(cancel_futures=True), which needs Python 3.9
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.cancel()
+        self._pool.shutdown(wait=False)
+
+    def __enter__(self) -> 'EnsembleExecutor':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
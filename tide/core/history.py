@@ -0,0 +1,465 @@
+"""
+Integration history with streaming statistics.
+IntegrationHistory keeps a fixed window of recent Φ values while tracking
+lifetime moments; MemmapHistory keeps whole runs on disk.
+"""
+
+import json
+import os
+import numpy as np
+from typing import Dict, Tuple
+from ..config import INTEGRATION_PARAMS
+
+
+def _merge_moments(n_a: int, mean_a: float, m2_a: float,
+                   n_b: int, mean_b: float, m2_b: float) -> Tuple[int, float, float]:
+    """Combine (count, mean, M2) moments of two samples (Chan et al.)"""
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    mean = mean_a + delta * n_b / n
+    m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+    return n, mean, m2
+
+
+def _moments(values: np.ndarray) -> Tuple[int, float, float]:
+    """Exact (count, mean, M2) moments of an array"""
+    if len(values) == 0:
+        return 0, 0.0, 0.0
+    mean = float(np.mean(values))
+    return len(values), mean, float(np.sum((values - mean) ** 2))
+
+
+class IntegrationHistory:
+    """
+    Fixed-capacity ring buffer of integration strengths.
+
+    Only the most recent `capacity` values are retained, so memory stays
+    bounded for long-running engines. append() only stores the value:
+    window moments are recomputed from the buffer when read after a
+    change, and values are folded into the lifetime moments a whole
+    buffer at a time (and before they could be overwritten), so stability
+    reads stay cheap without per-append bookkeeping.
+    """
+
+    def __init__(self, capacity: int = None):
+        if capacity is None:
+            capacity = INTEGRATION_PARAMS['temporal_window']
+        if capacity < 1:
+            raise ValueError(f"History capacity must be positive, got {capacity}")
+
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(self.capacity, dtype=np.float64)
+        self._head = 0  # Next write position
+        self._size = 0  # Values currently retained
+        self._total = 0  # Values ever appended
+        self._pending = 0  # Newest values not yet in the lifetime moments
+
+        # (mean, M2) moments of the window (valid unless _dirty) and of the
+        # first _total - _pending values of the lifetime
+        self._dirty = False
+        self._window_mean = 0.0
+        self._window_m2 = 0.0
+        self._lifetime_mean = 0.0
+        self._lifetime_m2 = 0.0
+
+    @property
+    def total_count(self) -> int:
+        """Number of values appended over the lifetime of the history"""
+        return self._total
+
+    def append(self, value: float):
+        """Append a single integration value, evicting the oldest if full"""
+        self._buffer[self._head] = value
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+        if self._size < self.capacity:
+            self._size += 1
+        self._total += 1
+        self._pending += 1
+        self._dirty = True
+        if self._pending == self.capacity:
+            # The next append would overwrite an unfolded value
+            self._fold()
+
+    def extend(self, values):
+        """Append a sequence of integration values in order"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        k = len(values)
+        if k == 0:
+            return
+
+        self._fold()
+        self._total, self._lifetime_mean, self._lifetime_m2 = _merge_moments(
+            self._total, self._lifetime_mean, self._lifetime_m2, *_moments(values)
+        )
+        if k >= self.capacity:
+            # The whole window is replaced by the tail of the new values
+            self._buffer[:] = values[-self.capacity:]
+            self._head = 0
+            self._size = self.capacity
+        else:
+            positions = (self._head + np.arange(k)) % self.capacity
+            self._buffer[positions] = values
+            self._head = (self._head + k) % self.capacity
+            self._size = min(self._size + k, self.capacity)
+        self._dirty = True
+
+    def _fold(self):
+        """Merge the pending values into the lifetime moments"""
+        if self._pending:
+            recent = self._buffer[np.arange(self._head - self._pending, self._head)]
+            _, self._lifetime_mean, self._lifetime_m2 = _merge_moments(
+                self._total - self._pending, self._lifetime_mean, self._lifetime_m2,
+                *_moments(recent)
+            )
+            self._pending = 0
+
+    def window_std(self) -> float:
+        """Standard deviation of the retained window"""
+        if self._size == 0:
+            return 0.0
+        if self._dirty:
+            # Recomputed exactly, so floating-point drift never accumulates
+            _, self._window_mean, self._window_m2 = _moments(self._buffer[:self._size])
+            self._dirty = False
+        return float(np.sqrt(max(self._window_m2, 0.0) / self._size))
+
+    def lifetime_std(self) -> float:
+        """Standard deviation of every value ever appended"""
+        if self._total == 0:
+            return 0.0
+        self._fold()
+        return float(np.sqrt(max(self._lifetime_m2, 0.0) / self._total))
+
+    def get_state(self) -> Dict:
+        """Full state, for checkpoints (see history_from_state)"""
+        return {
+            'backend': 'ring',
+            'capacity': self.capacity,
+            'buffer': self._buffer.copy(),
+            'head': self._head,
+            'size': self._size,
+            'total': self._total,
+            'pending': self._pending,
+            'lifetime': [self._lifetime_mean, self._lifetime_m2]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IntegrationHistory':
+        history = cls(state['capacity'])
+        history._buffer[:] = state['buffer']
+        history._head = state['head']
+        history._size = state['size']
+        history._total = state['total']
+        history._pending = state.get('pending', 0)
+        history._dirty = True
+        history._lifetime_mean, history._lifetime_m2 = state['lifetime']
+        return history
+
+    def to_array(self) -> np.ndarray:
+        """Retained values ordered from oldest to newest"""
+        if self._size < self.capacity:
+            return self._buffer[:self._size].copy()
+        return np.concatenate((self._buffer[self._head:], self._buffer[:self._head]))
+
+    def tolist(self) -> list:
+        return self.to_array().tolist()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return iter(self.to_array())
+
+    def __getitem__(self, index):
+        return self.to_array()[index]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.to_array()
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return (f"IntegrationHistory(capacity={self.capacity}, "
+                f"size={self._size}, total={self._total})")
+
+
+HEADER_SIZE = 4096
+HEADER_MAGIC = b'TIDEHIST1\n'
+
+
+class MemmapHistory:
+    """
+    File-backed integration history for long runs.
+
+    Every Φ value is kept, in a file laid out as a fixed-size header
+    (architecture, integration params and running moments, as JSON)
+    followed by raw values. The data region grows in chunks and is accessed
+    through np.memmap, so memory use is independent of run length and
+    slices of the run are zero-copy views of the file.
+
+    Has the same interface as IntegrationHistory, so it can be passed to
+    IntegrationEngine(history=...). Here len() is the whole run and
+    `capacity` is only the window used by window_std.
+
+    The header (count and moments) is rewritten at least every
+    `header_every` appended values, besides on growth, flush and close. If
+    the process dies without closing the history, reopening it therefore
+    loses at most the last `header_every` values.
+
+    Args:
+        path: History file
+        architecture: Architecture type recorded in the header
+        params: Integration params recorded in the header
+        capacity: Window length for window_std (defaults to temporal_window)
+        chunk_size: Values added to the file whenever it fills up
+        mode: 'w+' to create (overwriting), 'r+' to continue a run, 'r' to
+            open a finished run read-only
+        dtype: Stored value type
+        header_every: Appended values between header rewrites
+    """
+
+    def __init__(self, path: str, architecture: str = None, params: Dict = None,
+                 capacity: int = None, chunk_size: int = 1 << 16, mode: str = 'w+',
+                 dtype=np.float64, header_every: int = 4096):
+        if mode not in ('w+', 'r+', 'r'):
+            raise ValueError(f"Mode must be 'w+', 'r+' or 'r', got {mode!r}")
+        if header_every < 1:
+            raise ValueError("header_every must be positive")
+        self.path = path
+        self.mode = mode
+        self.header_every = int(header_every)
+        if mode == 'w+':
+            if capacity is None:
+                capacity = INTEGRATION_PARAMS['temporal_window']
+            if capacity < 1 or chunk_size < 1:
+                raise ValueError("History capacity and chunk size must be positive")
+            self.architecture = architecture
+            self.params = dict(params or {})
+            self.capacity = int(capacity)
+            self.chunk_size = int(chunk_size)
+            self.dtype = np.dtype(dtype)
+            self._total, self._lifetime_mean, self._lifetime_m2 = 0, 0.0, 0.0
+            self._allocated = 0
+            with open(path, 'wb') as f:
+                f.truncate(HEADER_SIZE)
+            self._write_header()
+        else:
+            self._read_header()
+            self._allocated = self._file_capacity()
+        self._header_total = self._total
+        self._map()
+
+    @classmethod
+    def open(cls, path: str, mode: str = 'r') -> 'MemmapHistory':
+        """Reopen a history file, read-only by default"""
+        return cls(path, mode=mode)
+
+    def _file_capacity(self) -> int:
+        return (os.path.getsize(self.path) - HEADER_SIZE) // self.dtype.itemsize
+
+    def _map(self):
+        if self.mode == 'r':
+            # Read-only runs are mapped up to their recorded length
+            length = self._total
+        else:
+            length = self._allocated
+        if length == 0:
+            self._data = np.empty(0, dtype=self.dtype)
+        else:
+            self._data = np.memmap(self.path, dtype=self.dtype,
+                                   mode='r' if self.mode == 'r' else 'r+',
+                                   offset=HEADER_SIZE, shape=(length,))
+
+    def _write_header(self):
+        header = json.dumps({
+            'architecture': self.architecture,
+            'params': self.params,
+            'capacity': self.capacity,
+            'chunk_size': self.chunk_size,
+            'dtype': self.dtype.str,
+            'count': self._total,
+            'mean': self._lifetime_mean,
+            'm2': self._lifetime_m2
+        }).encode()
+        if len(HEADER_MAGIC) + len(header) > HEADER_SIZE:
+            raise ValueError("History header does not fit in "
+                             f"{HEADER_SIZE} bytes; params are too large")
+        with open(self.path, 'r+b') as f:
+            f.write(HEADER_MAGIC + header.ljust(HEADER_SIZE - len(HEADER_MAGIC)))
+        self._header_total = self._total
+
+    def _read_header(self):
+        with open(self.path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+        if not raw.startswith(HEADER_MAGIC):
+            raise ValueError(f"{self.path} is not an integration history file")
+        header = json.loads(raw[len(HEADER_MAGIC):].decode())
+        self.architecture = header['architecture']
+        self.params = header['params']
+        self.capacity = header['capacity']
+        self.chunk_size = header['chunk_size']
+        self.dtype = np.dtype(header['dtype'])
+        self._total = header['count']
+        self._lifetime_mean = header['mean']
+        self._lifetime_m2 = header['m2']
+
+    def _reserve(self, n: int):
+        """Grow the file, in whole chunks, to hold n values"""
+        if n <= self._allocated:
+            return
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+        chunks = -(-n // self.chunk_size)
+        self._allocated = chunks * self.chunk_size
+        with open(self.path, 'r+b') as f:
+            f.truncate(HEADER_SIZE + self._allocated * self.dtype.itemsize)
+        # Views of the previous mapping stay valid; the file only grows
+        self._map()
+        self._write_header()
+
+    @property
+    def total_count(self) -> int:
+        """Number of values appended over the lifetime of the run"""
+        return self._total
+
+    def _check_writable(self):
+        if self.mode == 'r':
+            raise ValueError("History is read-only (opened with mode 'r' or closed)")
+
+    def append(self, value: float):
+        """Append a single integration value"""
+        self._check_writable()
+        value = float(value)
+        if self._total == self._allocated:
+            self._reserve(self._total + 1)
+        self._data[self._total] = value
+
+        self._total += 1
+        delta = value - self._lifetime_mean
+        self._lifetime_mean += delta / self._total
+        self._lifetime_m2 += delta * (value - self._lifetime_mean)
+        if self._total - self._header_total >= self.header_every:
+            self._write_header()
+
+    def extend(self, values):
+        """Append a sequence of integration values in order"""
+        self._check_writable()
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return
+        self._reserve(self._total + len(values))
+        self._data[self._total:self._total + len(values)] = values
+        self._total, self._lifetime_mean, self._lifetime_m2 = _merge_moments(
+            self._total, self._lifetime_mean, self._lifetime_m2, *_moments(values)
+        )
+        if self._total - self._header_total >= self.header_every:
+            self._write_header()
+
+    @property
+    def values(self) -> np.ndarray:
+        """Read-only, zero-copy view of the whole run"""
+        view = self._data[:self._total]
+        view.flags.writeable = False
+        return view
+
+    def window(self, size: int = None) -> np.ndarray:
+        """Zero-copy view of the most recent `size` values (default: capacity)"""
+        size = self.capacity if size is None else size
+        return self.values[max(self._total - size, 0):]
+
+    def window_std(self) -> float:
+        """Standard deviation of the most recent `capacity` values"""
+        window = self.window()
+        if len(window) == 0:
+            return 0.0
+        return float(np.std(window))
+
+    def lifetime_std(self) -> float:
+        """Standard deviation of the whole run, from running moments"""
+        if self._total == 0:
+            return 0.0
+        return float(np.sqrt(max(self._lifetime_m2, 0.0) / self._total))
+
+    def flush(self):
+        """Write buffered values and the header to disk"""
+        if self.mode == 'r':
+            return
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+        self._write_header()
+
+    def close(self):
+        """Flush and remap read-only; the run stays readable"""
+        self.flush()
+        self.mode = 'r'
+        self._map()
+
+    def __enter__(self) -> 'MemmapHistory':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_state(self) -> Dict:
+        """
+        Position in the run, for checkpoints. Values stay in the file,
+        which is flushed first so the checkpoint never points past what
+        is on disk.
+        """
+        self.flush()
+        return {
+            'backend': 'memmap',
+            'path': os.path.abspath(self.path),
+            'total': self._total,
+            'lifetime': [self._lifetime_mean, self._lifetime_m2]
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'MemmapHistory':
+        """
+        Reopen the run at the checkpointed position; values appended after
+        the checkpoint are discarded (overwritten as the run continues).
+        """
+        history = cls(state['path'], mode='r+')
+        if history._allocated < state['total']:
+            raise ValueError(f"{state['path']} holds fewer values than the checkpoint")
+        history._total = state['total']
+        history._lifetime_mean, history._lifetime_m2 = state['lifetime']
+        history._write_header()
+        return history
+
+    def to_array(self) -> np.ndarray:
+        """The whole run, as a zero-copy view"""
+        return self.values
+
+    def tolist(self) -> list:
+        return self.values.tolist()
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.values
+        return values if dtype is None else values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return (f"MemmapHistory({self.path!r}, architecture={self.architecture!r}, "
+                f"total={self._total})")
+
+
+def history_from_state(state: Dict):
+    """Rebuild a history from get_state() output"""
+    backends = {'ring': IntegrationHistory, 'memmap': MemmapHistory}
+    try:
+        return backends[state['backend']].from_state(state)
+    except KeyError:
+        raise ValueError(f"Unknown history backend {state.get('backend')!r}") from None
@@ -0,0 +1,282 @@
+"""
+Opt-in hot-path instrumentation.
+
+Probes are declared next to the code they measure (see register_probes)
+and the kernels bound to every registered architecture are probed
+automatically. Nothing is wrapped until collection starts: entering
+`instrument()` swaps each probed attribute for a timing wrapper and leaving
+it restores the original, so there is no overhead at all while disabled.
+
+Per probe, collection records call counts, cumulative, maximum and
+percentile latencies and the net number of memory blocks allocated during each call
+(sys.getallocatedblocks deltas; for probes that call other probes this
+includes a few blocks of the inner probes' bookkeeping). Percentiles are
+estimated from a fixed-size uniform sample of each probe's latencies
+(reservoir sampling), so memory does not grow with the number of calls;
+counts, totals and maxima are exact. Calls can also be
+kept as Chrome trace events ("X" complete events) for flame-graph viewers
+such as chrome://tracing or Perfetto; the number of trace events kept is
+capped, and events past the cap are counted rather than stored.
+
+Probes are installed on the probed classes and specs themselves, so while
+collection is active they see calls from every thread in the process, not
+only the code inside the `instrument()` block. Pass
+`current_thread=True` to record only the calls of the thread that started
+collection.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Sequence
+from .registry import REGISTRY
+
+# Spec attributes holding bound style kernels
+KERNEL_ATTRIBUTES = ('integrate', 'integrate_pair', 'process', 'process_batch', 'plan', 'sample_plans')
+
+# (owner, attribute, label) of every registered probe
+PROBES: List[tuple] = []
+
+_active = None
+_lock = threading.Lock()
+
+
+def register_probes(owner, attributes: Sequence[str], prefix: str = None):
+    """
+    Declare methods (or functions) of `owner` to be probed while
+    instrumentation is active.
+
+    Args:
+        owner: Class or module holding the attributes
+        attributes: Attribute names
+        prefix: Label prefix (defaults to the owner's name)
+    """
+    prefix = prefix or getattr(owner, '__name__', type(owner).__name__)
+    for attribute in attributes:
+        PROBES.append((owner, attribute, f"{prefix}.{attribute}"))
+
+
+class ProbeStats:
+    """
+    Exact call count, total and maximum latency (ns) and allocation delta
+    of one probe, plus a uniform sample of at most `max_samples` latencies
+    """
+
+    __slots__ = ('calls', 'total', 'max', 'allocations', 'samples', 'max_samples',
+                 '_random')
+
+    def __init__(self, max_samples: int, seed: int = 0):
+        self.calls = 0
+        self.total = 0
+        self.max = 0
+        self.allocations = 0
+        self.samples: List[int] = []
+        self.max_samples = max_samples
+        self._random = random.Random(seed)
+
+    def add(self, duration: int, allocated: int):
+        self.calls += 1
+        self.total += duration
+        self.allocations += allocated
+        if duration > self.max:
+            self.max = duration
+        if len(self.samples) < self.max_samples:
+            self.samples.append(duration)
+        else:
+            # Reservoir sampling: every call is kept with equal probability
+            index = self._random.randrange(self.calls)
+            if index < self.max_samples:
+                self.samples[index] = duration
+
+
+class Instrumentation:
+    """
+    Collected measurements; created by instrument().
+
+    Args:
+        trace: Also keep calls as trace events for export_chrome_trace
+        max_events: Trace events kept; later calls only count towards
+            `dropped_events` (they are still in the statistics)
+        current_thread: Record only calls made by the thread that starts
+            collection; other threads run the probed code unmeasured
+        max_samples: Latencies sampled per probe for the percentiles
+
+    Attributes:
+        dropped_events: Calls not kept as trace events because the buffer
+            was full (approximate under concurrent calls)
+    """
+
+    def __init__(self, trace: bool = True, max_events: int = 1_000_000,
+                 current_thread: bool = False, max_samples: int = 10_000):
+        if max_samples < 1:
+            raise ValueError("max_samples must be at least 1")
+        self.trace = trace
+        self.max_events = max_events
+        self.current_thread = current_thread
+        self.max_samples = max_samples
+        self.stats: Dict[str, ProbeStats] = {}
+        self.events: List[tuple] = []
+        self.dropped_events = 0
+        self._installed: List[tuple] = []
+        self._origin = 0
+        self._thread = None
+
+    def _wrap(self, func, label: str):
+        stats = self.stats.get(label)
+        if stats is None:
+            stats = self.stats[label] = ProbeStats(self.max_samples)
+        add = stats.add
+        events = self.events if self.trace else None
+        max_events = self.max_events
+        thread = self._thread
+        get_ident = threading.get_ident
+        clock = time.perf_counter_ns
+        blocks = sys.getallocatedblocks
+
+        def probe(*args, **kwargs):
+            if thread is not None and get_ident() != thread:
+                return func(*args, **kwargs)
+            start_blocks = blocks()
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = clock() - start
+                allocated = blocks() - start_blocks
+                add(duration, allocated)
+                if events is not None:
+                    if len(events) < max_events:
+                        events.append((label, start, duration, get_ident(), allocated))
+                    else:
+                        self.dropped_events += 1
+
+        probe.__wrapped__ = func
+        probe.__name__ = getattr(func, '__name__', label)
+        probe.__doc__ = getattr(func, '__doc__', None)
+        return probe
+
+    def _install(self, namespace: Dict, owner, attribute: str, label: str):
+        original = namespace.get(attribute)
+        if original is None:
+            return
+        wrapper = self._wrap(original, label)
+        setattr(owner, attribute, wrapper)
+        self._installed.append((owner, attribute, original, wrapper))
+
+    def start(self):
+        global _active
+        with _lock:
+            if _active is not None:
+                raise ValueError("Instrumentation is already active")
+            _active = self
+        self._origin = time.perf_counter_ns()
+        self._thread = threading.get_ident() if self.current_thread else None
+        for owner, attribute, label in PROBES:
+            self._install(vars(owner), owner, attribute, label)
+        for spec in REGISTRY.specs:
+            for attribute in KERNEL_ATTRIBUTES:
+                kernel = getattr(spec, attribute)
+                if kernel is not None:
+                    self._install(vars(spec), spec, attribute,
+                                  getattr(kernel, '__name__', attribute))
+
+    def stop(self):
+        global _active
+        for owner, attribute, original, wrapper in reversed(self._installed):
+            # Leave attributes rebound during collection (e.g. by a
+            # re-registered architecture) alone
+            if vars(owner).get(attribute) is wrapper:
+                setattr(owner, attribute, original)
+        self._installed = []
+        with _lock:
+            _active = None
+
+    def __enter__(self) -> 'Instrumentation':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-probe summary, slowest cumulative time first.
+
+        Returns:
+            Dict of label -> calls, total_s, mean_s, p50_s, p90_s, p99_s,
+            max_s, alloc_blocks (net blocks over all calls) and
+            alloc_blocks_per_call
+        """
+        report = {}
+        for label, stats in self.stats.items():
+            if not stats.calls:
+                continue
+            p50, p90, p99 = np.percentile(np.asarray(stats.samples, dtype=np.float64),
+                                          [50, 90, 99]) * 1e-9
+            report[label] = {
+                'calls': stats.calls,
+                'total_s': stats.total * 1e-9,
+                'mean_s': stats.total * 1e-9 / stats.calls,
+                'p50_s': float(p50),
+                'p90_s': float(p90),
+                'p99_s': float(p99),
+                'max_s': stats.max * 1e-9,
+                'alloc_blocks': stats.allocations,
+                'alloc_blocks_per_call': stats.allocations / stats.calls
+            }
+        return dict(sorted(report.items(), key=lambda item: -item[1]['total_s']))
+
+    def format_report(self) -> str:
+        """Report as a fixed-width table"""
+        lines = [f"{'probe':<48}{'calls':>9}{'total ms':>11}{'p50 us':>10}"
+                 f"{'p99 us':>10}{'blocks/call':>13}"]
+        for label, row in self.report().items():
+            lines.append(f"{label:<48}{row['calls']:>9}{row['total_s'] * 1e3:>11.2f}"
+                         f"{row['p50_s'] * 1e6:>10.2f}{row['p99_s'] * 1e6:>10.2f}"
+                         f"{row['alloc_blocks_per_call']:>13.2f}")
+        return '\n'.join(lines)
+
+    def chrome_trace(self) -> Dict:
+        """Recorded calls as a Chrome trace-event document"""
+        if not self.trace:
+            raise ValueError("Instrumentation was started with trace=False")
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {'name': label, 'cat': 'tide', 'ph': 'X',
+                 'ts': (start - self._origin) / 1e3, 'dur': duration / 1e3,
+                 'pid': pid, 'tid': tid, 'args': {'alloc_blocks': allocated}}
+                for label, start, duration, tid, allocated in self.events
+            ],
+            'displayTimeUnit': 'ms',
+            'otherData': {'dropped_events': self.dropped_events}
+        }
+
+    def export_chrome_trace(self, path: str):
+        """Write chrome_trace() as JSON (open in chrome://tracing or Perfetto)"""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def instrument(trace: bool = True, max_events: int = 1_000_000,
+               current_thread: bool = False, max_samples: int = 10_000) -> Instrumentation:
+    """
+    Scope instrumentation with a context manager; see Instrumentation for
+    the arguments.
+
+    Example:
+        with instrument() as profile:
+            simulator.simulate(100)
+        print(profile.format_report())
+        profile.export_chrome_trace('tide_trace.json')
+    """
+    return Instrumentation(trace, max_events, current_thread, max_samples)
+
+
+def is_active() -> bool:
+    """Whether instrumentation is currently collecting"""
+    return _active is not None
@@ -6,17 +6,45 @@ Uses insights from BIND framework for integration metrics.
 import numpy as np
 from typing import Tuple, Dict
 from ..config import INTEGRATION_PARAMS
+from .history import IntegrationHistory, history_from_state
+from .rng import (ThreadLocalGenerator, resolve_rng, current_generator, rng_state,
+                  restore_rng)
+from .kernels import pair_distance, state_distance
+from .registry import get_architecture
+from .instrumentation import register_probes
 
 class IntegrationEngine:
     """
     Models how self-representation and temporal processing bind together.
     Different architectures achieve integration through distinct mechanisms.
+    
+    An engine carries per-stream state (its history and oscillation phase),
+    so each concurrent stream should use its own engine.
     """
     
-    def __init__(self, architecture_type: str):
+    def __init__(self, architecture_type: str, rng=None, history=None):
+        """
+        Args:
+            architecture_type: One of 'NT', 'ASD', 'ADHD', or any registered type
+            rng: Random source - None (global NumPy RNG), an
+                np.random.Generator, or a seed for per-thread generators
+            history: History backend; defaults to a bounded in-memory
+                IntegrationHistory. Pass a MemmapHistory to keep whole
+                long runs on disk.
+        """
+        # Raises ValueError for unregistered types
+        self._spec = get_architecture(architecture_type)
         self.architecture = architecture_type
         self.params = INTEGRATION_PARAMS
-        self.integration_history = []
+        self.rng = resolve_rng(rng)
+        if history is None:
+            # Bounded window of recent Φ values; lifetime moments are kept
+            # alongside so stability reads never rescan the stream
+            history = IntegrationHistory(self.params['temporal_window'])
+        elif getattr(history, 'architecture', None) not in (None, architecture_type):
+            raise ValueError(f"History was recorded for {history.architecture}, "
+                             f"not {architecture_type}")
+        self.integration_history = history
         
     def compute_integration(self, self_state: np.ndarray, 
                           time_state: np.ndarray) -> float:
@@ -31,54 +59,103 @@ class IntegrationEngine:
         Returns:
             Integration strength (0-1)
         """
-        if self.architecture == 'NT':
-            # Dynamic oscillating integration
-            phi = self._dynamic_integration(self_state, time_state)
-        elif self.architecture == 'ASD':
-            # Crystallized lock integration
-            phi = self._crystallized_integration(self_state, time_state)
-        elif self.architecture == 'ADHD':
-            # Quantum collapse integration
-            phi = self._collapsed_integration(self_state, time_state)
-        else:
-            raise ValueError(f"Unknown architecture: {self.architecture}")
+        # Dynamic (NT), crystallized (ASD) or collapsed (ADHD) integration,
+        # bound to this architecture at registration; scalar kernels avoid
+        # the fixed cost of array operations on a single pair
+        history = self.integration_history
+        rng = self.rng
+        if type(rng) is ThreadLocalGenerator:
+            rng = rng.generator
+        phi = self._spec.integrate_pair(pair_distance(self_state, time_state),
+                                        history.total_count, self.params, rng)
         
-        self.integration_history.append(phi)
+        history.append(phi)
         return phi
     
-    def _dynamic_integration(self, self_state: np.ndarray, 
-                           time_state: np.ndarray) -> float:
-        """NT: Flexible, oscillating integration"""
-        base_integration = 1.0 / (1.0 + np.linalg.norm(self_state - time_state))
-        oscillation = 0.2 * np.sin(len(self.integration_history) * 0.1)
-        return np.clip(base_integration + oscillation, 0, 1)
-    
-    def _crystallized_integration(self, self_state: np.ndarray,
-                                time_state: np.ndarray) -> float:
-        """ASD: Stable, locked integration when aligned"""
-        distance = np.linalg.norm(self_state - time_state)
-        if distance < self.params['boundary_threshold']:
-            # Strong integration when both are external
-            return 0.9
-        else:
-            # Weak integration when misaligned
-            return 0.2
-    
-    def _collapsed_integration(self, self_state: np.ndarray,
-                             time_state: np.ndarray) -> float:
-        """ADHD: Intense but unstable integration"""
-        base_integration = 1.0 / (1.0 + np.linalg.norm(self_state - time_state))
-        # Add noise for instability
-        noise = np.random.normal(0, 0.3)
-        return np.clip(base_integration + noise, 0, 1)
+    def compute_integration_batch(self, self_states: np.ndarray,
+                                  time_states: np.ndarray) -> np.ndarray:
+        """
+        Compute integration strength (Φ) for a batch of self/time state pairs.
+        
+        Equivalent to calling compute_integration on each pair in order:
+        the NT oscillation phase and the integration history advance once
+        per pair, but the kernels run as whole-array operations.
+        
+        Args:
+            self_states: (N, d) array of self-representation states
+            time_states: (N, d) array of temporal processing states
+            
+        Returns:
+            (N,) array of integration strengths (0-1)
+        """
+        self_states = np.asarray(self_states, dtype=float)
+        time_states = np.asarray(time_states, dtype=float)
+        if self_states.ndim != 2 or self_states.shape != time_states.shape:
+            raise ValueError(
+                f"Expected matching (N, d) state arrays, got "
+                f"{self_states.shape} and {time_states.shape}"
+            )
+        
+        steps = self.integration_history.total_count + np.arange(len(self_states))
+        phi = self._spec.integrate(state_distance(self_states, time_states), steps,
+                                   self.params, current_generator(self.rng))
+        
+        self.integration_history.extend(phi)
+        return phi
     
-    def get_integration_stability(self) -> float:
+    def get_integration_stability(self, windowed: bool = False) -> float:
         """
         Measure stability of integration over time.
         ASD should show highest stability, ADHD lowest.
+        
+        Args:
+            windowed: If True, only the most recent `temporal_window` values
+                are considered; otherwise the whole lifetime of the engine
+            
+        Returns:
+            Stability (1 - standard deviation of Φ), read in constant time
         """
-        if len(self.integration_history) < 2:
+        history = self.integration_history
+        if windowed:
+            if len(history) < 2:
+                return 1.0
+            return 1.0 - history.window_std()
+        
+        if history.total_count < 2:
             return 1.0
+        return 1.0 - history.lifetime_std()
+    
+    def get_state(self) -> Dict:
+        """
+        Full engine state, for checkpoints: the history (which also fixes
+        the NT oscillation phase) and the random source's position
+        """
+        return {
+            'architecture': self.architecture,
+            'fingerprint': self._spec.fingerprint(),
+            'params': dict(self.params),
+            'history': self.integration_history.get_state(),
+            'rng': rng_state(self.rng)
+        }
+    
+    @classmethod
+    def from_state(cls, state: Dict, rng=None) -> 'IntegrationEngine':
+        """
+        Engine continuing bit-identically from get_state() output.
         
-        history = np.array(self.integration_history)
-        return 1.0 - np.std(history)
+        Args:
+            state: Saved state
+            rng: Random source replacing the saved one (restore() passes
+                sources shared with other restored objects)
+        """
+        from .checkpoint import check_fingerprints
+        check_fingerprints({state['architecture']: state['fingerprint']})
+        if state['params'] != INTEGRATION_PARAMS:
+            raise ValueError("INTEGRATION_PARAMS have changed since the checkpoint was written")
+        return cls(state['architecture'], rng=restore_rng(state['rng']) if rng is None else rng,
+                   history=history_from_state(state['history']))
+
+
+register_probes(IntegrationEngine, [
+    'compute_integration', 'compute_integration_batch', 'get_integration_stability'
+])
@@ -0,0 +1,201 @@
+"""
+Kernels behind each integration style.
+
+The Φ kernels are pure functions of the self-time distance, so the same
+code serves batches and whole simulated populations. Single pairs take
+scalar twins of the kernels (integrate_*_pair), which round identically
+but skip the per-call overhead of array operations. The style kernels
+wrap them, together with the processing and planning
+kernels, behind uniform signatures that the architecture registry binds
+once per architecture.
+"""
+
+import math
+import numpy as np
+
+# Shape of the integration kernels
+OSCILLATION_AMPLITUDE = 0.2   # NT oscillation strength
+OSCILLATION_FREQUENCY = 0.1   # NT oscillation phase advance per step
+LOCKED_INTEGRATION = 0.9      # ASD integration when self and time are aligned
+UNLOCKED_INTEGRATION = 0.2    # ASD integration when misaligned
+COLLAPSE_NOISE = 0.3          # ADHD instability (std of Φ noise)
+
+
+def state_distance(self_state: np.ndarray, time_state: np.ndarray) -> np.ndarray:
+    """Euclidean distance between self and time states along the last axis"""
+    return np.linalg.norm(self_state - time_state, axis=-1)
+
+
+def pair_distance(self_state, time_state) -> float:
+    """
+    state_distance of one pair of state vectors as a float, rounded exactly
+    as state_distance rounds each row. NumPy sums rows shorter than 8
+    elements sequentially, which plain float arithmetic reproduces without
+    the fixed cost of array operations; longer rows use NumPy's pairwise
+    sum (np.linalg.norm of a single vector would sum in yet another order).
+    """
+    if type(self_state) is np.ndarray:
+        self_state = self_state.tolist()
+    if type(time_state) is np.ndarray:
+        time_state = time_state.tolist()
+    n = len(self_state)
+    if n == 2 and len(time_state) == 2:
+        # The self/time plane; unrolled, as this is every engine's hot path
+        delta_0 = self_state[0] - time_state[0]
+        delta_1 = self_state[1] - time_state[1]
+        return math.sqrt(delta_0 * delta_0 + delta_1 * delta_1)
+    if n < 8 and n == len(time_state):
+        total = 0.0
+        for a, b in zip(self_state, time_state):
+            delta = a - b
+            total += delta * delta
+        return math.sqrt(total)
+    delta = np.subtract(self_state, time_state, dtype=np.float64)
+    return math.sqrt(np.add.reduce(delta * delta))
+
+
+def _clip_unit(value: float) -> float:
+    return float(min(max(value, 0.0), 1.0))
+
+
+def dynamic_kernel(distance, step):
+    """NT: Flexible, oscillating integration"""
+    base_integration = 1.0 / (1.0 + distance)
+    oscillation = OSCILLATION_AMPLITUDE * np.sin(step * OSCILLATION_FREQUENCY)
+    return np.clip(base_integration + oscillation, 0, 1)
+
+
+def crystallized_kernel(distance, threshold: float):
+    """ASD: Stable, locked integration when aligned"""
+    # Indexing with () unwraps the 0-d result of a single pair to a scalar
+    return np.where(distance < threshold,
+                    LOCKED_INTEGRATION, UNLOCKED_INTEGRATION)[()]
+
+
+def collapsed_kernel(distance, noise):
+    """ADHD: Intense but unstable integration"""
+    base_integration = 1.0 / (1.0 + distance)
+    return np.clip(base_integration + noise, 0, 1)
+
+
+def integrate_dynamic(distance, step, params, generator):
+    """Style kernel for 'dynamic' integration (NT)"""
+    return dynamic_kernel(distance, step)
+
+
+def integrate_crystallized(distance, step, params, generator):
+    """Style kernel for 'crystallized' integration (ASD)"""
+    return crystallized_kernel(distance, params['boundary_threshold'])
+
+
+def integrate_collapsed(distance, step, params, generator):
+    """Style kernel for 'collapsed' integration (ADHD)"""
+    # One noise draw per pair, in order
+    noise = generator.normal(0, COLLAPSE_NOISE, size=np.shape(distance))
+    return collapsed_kernel(distance, noise)
+
+
+# Scalar twins of the style kernels, used by IntegrationEngine.compute_integration
+
+def integrate_dynamic_pair(distance, step, params, generator):
+    oscillation = OSCILLATION_AMPLITUDE * np.sin(step * OSCILLATION_FREQUENCY)
+    return _clip_unit(1.0 / (1.0 + distance) + oscillation)
+
+
+def integrate_crystallized_pair(distance, step, params, generator):
+    if distance < params['boundary_threshold']:
+        return LOCKED_INTEGRATION
+    return UNLOCKED_INTEGRATION
+
+
+def integrate_collapsed_pair(distance, step, params, generator):
+    return _clip_unit(1.0 / (1.0 + distance) + generator.normal(0, COLLAPSE_NOISE))
+
+
+# Fixed processing parameters, shared by per-record and batch processing
+SCHEDULE_ADHERENCE = 0.9    # ASD: High adherence to structure
+PAST_DISCOUNT = 0.9         # ADHD: Heavy discounting of past
+FUTURE_DISCOUNT = 0.8       # ADHD: Heavy discounting of future
+FOCUS_LEVELS = [0.1, 0.9]   # ADHD: Either no focus or hyperfocus
+
+
+# Processing kernels take (architecture, information, compact) and return
+# the fields an architecture adds to a record. With compact=True constant
+# sub-structures are the architecture's shared instances.
+
+def process_dynamic(arch, info, compact):
+    """NT: Flexible processing with dynamic self-time integration"""
+    return {
+        'temporal_flexibility': arch._apply_temporal_flexibility(info),
+        'self_adaptation': arch._apply_self_adaptation(info)
+    }
+
+
+def process_crystallized(arch, info, compact):
+    """ASD: Systematic processing with crystallized patterns"""
+    return {
+        'temporal_structure': (arch._shared_temporal_structure if compact
+                               else arch._apply_temporal_structure(info)),
+        'rule_consistency': arch._apply_rule_consistency(info)
+    }
+
+
+def process_collapsed(arch, info, compact):
+    """ADHD: Immediate processing with collapsed temporal dimension"""
+    return {
+        'temporal_compression': (arch._shared_temporal_compression if compact
+                                 else arch._compress_to_now(info)),
+        'intensity_focus': arch._apply_intensity_focus(info)
+    }
+
+
+# Batch kernels take (architecture, columns, n, generator, constant) and add
+# output columns in place; `constant(value)` broadcasts a value to n rows.
+
+def process_batch_dynamic(arch, columns, n, generator, constant):
+    columns['temporal_flexibility'] = generator.normal(0.5, 0.2, size=n)
+    columns['self_adaptation'] = constant(1.0 - arch.integration_distance)
+
+
+def process_batch_crystallized(arch, columns, n, generator, constant):
+    schedule = np.empty(1, dtype=object)
+    schedule[0] = arch._shared_schedule()
+    columns['schedule'] = np.broadcast_to(schedule, (n,))
+    columns['adherence'] = constant(SCHEDULE_ADHERENCE)
+    columns['rule_consistency'] = constant(arch.config['temporal_consistency'])
+
+
+def process_batch_collapsed(arch, columns, n, generator, constant):
+    columns['temporal_window'] = constant('now')
+    columns['past_discount'] = constant(PAST_DISCOUNT)
+    columns['future_discount'] = constant(FUTURE_DISCOUNT)
+    columns['intensity_focus'] = generator.choice(FOCUS_LEVELS, size=n)
+
+
+# Planning kernels take a TemporalPlanningTask and return its week plan
+
+def plan_dynamic(task):
+    return task._flexible_planning()
+
+
+def plan_crystallized(task):
+    return task._systematic_planning()
+
+
+def plan_collapsed(task):
+    return task._immediate_planning()
+
+
+# Plan samplers draw many encoded weeks at once (see
+# tide.examples.plan_encoding): (task, n_weeks, generator) -> EncodedPlans
+
+def sample_plans_dynamic(task, n_weeks, generator):
+    return task._repeat_plan(task._flexible_planning(), n_weeks)
+
+
+def sample_plans_crystallized(task, n_weeks, generator):
+    return task._repeat_plan(task._systematic_planning(), n_weeks)
+
+
+def sample_plans_collapsed(task, n_weeks, generator):
+    return task._sample_immediate_plans(n_weeks, generator)
@@ -0,0 +1,178 @@
+"""
+Compact result records for processed information and behavioral signatures.
+
+Records use __slots__ instead of per-instance dicts and share constant
+sub-records, which cuts the retained size of millions of results. Every
+record is a read-only Mapping, so existing dict-style access keeps working,
+and `as_dict()` reproduces the plain dict output of process_information.
+For bulk storage, `records_to_array` packs numeric fields into a NumPy
+structured array.
+"""
+
+import numpy as np
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable
+from .registry import get_architecture
+
+
+class _SlotRecord(Mapping):
+    """Read-only Mapping over the set slots of a record"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __iter__(self):
+        for name in self.__slots__:
+            if hasattr(self, name):
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain (nested) dict copy of the record"""
+        return {key: value.as_dict() if isinstance(value, _SlotRecord) else value
+                for key, value in self.items()}
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+
+class TemporalStructure(_SlotRecord):
+    """ASD: Structured temporal processing"""
+
+    __slots__ = ('schedule', 'adherence')
+
+    def __init__(self, schedule, adherence: float):
+        self.schedule = schedule
+        self.adherence = adherence
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Hand out a fresh schedule, as the per-record dict API always has
+        return {'schedule': [dict(step) for step in self.schedule],
+                'adherence': self.adherence}
+
+
+class TemporalCompression(_SlotRecord):
+    """ADHD: Temporal dimension collapsed to the present"""
+
+    __slots__ = ('temporal_window', 'past_discount', 'future_discount')
+
+    def __init__(self, temporal_window: str, past_discount: float,
+                 future_discount: float):
+        self.temporal_window = temporal_window
+        self.past_discount = past_discount
+        self.future_discount = future_discount
+
+
+class ProcessedInformation(_SlotRecord):
+    """
+    Compact counterpart of the dict returned by process_information.
+
+    Input keys without a slot of their own are kept in `extra`, and only
+    the fields an architecture produces are set.
+    """
+
+    __slots__ = ('content', 'temporal_context', 'extra',
+                 'temporal_flexibility', 'self_adaptation',
+                 'temporal_structure', 'rule_consistency',
+                 'temporal_compression', 'intensity_focus',
+                 'architecture_signature')
+
+    def __init__(self, information: Dict[str, Any], architecture_signature: str, **fields):
+        extra = None
+        for key, value in information.items():
+            if key in self.__slots__ and key != 'extra':
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        if extra is not None:
+            self.extra = extra
+        for key, value in fields.items():
+            setattr(self, key, value)
+        self.architecture_signature = architecture_signature
+
+    def __getitem__(self, key):
+        if key != 'extra':
+            try:
+                return super().__getitem__(key)
+            except KeyError:
+                pass
+        extra = getattr(self, 'extra', None)
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for name in self.__slots__:
+            if name == 'extra':
+                yield from getattr(self, 'extra', ())
+            elif hasattr(self, name):
+                yield name
+
+
+class BehavioralSignature(_SlotRecord):
+    """Observable behavioral metrics of an architecture"""
+
+    __slots__ = ('temporal_consistency', 'processing_flexibility',
+                 'planning_horizon', 'self_time_integration')
+
+    def __init__(self, temporal_consistency: float, processing_flexibility: float,
+                 planning_horizon: float, self_time_integration: float):
+        self.temporal_consistency = temporal_consistency
+        self.processing_flexibility = processing_flexibility
+        self.planning_horizon = planning_horizon
+        self.self_time_integration = self_time_integration
+
+
+# Bulk storage layout: one fixed-size row per processed record. The
+# architecture column holds the registry index; fields an architecture does
+# not produce are NaN.
+
+PROCESSED_DTYPE = np.dtype([
+    ('architecture', np.uint8),
+    ('temporal_flexibility', np.float64),
+    ('self_adaptation', np.float64),
+    ('adherence', np.float64),
+    ('rule_consistency', np.float64),
+    ('past_discount', np.float64),
+    ('future_discount', np.float64),
+    ('intensity_focus', np.float64),
+])
+
+_NESTED_FIELDS = {
+    'adherence': 'temporal_structure',
+    'past_discount': 'temporal_compression',
+    'future_discount': 'temporal_compression',
+}
+
+
+def records_to_array(records: Iterable[Mapping]) -> np.ndarray:
+    """
+    Pack processed records (ProcessedInformation or plain dicts) into a
+    PROCESSED_DTYPE structured array of 57 bytes per record.
+    """
+    records = list(records)
+    array = np.empty(len(records), dtype=PROCESSED_DTYPE)
+    for field in PROCESSED_DTYPE.names[1:]:
+        array[field] = np.nan
+    array['architecture'] = [get_architecture(r['architecture_signature']).index
+                             for r in records]
+    for field in PROCESSED_DTYPE.names[1:]:
+        parent = _NESTED_FIELDS.get(field)
+        column = array[field]
+        for i, record in enumerate(records):
+            source = record.get(parent) if parent else record
+            if source is not None and field in source:
+                column[i] = source[field]
+    return array
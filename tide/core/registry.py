@@ -0,0 +1,412 @@
+"""
+Architecture registry.
+
+An architecture is defined once - its config, its element mapping and its
+integration style - and compiled at registration time: its positions join
+the shared position and distance tables, and its style's kernels are bound
+onto its spec. Hot paths then dispatch with a single lookup of the spec
+instead of branching on the architecture name.
+"""
+
+import hashlib
+import json
+import numpy as np
+from typing import Callable, Dict, List, Sequence
+from ..config import (ARCHITECTURE_CONFIGS, ELEMENT_MAPPINGS, DEFAULT_POSITION,
+                      INTERNAL_FEATURES, EXTERNAL_FEATURES)
+from . import kernels
+
+REQUIRED_CONFIG_KEYS = (
+    'self_dimension', 'time_dimension', 'integration_style',
+    'processing_flexibility', 'temporal_consistency', 'planning_horizon'
+)
+
+
+class IntegrationStyle:
+    """
+    Kernels implementing one integration style.
+
+    Args:
+        name: Style name, as used in a config's 'integration_style'
+        integrate: (distance, step, params, generator) -> Φ
+        process: (architecture, information, compact) -> added fields
+        process_batch: (architecture, columns, n, generator, constant) -> None
+        plan: (planning_task) -> week plan
+        facecolor: Legend color used by visualizations
+        landscape_peak: [internal, external] point where the integration
+            landscape peaks
+        landscape_noise: Std of the noise field added to the landscape
+        sample_plans: (planning_task, n_weeks, generator) -> EncodedPlans;
+            when None, weeks are planned one at a time and encoded
+        integrate_params: INTEGRATION_PARAMS entries `integrate` reads;
+            parameter sweeps broadcast over every other parameter
+        integrate_pair: (distance: float, step: int, params, generator) ->
+            Φ of a single pair, matching `integrate` exactly; defaults to
+            `integrate`
+    """
+
+    def __init__(self, name: str, integrate: Callable, process: Callable,
+                 process_batch: Callable, plan: Callable, facecolor: str = 'white',
+                 landscape_peak: Sequence[float] = DEFAULT_POSITION,
+                 landscape_noise: float = 0.0, sample_plans: Callable = None,
+                 integrate_params: Sequence[str] = (), integrate_pair: Callable = None):
+        self.name = name
+        self.integrate = integrate
+        self.process = process
+        self.process_batch = process_batch
+        self.plan = plan
+        self.facecolor = facecolor
+        self.landscape_peak = tuple(landscape_peak)
+        self.landscape_noise = landscape_noise
+        self.sample_plans = sample_plans
+        self.integrate_params = tuple(integrate_params)
+        self.integrate_pair = integrate_pair or integrate
+
+
+class ArchitectureSpec:
+    """
+    Compiled definition of a registered architecture.
+
+    `index` is the architecture's row in the registry's position and
+    distance tables; the style's kernels are bound as attributes.
+
+    Each input ('config', 'mapping') carries a version that is bumped only
+    when it actually changes. Values derived from the inputs are cached
+    with the versions they were computed from (see `derived`), so after an
+    update only what depends on the changed input is recomputed, lazily,
+    once per architecture - never per instance.
+    """
+
+    def __init__(self, name: str, index: int, config: Dict, mapping: Dict,
+                 style: IntegrationStyle):
+        self.name = name
+        self.index = index
+        self.versions = {'config': 0, 'mapping': 0}
+        self.version = 0
+        self._derived = {}
+        self._bind(config, mapping, style)
+
+    def _bind(self, config: Dict, mapping: Dict, style: IntegrationStyle):
+        self.config = config
+        self.mapping = mapping
+        self._snapshot = (dict(config), dict(mapping))
+        self.style = style
+        self.integrate = style.integrate
+        self.integrate_pair = style.integrate_pair
+        self.process = style.process
+        self.process_batch = style.process_batch
+        self.plan = style.plan
+        self.sample_plans = style.sample_plans
+
+    def derived(self, name: str, depends_on: Sequence[str], compute: Callable):
+        """
+        Cached value derived from some of the spec's inputs.
+
+        Args:
+            name: Cache key
+            depends_on: Inputs the value is computed from
+            compute: () -> value, called when a dependency changed
+
+        Returns:
+            The cached or freshly computed value
+        """
+        key = tuple(self.versions[dependency] for dependency in depends_on)
+        cached = self._derived.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, compute())
+            self._derived[name] = cached
+        return cached[1]
+
+    @property
+    def legend(self) -> str:
+        """Short description of where self and time live"""
+        return (f"Self: {self.config['self_dimension'].title()}\n"
+                f"Time: {self.config['time_dimension'].title()}")
+
+    def fingerprint(self) -> str:
+        """Hash of the config and mapping, to check saved state still applies"""
+        return self.derived('fingerprint', ('config', 'mapping'), lambda: hashlib.sha256(
+            json.dumps({'config': self.config,
+                        'mapping': {element: list(position)
+                                    for element, position in self.mapping.items()}},
+                       sort_keys=True, default=str).encode()).hexdigest())
+
+    def __repr__(self) -> str:
+        return f"ArchitectureSpec({self.name!r}, index={self.index}, style={self.style.name!r})"
+
+
+class ArchitectureRegistry:
+    """
+    Registered architectures and their compiled tables.
+
+    Attributes:
+        positions: (architectures x element IDs x 2) read-only positions
+        distances: (architectures x element IDs x element IDs) read-only
+            pairwise distances
+        elements: Interned element names; element ID 0 is reserved for
+            unmapped elements, which sit at DEFAULT_POSITION
+    """
+
+    def __init__(self):
+        self.version = 0  # Bumped on every change to a registered architecture
+        self.styles: Dict[str, IntegrationStyle] = {}
+        self.specs: List[ArchitectureSpec] = []
+        self._by_name: Dict[str, ArchitectureSpec] = {}
+        self.elements: List[str] = []
+        self._element_ids: Dict[str, int] = {}
+        self.positions = None
+        self.distances = None
+
+    def register_style(self, style: IntegrationStyle):
+        """Make an integration style available to architecture configs"""
+        self.styles[style.name] = style
+
+    def register(self, name: str, config: Dict,
+                 mapping: Dict[str, Sequence[float]] = None,
+                 replace: bool = False) -> ArchitectureSpec:
+        """
+        Register and compile an architecture.
+
+        Args:
+            name: Architecture type name
+            config: Architecture config (see ARCHITECTURE_CONFIGS)
+            mapping: Element name -> [internal, external] position;
+                unmapped elements sit at DEFAULT_POSITION
+            replace: Allow redefining an existing architecture. Its spec is
+                updated in place, so live instances see the new definition.
+
+        Returns:
+            The compiled ArchitectureSpec
+        """
+        missing = [key for key in REQUIRED_CONFIG_KEYS if key not in config]
+        if missing:
+            raise ValueError(f"Config for {name} is missing keys: {missing}")
+        style = self.styles.get(config['integration_style'])
+        if style is None:
+            raise ValueError(f"Unknown integration style: {config['integration_style']}")
+        if name in self._by_name and not replace:
+            raise ValueError(f"Architecture already registered: {name}")
+
+        mapping = {element: tuple(float(x) for x in position)
+                   for element, position in (mapping or {}).items()}
+        for element, position in mapping.items():
+            if len(position) != len(DEFAULT_POSITION):
+                raise ValueError(f"Position of {element!r} must have "
+                                 f"{len(DEFAULT_POSITION)} coordinates")
+
+        ARCHITECTURE_CONFIGS[name] = config
+        ELEMENT_MAPPINGS[name] = mapping
+        spec = self._by_name.get(name)
+        if spec is None:
+            spec = ArchitectureSpec(name, len(self.specs), config, mapping, style)
+            self.specs.append(spec)
+            self._by_name[name] = spec
+            self._intern(mapping)
+            self._compile_tables()
+            return spec
+
+        # Compared with snapshots, so configs edited in place and then
+        # re-registered are detected too
+        changed = {'config': config != spec._snapshot[0],
+                   'mapping': mapping != spec._snapshot[1]}
+        spec._bind(config, mapping, style)
+        self._mark_changed(spec, changed)
+        return spec
+
+    def update(self, name: str, mapping: Dict[str, Sequence[float]] = None,
+               **config_changes) -> ArchitectureSpec:
+        """
+        Change part of a registered architecture's definition at runtime.
+
+        Live instances see the change on their next access. Only values
+        derived from the changed inputs are recomputed, and only for this
+        architecture, so the cost does not depend on how many instances
+        exist.
+
+        Args:
+            name: Registered architecture type
+            mapping: Element positions to add or move (other elements keep
+                their positions)
+            **config_changes: Config entries to change
+
+        Returns:
+            The updated ArchitectureSpec
+        """
+        spec = self.get(name)
+        config = dict(spec.config, **config_changes)
+        merged = dict(spec.mapping)
+        merged.update(mapping or {})
+        return self.register(name, config, merged, replace=True)
+
+    def unregister(self, name: str):
+        """
+        Remove an architecture, e.g. one registered by a test or a plugin.
+
+        Architectures registered after it move up one row in the tables,
+        so arrays holding registry indices (PROCESSED_DTYPE records) must
+        not outlive the change. Interned element IDs are kept. Live
+        instances keep the removed definition.
+        """
+        spec = self.get(name)
+        del self._by_name[name]
+        self.specs.remove(spec)
+        for index, other in enumerate(self.specs):
+            other.index = index
+        ARCHITECTURE_CONFIGS.pop(name, None)
+        ELEMENT_MAPPINGS.pop(name, None)
+        self.version += 1
+        self._compile_tables()
+
+    def _mark_changed(self, spec: ArchitectureSpec, changed: Dict[str, bool]):
+        """Bump versions of the inputs that changed and patch the tables"""
+        if not any(changed.values()):
+            return
+        self.version += 1
+        spec.version = self.version
+        for dependency, did_change in changed.items():
+            if did_change:
+                spec.versions[dependency] += 1
+        if changed['mapping']:
+            n_elements = len(self.elements)
+            self._intern(spec.mapping)
+            if len(self.elements) != n_elements:
+                # New elements widen every architecture's tables
+                self._compile_tables()
+            else:
+                self._compile_row(spec)
+
+    def get(self, name: str) -> ArchitectureSpec:
+        """Compiled spec of an architecture (ValueError if unknown)"""
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise ValueError(f"Unknown architecture type: {name}") from None
+
+    def names(self) -> List[str]:
+        return [spec.name for spec in self.specs]
+
+    def index(self, name: str) -> int:
+        """Row of an architecture in the position and distance tables"""
+        return self.get(name).index
+
+    def __contains__(self, name) -> bool:
+        return name in self._by_name
+
+    def element_id(self, element: str) -> int:
+        """Interned element ID (0 for unmapped elements)"""
+        return self._element_ids.get(element, 0)
+
+    def _intern(self, elements):
+        """Assign IDs to new elements; existing IDs never change"""
+        for element in elements:
+            if element not in self._element_ids:
+                self.elements.append(element)
+                self._element_ids[element] = len(self.elements)
+
+    def _compile_tables(self):
+        """Rebuild the (architectures x elements) position and distance tables"""
+        positions = np.empty((len(self.specs), len(self.elements) + 1,
+                              len(DEFAULT_POSITION)))
+        positions[:] = DEFAULT_POSITION
+        for spec in self.specs:
+            for element, position in spec.mapping.items():
+                positions[spec.index, self._element_ids[element]] = position
+
+        deltas = positions[:, :, np.newaxis, :] - positions[:, np.newaxis, :, :]
+        distances = np.sqrt(np.sum(deltas ** 2, axis=-1))
+
+        positions.flags.writeable = False
+        distances.flags.writeable = False
+        self.positions = positions
+        self.distances = distances
+
+    def _compile_row(self, spec: ArchitectureSpec):
+        """Recompute one architecture's rows of the tables in place"""
+        row = np.empty(self.positions.shape[1:])
+        row[:] = DEFAULT_POSITION
+        for element, position in spec.mapping.items():
+            row[self._element_ids[element]] = position
+        deltas = row[:, np.newaxis, :] - row[np.newaxis, :, :]
+
+        for table, values in ((self.positions, row),
+                              (self.distances, np.sqrt(np.sum(deltas ** 2, axis=-1)))):
+            table.flags.writeable = True
+            table[spec.index] = values
+            table.flags.writeable = False
+
+
+REGISTRY = ArchitectureRegistry()
+
+for _style in [
+    IntegrationStyle('dynamic', kernels.integrate_dynamic, kernels.process_dynamic,
+                     kernels.process_batch_dynamic, kernels.plan_dynamic,
+                     # Peak when self is internal and time is external
+                     facecolor='wheat', landscape_peak=(0.8, 0.2),
+                     sample_plans=kernels.sample_plans_dynamic,
+                     integrate_pair=kernels.integrate_dynamic_pair),
+    IntegrationStyle('crystallized', kernels.integrate_crystallized,
+                     kernels.process_crystallized, kernels.process_batch_crystallized,
+                     kernels.plan_crystallized,
+                     # Peak when both are external
+                     facecolor='lightblue', landscape_peak=(0.2, 0.2),
+                     sample_plans=kernels.sample_plans_crystallized,
+                     integrate_params=('boundary_threshold',),
+                     integrate_pair=kernels.integrate_crystallized_pair),
+    IntegrationStyle('collapsed', kernels.integrate_collapsed, kernels.process_collapsed,
+                     kernels.process_batch_collapsed, kernels.plan_collapsed,
+                     # Peak when both are internal but unstable
+                     facecolor='lightgreen', landscape_peak=(0.8, 0.8),
+                     landscape_noise=0.2, sample_plans=kernels.sample_plans_collapsed,
+                     integrate_pair=kernels.integrate_collapsed_pair),
+]:
+    REGISTRY.register_style(_style)
+
+for _name, _config in list(ARCHITECTURE_CONFIGS.items()):
+    REGISTRY.register(_name, _config, ELEMENT_MAPPINGS.get(_name, {}))
+# Feature elements are interned too, so every known element has its own ID
+REGISTRY._intern(INTERNAL_FEATURES + EXTERNAL_FEATURES)
+REGISTRY._compile_tables()
+
+
+def register_architecture(name: str, config: Dict,
+                          mapping: Dict[str, Sequence[float]] = None,
+                          replace: bool = False) -> ArchitectureSpec:
+    """
+    Register a custom architecture; see ArchitectureRegistry.register.
+
+    Example:
+        register_architecture('BALANCED', {
+            'self_dimension': 'internal', 'time_dimension': 'external',
+            'integration_style': 'dynamic', 'processing_flexibility': 0.6,
+            'temporal_consistency': 0.7, 'planning_horizon': 14
+        }, mapping={'self': [0.5, 0.5], 'time': [0.3, 0.7]})
+    """
+    return REGISTRY.register(name, config, mapping, replace=replace)
+
+
+def update_architecture(name: str, mapping: Dict[str, Sequence[float]] = None,
+                        **config_changes) -> ArchitectureSpec:
+    """
+    Change part of a registered architecture at runtime; see
+    ArchitectureRegistry.update.
+
+    Example:
+        update_architecture('ASD', temporal_consistency=0.8)
+        update_architecture('NT', mapping={'time': [0.3, 0.7]})
+    """
+    return REGISTRY.update(name, mapping, **config_changes)
+
+
+def unregister_architecture(name: str):
+    """Remove a registered architecture; see ArchitectureRegistry.unregister"""
+    REGISTRY.unregister(name)
+
+
+def register_style(style: IntegrationStyle):
+    """Register a new integration style; see IntegrationStyle"""
+    REGISTRY.register_style(style)
+
+
+def get_architecture(name: str) -> ArchitectureSpec:
+    """Compiled spec of a registered architecture"""
+    return REGISTRY.get(name)
@@ -0,0 +1,122 @@
+"""
+Random number sources for stochastic architecture behavior.
+
+Architectures, integration engines and planning tasks accept an `rng`
+argument resolved by `resolve_rng`:
+
+- None: the global NumPy RNG (legacy behavior; honours np.random.seed,
+  but every caller serializes on the one shared state)
+- np.random.Generator: used as-is, shared by all threads using the instance
+- int or np.random.SeedSequence: each thread lazily gets its own Generator
+  spawned from the seed, so concurrent calls never touch shared RNG state
+"""
+
+import threading
+import numpy as np
+
+
+class ThreadLocalGenerator:
+    """
+    Lazily spawns one np.random.Generator per thread from a SeedSequence.
+
+    Streams are statistically independent. Which child stream a thread gets
+    depends on the order in which threads first draw, so runs are
+    reproducible per thread only when that order is deterministic.
+    """
+
+    def __init__(self, seed=None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self._local = threading.local()
+        self._spawn_lock = threading.Lock()
+
+    @property
+    def generator(self) -> np.random.Generator:
+        """Generator owned by the calling thread"""
+        try:
+            return self._local.generator
+        except AttributeError:
+            # Spawning mutates the SeedSequence, so it is the only locked step
+            with self._spawn_lock:
+                child = self.seed_sequence.spawn(1)[0]
+            self._local.generator = np.random.default_rng(child)
+            return self._local.generator
+
+
+def resolve_rng(rng=None):
+    """Resolve an `rng` argument to a random source (see module docstring)"""
+    if rng is None or rng is np.random:
+        return np.random
+    if isinstance(rng, (np.random.Generator, np.random.RandomState, ThreadLocalGenerator)):
+        return rng
+    return ThreadLocalGenerator(rng)
+
+
+def current_generator(source):
+    """Generator (or legacy np.random module) to draw from in this thread"""
+    if isinstance(source, ThreadLocalGenerator):
+        return source.generator
+    return source
+
+
+def rng_state(source) -> dict:
+    """
+    Snapshot of a random source's position (for checkpoints; see
+    restore_rng). For a ThreadLocalGenerator this is its SeedSequence and
+    the calling thread's generator; other threads' generators are not
+    captured.
+    """
+    if source is np.random:
+        return {'kind': 'global', 'state': np.random.get_state(legacy=False)}
+    if isinstance(source, np.random.RandomState):
+        return {'kind': 'random_state', 'state': source.get_state(legacy=False)}
+    if isinstance(source, np.random.Generator):
+        return {'kind': 'generator', 'state': source.bit_generator.state}
+    if isinstance(source, ThreadLocalGenerator):
+        sequence = source.seed_sequence
+        generator = getattr(source._local, 'generator', None)
+        return {
+            'kind': 'thread_local',
+            'entropy': sequence.entropy,
+            'spawn_key': list(sequence.spawn_key),
+            'pool_size': sequence.pool_size,
+            'n_children_spawned': sequence.n_children_spawned,
+            'generator': None if generator is None else generator.bit_generator.state
+        }
+    raise ValueError(f"Cannot snapshot random source {source!r}")
+
+
+def _generator(state: dict) -> np.random.Generator:
+    bit_generator = getattr(np.random, state['bit_generator'])()
+    bit_generator.state = state
+    return np.random.Generator(bit_generator)
+
+
+def restore_rng(state: dict):
+    """
+    Random source continuing exactly where rng_state left off. Restoring
+    a 'global' snapshot resets the global NumPy RNG.
+    """
+    kind = state['kind']
+    if kind == 'global':
+        np.random.set_state(state['state'])
+        return np.random
+    if kind == 'random_state':
+        source = np.random.RandomState()
+        source.set_state(state['state'])
+        return source
+    if kind == 'generator':
+        return _generator(state['state'])
+    if kind == 'thread_local':
+        entropy = state['entropy']
+        sequence = np.random.SeedSequence(
+            entropy.tolist() if isinstance(entropy, np.ndarray) else entropy,
+            spawn_key=tuple(state['spawn_key']), pool_size=state['pool_size'],
+            n_children_spawned=state['n_children_spawned'])
+        source = ThreadLocalGenerator(sequence)
+        if state['generator'] is not None:
+            source._local.generator = _generator(state['generator'])
+        return source
+    raise ValueError(f"Unknown random source snapshot {kind!r}")
@@ -1,13 +1,280 @@
 """
 Architecture simulator for running experiments.
+
+Advances whole populations of agents with structure-of-arrays state: every
+agent's self/time state lives in one array, and each architecture's
+integration kernel runs once per step over its contiguous slice of agents.
 """
 
+import os
+import numpy as np
+from typing import Dict, Sequence, Union
+from ..config import INTEGRATION_PARAMS
+from .dimensional_space import DimensionalSpace
+from .kernels import state_distance
+from .registry import get_architecture
+from .instrumentation import register_probes
+from .rng import rng_state, restore_rng
+
+Population = Union[Dict[str, int], Sequence[str]]
+
+
+class SimulationResult:
+    """
+    Output of a population simulation.
+
+    Attributes:
+        agent_types: (N,) architecture type of each agent
+        phi: (T, N) integration trajectories, or None if not recorded
+        mean_phi: (N,) mean integration strength per agent
+        stability: (N,) 1 - std of each agent's integration over time
+        n_steps: Number of simulated steps T
+    """
+
+    def __init__(self, agent_types: np.ndarray, phi, mean_phi: np.ndarray,
+                 stability: np.ndarray, n_steps: int):
+        self.agent_types = agent_types
+        self.phi = phi
+        self.mean_phi = mean_phi
+        self.stability = stability
+        self.n_steps = n_steps
+
+    @property
+    def n_agents(self) -> int:
+        return len(self.agent_types)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean integration and stability per architecture type"""
+        summary = {}
+        for arch in dict.fromkeys(self.agent_types.tolist()):
+            mask = self.agent_types == arch
+            summary[arch] = {
+                'agents': int(mask.sum()),
+                'mean_phi': float(self.mean_phi[mask].mean()),
+                'stability': float(self.stability[mask].mean())
+            }
+        return summary
+
+
 class ArchitectureSimulator:
-    """Placeholder for architecture simulation capabilities"""
-    
-    def __init__(self):
-        pass
+    """
+    Vectorized population simulator for mixed NT/ASD/ADHD agents.
+
+    Agents start from their architecture's self and time positions in
+    dimensional space. Each step optionally jitters those states, then
+    computes Φ for every agent with the same kernels IntegrationEngine uses,
+    so a deterministic agent's trajectory matches a standalone engine's.
+    ADHD noise is drawn from the simulator's own Generator rather than the
+    global NumPy RNG.
+    """
+
+    def __init__(self, population: Population = None, state_noise: float = 0.0,
+                 seed=None):
+        """
+        Initialize simulator.
+
+        Args:
+            population: Agent counts per type (e.g. {'NT': 800, 'ADHD': 200})
+                or one architecture type per agent
+            state_noise: Std of Gaussian jitter applied to self/time states
+                at each step (0 keeps states fixed)
+            seed: Seed or np.random.Generator for stochastic kernels
+        """
+        self.space = DimensionalSpace()
+        self.state_noise = state_noise
+        self.seed = seed
+        self.population = population
+
+    def _expand_population(self, population: Population):
+        """
+        Turn a population spec into per-agent architecture codes.
+        
+        Returns:
+            (names, codes) where codes[i] indexes names for agent i
+        """
+        if population is None:
+            raise ValueError("No population given to simulate")
+        if isinstance(population, dict):
+            names = list(population)
+            codes = np.repeat(np.arange(len(names)), list(population.values()))
+        else:
+            names, codes = np.unique(np.asarray(population, dtype=str),
+                                     return_inverse=True)
+            names = names.tolist()
+        for arch in names:
+            get_architecture(arch)  # Raises ValueError for unregistered types
+        return names, codes.ravel()
     
-    def simulate(self):
-        """Run simulation"""
-        pass
+    def simulate(self, n_steps: int = 100, population: Population = None,
+                 record: bool = True, seed=None, checkpoint: str = None,
+                 checkpoint_every: int = 1000) -> SimulationResult:
+        """
+        Run simulation.
+
+        Args:
+            n_steps: Number of integration steps T
+            population: Overrides the population given at construction
+            record: Keep full (T, N) Φ trajectories; if False only running
+                statistics are kept, so memory is O(N)
+            seed: Overrides the seed given at construction
+            checkpoint: Checkpoint file, rewritten every `checkpoint_every`
+                steps on a background thread and once more at the end (see
+                resume). Recorded trajectories are written as they are
+                computed to a side file, `<checkpoint stem>.phi.npy`
+            checkpoint_every: Steps between checkpoints
+
+        Returns:
+            SimulationResult with per-agent trajectories and stability
+        """
+        names, codes = self._expand_population(
+            population if population is not None else self.population
+        )
+        rng = np.random.default_rng(seed if seed is not None else self.seed)
+        return self._run(names, codes, n_steps, record, rng, None, checkpoint,
+                         checkpoint_every)
+
+    @classmethod
+    def resume(cls, path: str, checkpoint_every: int = None) -> SimulationResult:
+        """
+        Continue a simulation from its checkpoint. The result is identical
+        to that of the uninterrupted run.
+
+        Args:
+            path: Checkpoint written by simulate(checkpoint=...); it keeps
+                being updated as the run continues
+            checkpoint_every: Overrides the saved checkpoint interval
+
+        Raises:
+            ValueError: If an architecture of the population or the
+                integration params have changed since the checkpoint was
+                written
+        """
+        from .checkpoint import check_fingerprints, load_checkpoint
+
+        state = load_checkpoint(path)
+        if state.get('kind') != 'simulation':
+            raise ValueError(f"{path} is not a simulation checkpoint")
+        check_fingerprints(state['fingerprints'])
+        if state['params'] != INTEGRATION_PARAMS:
+            raise ValueError("Integration params have changed since the checkpoint "
+                             "was written; resuming would not reproduce the run")
+        names, codes = state['names'], state['codes']
+        simulator = cls(np.asarray(names)[codes].tolist(), state['state_noise'])
+        return simulator._run(names, codes, state['n_steps'], state['record'],
+                              restore_rng(state['rng']), state, path,
+                              checkpoint_every or state['checkpoint_every'])
+
+    def _run(self, names, codes: np.ndarray, n_steps: int, record: bool, rng,
+             saved: Dict = None, checkpoint: str = None,
+             checkpoint_every: int = 1000) -> SimulationResult:
+        """Step loop of simulate(), optionally continuing a saved state"""
+        params = INTEGRATION_PARAMS
+        n_agents = len(codes)
+        
+        # Group agents by architecture so each kernel runs on a contiguous
+        # slice, with structure-of-arrays state: one row per agent
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes, minlength=len(names))
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        base_self = np.empty((n_agents, 2))
+        base_time = np.empty((n_agents, 2))
+        groups = []
+        for code, arch in enumerate(names):
+            agents = slice(int(bounds[code]), int(bounds[code + 1]))
+            base_self[agents], base_time[agents] = self.space.positions(['self', 'time'], arch)
+            groups.append((get_architecture(arch).integrate, agents))
+        distance = state_distance(base_self, base_time)
+        
+        phi_steps = None
+        trajectory = None
+        if record and checkpoint is not None:
+            # Rows go straight to a file next to the checkpoint, so a
+            # checkpoint only has to record how many of them are final. The
+            # checkpoint names the file relative to itself, so the pair can
+            # be moved together
+            directory = os.path.dirname(os.path.abspath(checkpoint))
+            if saved is not None:
+                trajectory = saved['trajectory']
+                phi_steps = np.lib.format.open_memmap(os.path.join(directory, trajectory),
+                                                      mode='r+')
+                if phi_steps.shape != (n_steps, n_agents):
+                    raise ValueError(f"{trajectory} does not match the checkpointed run")
+            else:
+                trajectory = os.path.basename(os.path.splitext(checkpoint)[0]) + '.phi.npy'
+                phi_steps = np.lib.format.open_memmap(os.path.join(directory, trajectory),
+                                                      mode='w+', shape=(n_steps, n_agents))
+        elif record:
+            phi_steps = np.empty((n_steps, n_agents))
+        phi = np.empty(n_agents)
+        mean = np.zeros(n_agents)
+        m2 = np.zeros(n_agents)
+        start = 0
+        if saved is not None:
+            # Rows of the trajectory past the checkpoint are overwritten
+            start = saved['step']
+            mean[:], m2[:] = saved['mean'], saved['m2']
+
+        writer = None
+        if checkpoint is not None:
+            from .checkpoint import CheckpointWriter
+            if checkpoint_every < 1:
+                raise ValueError("checkpoint_every must be at least 1")
+            # The writer thread flushes the trajectory before each write,
+            # so a checkpoint never points past rows on disk
+            writer = CheckpointWriter(checkpoint,
+                                      before_write=phi_steps.flush if record else None)
+            fixed = {
+                'kind': 'simulation', 'names': list(names),
+                'codes': np.asarray(codes), 'n_steps': n_steps, 'record': record,
+                'state_noise': self.state_noise, 'checkpoint_every': checkpoint_every,
+                'params': dict(params), 'trajectory': trajectory,
+                'fingerprints': {arch: get_architecture(arch).fingerprint()
+                                 for arch in names}
+            }
+
+            def snapshot(step):
+                return dict(fixed, step=step, rng=rng_state(rng), mean=mean.copy(),
+                            m2=m2.copy())
+
+        try:
+            for step in range(start, n_steps):
+                if self.state_noise > 0:
+                    jitter = rng.normal(0, self.state_noise, (2, n_agents, 2))
+                    distance = state_distance(base_self + jitter[0], base_time + jitter[1])
+
+                for integrate, agents in groups:
+                    phi[agents] = integrate(distance[agents], step, params, rng)
+
+                if record:
+                    phi_steps[step] = phi
+                # Welford update of per-agent moments
+                delta = phi - mean
+                mean += delta / (step + 1)
+                m2 += delta * (phi - mean)
+
+                if writer is not None and (step + 1) % checkpoint_every == 0 \
+                        and step + 1 < n_steps:
+                    writer.submit(snapshot(step + 1))
+            if writer is not None:
+                writer.submit(snapshot(n_steps))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        # Restore the caller's agent order
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(n_agents)
+        stability = 1.0 - np.sqrt(m2 / max(n_steps, 1))
+        if n_steps < 2:
+            stability[:] = 1.0
+
+        return SimulationResult(
+            agent_types=np.asarray(names)[codes],
+            phi=phi_steps[:, inverse] if record else None,
+            mean_phi=mean[inverse],
+            stability=stability[inverse],
+            n_steps=n_steps
+        )
+
+
+register_probes(ArchitectureSimulator, ['simulate'])
@@ -0,0 +1,204 @@
+"""
+Asyncio streaming pipeline for live information events.
+
+Records from an async iterator are gathered into micro-batches, run through
+CognitiveArchitecture.process_batch and IntegrationEngine.compute_integration_batch,
+and handed to the consumer through a bounded queue. When the consumer falls
+behind the queue fills up and the pipeline stops pulling from the source.
+"""
+
+import asyncio
+import json
+import numpy as np
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Sequence
+from .architecture import CognitiveArchitecture
+from .integration import IntegrationEngine
+from .instrumentation import register_probes
+
+_DONE = object()
+
+
+def record_states(records: List[Dict[str, Any]], key: str, default: np.ndarray,
+                  numbers: Sequence[int] = None) -> np.ndarray:
+    """
+    (n, d) state array from the `key` entry of each record, falling back
+    to a default row for records without one.
+
+    Args:
+        records: Records, as dicts
+        key: Entry holding the state
+        default: State of records without the entry
+        numbers: Numbers naming the records in errors (e.g. input line
+            numbers); positions counted from 1 by default
+
+    Raises:
+        ValueError: If an entry is not a list of d numbers
+    """
+    d = len(default)
+    if all(key not in record for record in records):
+        return np.broadcast_to(default, (len(records), d))
+    values = [record.get(key, default) for record in records]
+    try:
+        states = np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        states = None
+    # null entries convert to NaN rather than failing
+    if states is None or states.shape != (len(records), d) or np.isnan(states).any():
+        for number, value in zip(numbers or range(1, len(values) + 1), values):
+            try:
+                state = np.asarray(value, dtype=float)
+            except (TypeError, ValueError):
+                state = None
+            if state is None or state.shape != (d,) or np.isnan(state).any():
+                raise ValueError(f"Record {number} has an invalid {key}: expected a "
+                                 f"list of {d} numbers, got {json.dumps(value, default=repr)}")
+    return states
+
+
+class _Failed:
+    """Queue marker carrying an exception from the producer"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StreamingPipeline:
+    """
+    Micro-batching stage between an event stream and its consumers.
+
+    A batch is flushed when it reaches `batch_size` records or when its
+    oldest record has waited `max_latency` seconds, whichever comes first.
+    Larger batches raise throughput; a lower latency bound trims tail
+    latency on slow streams.
+    """
+
+    def __init__(self, architecture: CognitiveArchitecture,
+                 engine: IntegrationEngine = None, integrate: bool = True,
+                 batch_size: int = 256, max_latency: float = 0.01,
+                 max_pending_batches: int = 4, executor=None):
+        """
+        Args:
+            architecture: Architecture that processes every record
+            engine: Integration engine; defaults to a new engine of the
+                architecture's type when `integrate` is True
+            integrate: Whether to compute Φ for each record
+            batch_size: Maximum records per micro-batch
+            max_latency: Maximum seconds a record waits for its batch to fill
+            max_pending_batches: Capacity of the output queue, in batches
+            executor: Optional concurrent.futures executor to run batch
+                processing off the event loop
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if max_latency < 0:
+            raise ValueError(f"max_latency must be non-negative, got {max_latency}")
+
+        self.architecture = architecture
+        if engine is None and integrate:
+            engine = IntegrationEngine(architecture.type, rng=architecture.rng)
+        self.engine = engine if integrate else None
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.max_pending_batches = max_pending_batches
+        self.executor = executor
+
+    async def run(self, source: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream processed records.
+
+        Args:
+            source: Async iterable of information records (dicts). Records
+                may carry 'self_state'/'time_state' vectors; otherwise the
+                architecture's own self and time positions are integrated.
+
+        Yields:
+            Input records extended with the architecture's batch columns
+            (see CognitiveArchitecture.process_batch) and 'phi'
+        """
+        queue = asyncio.Queue(maxsize=self.max_pending_batches)
+        producer = asyncio.ensure_future(self._produce(source, queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failed):
+                    raise item.error
+                for record in item:
+                    yield record
+        finally:
+            if not producer.done():
+                producer.cancel()
+
+    async def _produce(self, source, queue: asyncio.Queue):
+        """Pull from the source, micro-batch, process and enqueue"""
+        loop = asyncio.get_running_loop()
+        iterator = source.__aiter__()
+        pending = None
+        batch = []
+        deadline = None
+        try:
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(iterator.__anext__())
+                timeout = max(deadline - loop.time(), 0) if batch else None
+                done, _ = await asyncio.wait({pending}, timeout=timeout)
+
+                if pending in done:
+                    try:
+                        record = pending.result()
+                    except StopAsyncIteration:
+                        pending = None
+                        break
+                    pending = None
+                    if not batch:
+                        deadline = loop.time() + self.max_latency
+                    batch.append(record)
+                    if len(batch) < self.batch_size:
+                        continue
+
+                # Batch is full or its latency budget ran out
+                await queue.put(await self._process(loop, batch))
+                batch = []
+
+            if batch:
+                await queue.put(await self._process(loop, batch))
+            await queue.put(_DONE)
+        except Exception as error:
+            await queue.put(_Failed(error))
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _process(self, loop, batch: List[Dict[str, Any]]):
+        if self.executor is None:
+            return self.process_records(batch)
+        return await loop.run_in_executor(self.executor, self.process_records, batch)
+
+    def process_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process one micro-batch of records synchronously"""
+        n = len(records)
+        columns = self.architecture.process_batch(
+            {'content': [record.get('content') for record in records]}
+        )
+        del columns['content']
+
+        if self.engine is not None:
+            columns['phi'] = self.engine.compute_integration_batch(
+                record_states(records, 'self_state', self.architecture.self_position),
+                record_states(records, 'time_state', self.architecture.time_position)
+            )
+
+        # Convert each column to Python values once, then stitch records
+        names = list(columns)
+        values = [columns[name].tolist() for name in names]
+        processed = []
+        for i, record in enumerate(records):
+            output = dict(record)
+            for name, column in zip(names, values):
+                output[name] = column[i]
+            processed.append(output)
+        return processed
+
+
+register_probes(StreamingPipeline, ['process_records'])
@@ -0,0 +1,349 @@
+"""
+Vectorized parameter sweeps.
+
+A sweep evaluates the Φ kernels over a grid of integration parameters
+(e.g. 'boundary_threshold') and architecture config entries (e.g.
+'processing_flexibility', 'temporal_consistency', 'planning_horizon').
+The grid is an extra leading array axis: each architecture's kernel runs
+once per step over all of its grid points together, instead of one engine
+per point in nested loops. A kernel is evaluated only over the parameters
+its style reads (IntegrationStyle.integrate_params); results are broadcast
+along every other axis rather than recomputed.
+
+Results can be memoized on disk (see SweepCache), keyed by a content hash
+of the architecture, the run settings, the parameter values and the code
+version, so repeated or extended sweeps only compute new grid points.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+import numpy as np
+from typing import Dict, List, Mapping, Sequence, Union
+from ..config import INTEGRATION_PARAMS
+from .dimensional_space import DimensionalSpace
+from .kernels import state_distance
+from .registry import ArchitectureSpec, IntegrationStyle, get_architecture
+
+SWEEP_FORMAT = 1
+
+_code_versions: Dict[str, str] = {}
+
+
+def code_version(style: IntegrationStyle) -> str:
+    """
+    Hash of the code a sweep result depends on: the TIDE version, this
+    module and the module defining the style's integrate kernel.
+    """
+    module = inspect.getmodule(style.integrate)
+    label = getattr(module, '__name__', None) or getattr(style.integrate, '__qualname__', '')
+    if label not in _code_versions:
+        from .. import __version__
+        digest = hashlib.sha256(f"{__version__}/{SWEEP_FORMAT}".encode())
+        for source in (sys.modules[__name__], module):
+            try:
+                digest.update(inspect.getsource(source).encode())
+            except (OSError, TypeError):
+                digest.update(label.encode())
+        _code_versions[label] = digest.hexdigest()
+    return _code_versions[label]
+
+
+class SweepCache:
+    """
+    On-disk memo of swept grid points.
+
+    Each architecture and run setting (see run_sweep) gets one .npz file
+    under `path`, named by the content hash of the run. It holds the
+    values of the parameters the kernel reads for every computed point,
+    together with their results.
+
+    Args:
+        path: Cache directory (created on first write)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _file(self, run_key: str) -> str:
+        return os.path.join(self.path, f'{run_key}.npz')
+
+    def load(self, run_key: str) -> Dict[tuple, tuple]:
+        """Point values -> (mean_phi, stability) stored for a run"""
+        path = self._file(run_key)
+        if not os.path.exists(path):
+            return {}
+        with np.load(path) as stored:
+            return {tuple(point): (phi, stability) for point, phi, stability in zip(
+                stored['points'].tolist(), stored['mean_phi'].tolist(),
+                stored['stability'].tolist())}
+
+    def store(self, run_key: str, points: np.ndarray, mean_phi: np.ndarray,
+              stability: np.ndarray):
+        """Add computed points to a run's file"""
+        entries = self.load(run_key)
+        entries.update(zip(map(tuple, points.tolist()),
+                           zip(mean_phi.tolist(), stability.tolist())))
+        os.makedirs(self.path, exist_ok=True)
+        stored_points = np.asarray(list(entries), dtype=np.float64).reshape(
+            len(entries), points.shape[1])
+        results = np.asarray(list(entries.values()), dtype=np.float64)
+        # Written aside and renamed, so readers never see a partial file
+        temporary = self._file(run_key) + f'.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            np.savez(f, points=stored_points, mean_phi=results[:, 0],
+                     stability=results[:, 1])
+        os.replace(temporary, self._file(run_key))
+
+    def clear(self):
+        """Remove every memoized run"""
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.path, name))
+
+
+class SweepResult:
+    """
+    Output of a parameter sweep.
+
+    Attributes:
+        architectures: Swept architecture types, in order
+        axes: Parameter name -> grid values, in axis order
+        mean_phi: (A, *grid) mean integration per architecture and grid
+            point (over agents and steps)
+        stability: (A, *grid) mean per-agent stability (1 - std of Φ)
+        computed: Grid points whose kernels were evaluated
+        cached: Grid points read from the on-disk memo
+    """
+
+    def __init__(self, architectures: List[str], axes: Dict[str, np.ndarray],
+                 mean_phi: np.ndarray, stability: np.ndarray, computed: int,
+                 cached: int):
+        self.architectures = architectures
+        self.axes = axes
+        self.mean_phi = mean_phi
+        self.stability = stability
+        self.computed = computed
+        self.cached = cached
+
+    @property
+    def shape(self) -> tuple:
+        return self.mean_phi.shape
+
+    def point(self, architecture: str, **coordinates) -> Dict[str, float]:
+        """
+        Results at one grid point.
+
+        Args:
+            architecture: Swept architecture type
+            **coordinates: A grid value for every axis
+        """
+        index = [self.architectures.index(architecture)]
+        for name, values in self.axes.items():
+            matches = np.flatnonzero(values == coordinates[name])
+            if not len(matches):
+                raise ValueError(f"{coordinates[name]!r} is not on the {name} axis")
+            index.append(int(matches[0]))
+        index = tuple(index)
+        return {'mean_phi': float(self.mean_phi[index]),
+                'stability': float(self.stability[index])}
+
+    def as_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Long-format table, one row per architecture and grid point (e.g.
+        for tide.core.columnar.save_columns or a pandas DataFrame)
+        """
+        mesh = np.meshgrid(np.arange(len(self.architectures)), *self.axes.values(),
+                           indexing='ij')
+        columns = {'architecture': np.asarray(self.architectures)[mesh[0].ravel()]}
+        columns.update((name, values.ravel()) for name, values in zip(self.axes, mesh[1:]))
+        columns['mean_phi'] = self.mean_phi.ravel()
+        columns['stability'] = self.stability.ravel()
+        return columns
+
+    def __repr__(self) -> str:
+        return (f"SweepResult(architectures={self.architectures}, "
+                f"axes={ {name: len(values) for name, values in self.axes.items()} }, "
+                f"computed={self.computed}, cached={self.cached})")
+
+
+def _name_key(name: str) -> int:
+    return int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], 'little')
+
+
+def _architecture_seed(seed: int, name: str) -> np.random.SeedSequence:
+    """Seed of one architecture's run, independent of the other architectures swept"""
+    return np.random.SeedSequence(seed, spawn_key=(_name_key(name),))
+
+
+def _point_seed(seed: int, name: str, point: np.ndarray) -> np.random.SeedSequence:
+    """Seed of one grid point's kernel noise, independent of the other points swept"""
+    keys = np.asarray(point, dtype=np.float64).view(np.uint64).tolist()
+    return np.random.SeedSequence(seed, spawn_key=(_name_key(name), *keys))
+
+
+def _point_params(used: Sequence[str], points: np.ndarray) -> Dict:
+    """INTEGRATION_PARAMS with the swept entries as (points, 1) columns"""
+    params = dict(INTEGRATION_PARAMS)
+    for column, name in enumerate(used):
+        params[name] = points[:, column, np.newaxis]
+    return params
+
+
+def _draws_noise(spec: ArchitectureSpec, distance: np.ndarray, params: Dict) -> bool:
+    """Whether the kernel draws from the generator it is given"""
+    probe = np.random.default_rng(0)
+    state = probe.bit_generator.state
+    spec.integrate(distance, 0, params, probe)
+    return probe.bit_generator.state != state
+
+
+def _simulate_points(spec: ArchitectureSpec, used: Sequence[str], points: np.ndarray,
+                     n_steps: int, n_agents: int, state_noise: float, seed: int):
+    """
+    Run one architecture's kernel over every point.
+
+    Points form the leading axis of the (points, agents) state. State
+    jitter is drawn once per step from the architecture's stream and shared
+    by all points (common random numbers). A kernel that draws no noise of
+    its own then runs once per step over all points together. A kernel
+    that does draw noise runs point by point, each point drawing from a
+    generator seeded by its parameter values. Either way a point's result
+    does not depend on which other points are computed alongside it, which
+    is what makes memoizing points sound.
+    """
+    rng = np.random.default_rng(_architecture_seed(seed, spec.name))
+    base_self, base_time = DimensionalSpace().positions(['self', 'time'], spec.name)
+    shape = (len(points), n_agents)
+
+    distance = np.broadcast_to(state_distance(base_self, base_time), shape)
+    if _draws_noise(spec, distance[:1], _point_params(used, points[:1])):
+        runs = [(slice(index, index + 1), _point_params(used, points[index:index + 1]),
+                 np.random.default_rng(_point_seed(seed, spec.name, points[index])))
+                for index in range(len(points))]
+    else:
+        runs = [(slice(None), _point_params(used, points), rng)]
+    phi = np.empty(shape)
+    mean = np.zeros(shape)
+    m2 = np.zeros(shape)
+    for step in range(n_steps):
+        if state_noise > 0:
+            jitter = rng.normal(0, state_noise, (2, n_agents, 2))
+            distance = np.broadcast_to(
+                state_distance(base_self + jitter[0], base_time + jitter[1]), shape)
+        for rows, params, generator in runs:
+            phi[rows] = spec.integrate(distance[rows], step, params, generator)
+        # Welford update of per-agent moments
+        delta = phi - mean
+        mean += delta / (step + 1)
+        m2 += delta * (phi - mean)
+
+    stability = 1.0 - np.sqrt(m2 / max(n_steps, 1))
+    if n_steps < 2:
+        stability[:] = 1.0
+    return mean.mean(axis=1), stability.mean(axis=1)
+
+
+def _check_axes(grid: Mapping[str, Sequence[float]],
+                specs: Sequence[ArchitectureSpec]) -> Dict[str, np.ndarray]:
+    axes = {}
+    for name, values in grid.items():
+        if name not in INTEGRATION_PARAMS and not all(name in spec.config for spec in specs):
+            raise ValueError(f"{name!r} is neither an integration parameter nor a "
+                             f"config entry of every swept architecture")
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 1 or not len(values):
+            raise ValueError(f"Grid values for {name!r} must be a non-empty 1-D sequence")
+        if len(np.unique(values)) != len(values):
+            raise ValueError(f"Grid values for {name!r} repeat")
+        axes[name] = values
+    return axes
+
+
+def run_sweep(grid: Mapping[str, Sequence[float]],
+              architectures: Sequence[str] = ('NT', 'ASD', 'ADHD'),
+              n_steps: int = 100, n_agents: int = 1, state_noise: float = 0.0,
+              seed: int = 0, cache: Union[str, SweepCache] = None) -> SweepResult:
+    """
+    Sweep integration and config parameters for several architectures.
+
+    Each grid point runs `n_agents` agents for `n_steps` steps from the
+    architecture's self and time positions, as ArchitectureSimulator does,
+    with the point's parameters in place of INTEGRATION_PARAMS and the
+    architecture config.
+
+    Args:
+        grid: Parameter name -> values; axes follow the mapping's order.
+            Names are INTEGRATION_PARAMS keys or config entries.
+        architectures: Registered architecture types
+        n_steps: Steps per grid point
+        n_agents: Agents per grid point
+        state_noise: Std of Gaussian jitter applied to self/time states
+        seed: Integer seed; each architecture uses its own stream
+        cache: Directory or SweepCache memoizing computed points
+
+    Returns:
+        SweepResult with (A, *grid) result arrays
+    """
+    if not isinstance(seed, (int, np.integer)):
+        raise ValueError("Sweeps need an integer seed so results can be memoized")
+    specs = [get_architecture(name) for name in architectures]
+    axes = _check_axes(grid, specs)
+    if isinstance(cache, str):
+        cache = SweepCache(cache)
+    grid_shape = tuple(len(values) for values in axes.values())
+    names = list(axes)
+
+    mean_phi = np.empty((len(specs),) + grid_shape)
+    stability = np.empty_like(mean_phi)
+    computed = cached = 0
+    for row, spec in enumerate(specs):
+        # Only the parameters the kernel reads span the points it runs on;
+        # the results are broadcast along every other axis
+        used = spec.style.integrate_params
+        used_values = [axes[name] if name in axes else
+                       np.asarray([INTEGRATION_PARAMS[name]], dtype=np.float64)
+                       for name in used]
+        points = np.stack([values.ravel() for values in
+                           np.meshgrid(*used_values, indexing='ij')], axis=-1) \
+            if used else np.empty((1, 0))
+        phi = np.empty(len(points))
+        stab = np.empty(len(points))
+
+        stored, run_key = {}, None
+        if cache is not None:
+            run_key = hashlib.sha256(json.dumps({
+                'code': code_version(spec.style),
+                'style': spec.style.name,
+                'params': list(used),
+                'positions': DimensionalSpace().positions(['self', 'time'],
+                                                          spec.name).tolist(),
+                'n_steps': n_steps, 'n_agents': n_agents,
+                'state_noise': state_noise, 'seed': int(seed)
+            }, sort_keys=True).encode()).hexdigest()
+            stored = cache.load(run_key)
+        missing = []
+        for index, point in enumerate(points.tolist()):
+            if tuple(point) in stored:
+                phi[index], stab[index] = stored[tuple(point)]
+            else:
+                missing.append(index)
+        cached += len(points) - len(missing)
+        if missing:
+            phi[missing], stab[missing] = _simulate_points(
+                spec, used, points[missing], n_steps, n_agents, state_noise, seed)
+            computed += len(missing)
+            if cache is not None:
+                cache.store(run_key, points[missing], phi[missing], stab[missing])
+
+        swept = [name for name in used if name in axes]
+        order = sorted(range(len(swept)), key=lambda i: names.index(swept[i]))
+        shape = [len(axes[name]) if name in swept else 1 for name in names]
+        for out, values in ((mean_phi, phi), (stability, stab)):
+            values = values.reshape([len(axes[name]) for name in swept]).transpose(order)
+            out[row] = np.broadcast_to(values.reshape(shape), grid_shape)
+
+    return SweepResult(list(architectures), axes, mean_phi, stability, computed, cached)
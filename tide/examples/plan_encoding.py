@@ -0,0 +1,136 @@
+"""
+Compact bitset encoding of week plans.
+
+Every distinct activity string is interned into one bit of a uint64, so a
+day's activity set is a single integer and a run of simulated weeks is a
+(weeks x days) array. Set operations become bitwise operations and the
+Jaccard similarity of two days is popcount(a & b) / popcount(a | b), which
+lets plan consistency over very many weeks be evaluated in one NumPy pass.
+"""
+
+import numpy as np
+from typing import Dict, List, Sequence
+
+# Day axis of encoded plans; 'TODAY' is used by immediate planners
+PLAN_DAYS = ('TODAY', 'Monday', 'Tuesday', 'Wednesday', 'Thursday',
+             'Friday', 'Saturday', 'Sunday')
+
+MAX_ACTIVITIES = 64
+
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(codes: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a uint64 array"""
+    codes = np.asarray(codes, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(codes)
+    per_byte = _BYTE_POPCOUNT[np.ascontiguousarray(codes).view(np.uint8)]
+    return per_byte.reshape(codes.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+class PlanEncoder:
+    """
+    Interns activity strings into bit positions.
+
+    Bits are assigned in first-seen order and never change, so codes from
+    the same encoder can always be compared.
+    """
+
+    def __init__(self, days: Sequence[str] = PLAN_DAYS):
+        self.days = tuple(days)
+        self._day_index = {day: i for i, day in enumerate(self.days)}
+        self.activities: List[str] = []
+        self._bits: Dict[str, int] = {}
+
+    def bit(self, activity: str) -> np.uint64:
+        """Bit mask of an activity, interning it if new"""
+        index = self._bits.get(activity)
+        if index is None:
+            if len(self.activities) >= MAX_ACTIVITIES:
+                raise ValueError(f"Plan vocabulary exceeds {MAX_ACTIVITIES} activities")
+            index = len(self.activities)
+            self.activities.append(activity)
+            self._bits[activity] = index
+        return np.uint64(1) << np.uint64(index)
+
+    def encode_day(self, activities: Sequence[str]) -> np.uint64:
+        code = np.uint64(0)
+        for activity in activities:
+            code |= self.bit(activity)
+        return code
+
+    def encode(self, plans: Sequence[Dict[str, List[str]]]) -> 'EncodedPlans':
+        """Encode week plans (day -> activities) into an EncodedPlans"""
+        codes = np.zeros((len(plans), len(self.days)), dtype=np.uint64)
+        present = np.zeros(codes.shape, dtype=bool)
+        for week, plan in enumerate(plans):
+            for day, activities in plan.items():
+                if day not in self._day_index:
+                    raise ValueError(f"Unknown plan day: {day}")
+                column = self._day_index[day]
+                codes[week, column] = self.encode_day(activities)
+                present[week, column] = True
+        return EncodedPlans(codes, present, self)
+
+    def decode_day(self, code) -> List[str]:
+        """Activities whose bits are set in a day code (in interning order)"""
+        code = int(code)
+        return [activity for i, activity in enumerate(self.activities)
+                if code >> i & 1]
+
+
+class EncodedPlans:
+    """
+    A run of encoded weeks.
+
+    Attributes:
+        codes: (weeks x days) uint64 activity bitsets
+        present: (weeks x days) whether each week planned each day at all;
+            absent days have code 0 and are skipped when comparing plans
+        encoder: PlanEncoder holding the activity vocabulary
+    """
+
+    def __init__(self, codes: np.ndarray, present: np.ndarray, encoder: PlanEncoder):
+        self.codes = codes
+        self.present = present
+        self.encoder = encoder
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self, week: int) -> Dict[str, List[str]]:
+        """Week plan as a day -> activities dict"""
+        return {day: self.encoder.decode_day(code)
+                for day, code, present in zip(self.encoder.days, self.codes[week],
+                                              self.present[week])
+                if present}
+
+
+def plan_similarity(codes1: np.ndarray, present1: np.ndarray,
+                    codes2: np.ndarray, present2: np.ndarray) -> np.ndarray:
+    """
+    Mean per-day Jaccard similarity of encoded plans.
+
+    Inputs broadcast against each other over the leading axes; the last axis
+    is days. As in TemporalPlanningTask._compare_plans, only days both plans
+    contain with a non-empty union are compared, and plans with no such day
+    have similarity 0.
+    """
+    union = popcount(codes1 | codes2)
+    compared = present1 & present2 & (union > 0)
+    shared = popcount(codes1 & codes2)
+    per_day = np.divide(shared, union, out=np.zeros(union.shape), where=compared)
+    n_compared = compared.sum(axis=-1)
+    return np.divide(per_day.sum(axis=-1), n_compared,
+                     out=np.zeros(n_compared.shape), where=n_compared > 0)
+
+
+def plan_consistency(plans: EncodedPlans) -> float:
+    """Mean similarity of every later week to the first (one NumPy pass)"""
+    if len(plans) < 2:
+        raise ValueError("Plan consistency needs at least two weeks")
+    similarity = plan_similarity(plans.codes[:1], plans.present[:1],
+                                 plans.codes[1:], plans.present[1:])
+    return float(similarity.mean())
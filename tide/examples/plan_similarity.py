@@ -0,0 +1,204 @@
+"""
+All-pairs similarity of encoded week plans.
+
+Similarities are evaluated in (block x block) tiles, so memory stays
+bounded whatever the number of plans. Simulated plans repeat heavily (a
+deterministic planner produces one plan, immediate planning a few hundred),
+so each distinct plan is compared only once: when the distinct plans are
+few enough, their similarity matrix is computed up front and every tile is
+a gather from it, and top-k queries rank plan groups instead of plans.
+"""
+
+import numpy as np
+from typing import Iterator, Sequence, Tuple
+from .plan_encoding import EncodedPlans, plan_similarity
+
+# Largest number of distinct plans whose full similarity matrix is cached
+MAX_CACHED_PLANS = 2048
+
+
+def concatenate_plans(runs: Sequence[EncodedPlans]) -> EncodedPlans:
+    """Stack runs of encoded plans that share one encoder"""
+    encoder = runs[0].encoder
+    if any(run.encoder is not encoder for run in runs):
+        raise ValueError("Encoded plans must share an encoder to be compared")
+    return EncodedPlans(np.concatenate([run.codes for run in runs]),
+                        np.concatenate([run.present for run in runs]),
+                        encoder)
+
+
+class PlanSimilarity:
+    """
+    Jaccard similarity between every pair of N encoded plans.
+
+    Args:
+        plans: Encoded plans (see TemporalPlanningTask.sample_plans); use
+            concatenate_plans to combine architectures
+        block_size: Tile edge; a tile costs about block_size**2 * (8 + days * 8)
+            bytes while it is computed
+    """
+
+    def __init__(self, plans: EncodedPlans, block_size: int = 512):
+        if block_size < 1:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        self.plans = plans
+        self.block_size = block_size
+
+        # Group identical plans; absent days are part of a plan's identity
+        keys = np.concatenate([plans.codes, plans.present.astype(np.uint64)], axis=1)
+        unique, self.groups = np.unique(keys, axis=0, return_inverse=True)
+        self.groups = self.groups.ravel()
+        days = plans.codes.shape[1]
+        self._unique_codes = unique[:, :days]
+        self._unique_present = unique[:, days:].astype(bool)
+
+        self._group_matrix = None
+        if len(unique) <= MAX_CACHED_PLANS:
+            self._group_matrix = self._compare(self._unique_codes, self._unique_present,
+                                               self._unique_codes, self._unique_present)
+
+    def __len__(self) -> int:
+        return len(self.plans)
+
+    @property
+    def n_distinct(self) -> int:
+        """Number of distinct plans"""
+        return len(self._unique_codes)
+
+    def _compare(self, codes1, present1, codes2, present2) -> np.ndarray:
+        """Similarity of every plan in one set to every plan in another, blockwise"""
+        out = np.empty((len(codes1), len(codes2)))
+        block = self.block_size
+        for i in range(0, len(codes1), block):
+            for j in range(0, len(codes2), block):
+                out[i:i + block, j:j + block] = plan_similarity(
+                    codes1[i:i + block, np.newaxis], present1[i:i + block, np.newaxis],
+                    codes2[np.newaxis, j:j + block], present2[np.newaxis, j:j + block])
+        return out
+
+    def tile(self, rows: slice, cols: slice) -> np.ndarray:
+        """Similarities between plans[rows] and plans[cols]"""
+        if self._group_matrix is not None:
+            return self._group_matrix[self.groups[rows, np.newaxis],
+                                      self.groups[np.newaxis, cols]]
+        codes, present = self.plans.codes, self.plans.present
+        return plan_similarity(codes[rows, np.newaxis], present[rows, np.newaxis],
+                               codes[np.newaxis, cols], present[np.newaxis, cols])
+
+    def tiles(self) -> Iterator[Tuple[slice, slice, np.ndarray]]:
+        """Yield (rows, cols, tile) covering the full N x N matrix"""
+        n, block = len(self), self.block_size
+        for i in range(0, n, block):
+            for j in range(0, n, block):
+                rows, cols = slice(i, min(i + block, n)), slice(j, min(j + block, n))
+                yield rows, cols, self.tile(rows, cols)
+
+    def matrix(self, out: np.ndarray = None, dtype=np.float64) -> np.ndarray:
+        """
+        Full N x N similarity matrix.
+
+        Args:
+            out: Preallocated (N, N) array to fill, e.g. an np.memmap when
+                the matrix does not fit in memory
+            dtype: dtype of the allocated matrix when out is not given
+
+        Returns:
+            The filled matrix; each off-diagonal tile is computed once and
+            mirrored
+        """
+        n, block = len(self), self.block_size
+        if out is None:
+            out = np.empty((n, n), dtype=dtype)
+        elif out.shape != (n, n):
+            raise ValueError(f"Expected an ({n}, {n}) output, got shape {out.shape}")
+        for i in range(0, n, block):
+            rows = slice(i, min(i + block, n))
+            for j in range(i, n, block):
+                cols = slice(j, min(j + block, n))
+                tile = self.tile(rows, cols)
+                out[rows, cols] = tile
+                if i != j:
+                    out[cols, rows] = tile.T
+        return out
+
+    def top_k(self, k: int, queries: Sequence[int] = None,
+              exclude_self: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k most similar plans to each query plan.
+
+        The full matrix is never materialized. Ties between equally
+        similar plans are broken arbitrarily.
+
+        Args:
+            k: Neighbors per query
+            queries: Query plan indices (defaults to every plan)
+            exclude_self: Do not return a plan as its own neighbor
+
+        Returns:
+            (indices, scores), each (queries, k), most similar first
+        """
+        n = len(self)
+        queries = np.arange(n) if queries is None else np.asarray(queries, dtype=np.intp)
+        if not 1 <= k <= n - exclude_self:
+            raise ValueError(f"k must be between 1 and {n - exclude_self}, got {k}")
+        if self._group_matrix is not None:
+            indices = self._grouped_top_k(k, queries, exclude_self)
+            scores = self._group_matrix[self.groups[queries, np.newaxis],
+                                        self.groups[indices]]
+        else:
+            indices = self._blocked_top_k(k, queries, exclude_self)
+            codes, present = self.plans.codes, self.plans.present
+            scores = plan_similarity(codes[queries, np.newaxis], present[queries, np.newaxis],
+                                     codes[indices], present[indices])
+        return indices, scores
+
+    def _grouped_top_k(self, k: int, queries: np.ndarray, exclude_self: bool) -> np.ndarray:
+        """Rank groups of identical plans, then take members in rank order"""
+        members = np.argsort(self.groups, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(self.groups,
+                                                            minlength=self.n_distinct))])
+        # k + 1 leading candidates per query group, so the query itself can
+        # be dropped
+        width = k + exclude_self
+        candidates = np.empty((self.n_distinct, width), dtype=np.intp)
+        for group, similarity in enumerate(self._group_matrix):
+            chosen, count = [], 0
+            for other in np.argsort(-similarity, kind='stable'):
+                start = bounds[other]
+                chosen.append(members[start:min(bounds[other + 1], start + width - count)])
+                count += len(chosen[-1])
+                if count == width:
+                    break
+            candidates[group] = np.concatenate(chosen)
+
+        rows = candidates[self.groups[queries]]
+        if not exclude_self:
+            return rows
+        keep = rows != queries[:, np.newaxis]
+        keep[keep.all(axis=1), -1] = False
+        return rows[keep].reshape(len(queries), k)
+
+    def _blocked_top_k(self, k: int, queries: np.ndarray, exclude_self: bool) -> np.ndarray:
+        """Stream column tiles, keeping the running best k per query"""
+        n, block = len(self), self.block_size
+        out = np.empty((len(queries), k), dtype=np.intp)
+        codes, present = self.plans.codes, self.plans.present
+        for start in range(0, len(queries), block):
+            query = queries[start:start + block]
+            best_scores = np.full((len(query), k), -np.inf)
+            best_indices = np.zeros((len(query), k), dtype=np.intp)
+            for j in range(0, n, block):
+                cols = np.arange(j, min(j + block, n))
+                tile = plan_similarity(codes[query, np.newaxis], present[query, np.newaxis],
+                                       codes[np.newaxis, cols], present[np.newaxis, cols])
+                if exclude_self:
+                    tile[query[:, np.newaxis] == cols] = -np.inf
+                scores = np.concatenate([best_scores, tile], axis=1)
+                indices = np.concatenate([best_indices,
+                                          np.broadcast_to(cols, tile.shape)], axis=1)
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(scores, top, axis=1)
+                best_indices = np.take_along_axis(indices, top, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            out[start:start + block] = np.take_along_axis(best_indices, order, axis=1)
+        return out
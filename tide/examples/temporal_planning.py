@@ -7,6 +7,9 @@ import numpy as np
 from typing import List, Dict
 from datetime import datetime, timedelta
 from ..core.architecture import CognitiveArchitecture
+from ..core.rng import resolve_rng, current_generator
+from ..core.instrumentation import register_probes
+from .plan_encoding import PlanEncoder, EncodedPlans, plan_consistency
 
 class TemporalPlanningTask:
     """
@@ -14,11 +17,21 @@ class TemporalPlanningTask:
     Each architecture will show distinct planning strategies.
     """
     
-    def __init__(self, architecture_type: str):
-        self.architecture = CognitiveArchitecture(architecture_type)
+    def __init__(self, architecture_type: str, rng=None, encoder: PlanEncoder = None):
+        """
+        Args:
+            architecture_type: One of 'NT', 'ASD', 'ADHD'
+            rng: Random source - None (global NumPy RNG), an
+                np.random.Generator, or a seed for per-thread generators
+            encoder: PlanEncoder for sample_plans; share one between tasks
+                to compare their plans
+        """
+        self.rng = resolve_rng(rng)
+        self.architecture = CognitiveArchitecture(architecture_type, rng=self.rng)
         self.activities = [
             'work', 'exercise', 'social', 'rest', 'creative', 'chores'
         ]
+        self.encoder = PlanEncoder() if encoder is None else encoder
     
     def plan_week(self) -> Dict[str, List[str]]:
         """
@@ -27,12 +40,9 @@ class TemporalPlanningTask:
         Returns:
             Dictionary mapping days to planned activities
         """
-        if self.architecture.type == 'NT':
-            return self._flexible_planning()
-        elif self.architecture.type == 'ASD':
-            return self._systematic_planning()
-        elif self.architecture.type == 'ADHD':
-            return self._immediate_planning()
+        # Flexible (NT), systematic (ASD) or immediate (ADHD) planning,
+        # bound to the architecture at registration
+        return self.architecture._spec.plan(self)
     
     def _flexible_planning(self) -> Dict[str, List[str]]:
         """NT: Create flexible plan with room for adjustment"""
@@ -76,26 +86,75 @@ class TemporalPlanningTask:
     def _immediate_planning(self) -> Dict[str, List[str]]:
         """ADHD: Plan only for 'today', everything else is vague"""
         plan = {}
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                'Friday', 'Saturday', 'Sunday']
         
         # Detailed plan for "today" only
-        today_activities = np.random.choice(self.activities, 3, replace=False)
+        today_activities = current_generator(self.rng).choice(
+            self.activities, 3, replace=False
+        )
         plan['TODAY'] = [f"NOW: {today_activities[0]}", 
                         f"Maybe later: {today_activities[1]}", 
                         f"If time: {today_activities[2]}"]
         
         # Vague plans for other days
-        for day in days[1:]:
-            plan[day] = ['probably something', 'will figure it out']
+        plan.update(self._vague_days())
         
         return plan
     
-    def evaluate_plan_consistency(self, num_weeks: int = 4) -> float:
+    def _vague_days(self) -> Dict[str, List[str]]:
+        """ADHD: every day after today is vague"""
+        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
+                'Friday', 'Saturday', 'Sunday']
+        return {day: ['probably something', 'will figure it out'] for day in days[1:]}
+    
+    def sample_plans(self, num_weeks: int) -> EncodedPlans:
+        """
+        Plan many weeks at once, bitset-encoded.
+        
+        Deterministic planners encode their plan once and repeat it;
+        immediate planning draws every week's 'today' in one pass.
+        """
+        sample = self.architecture._spec.sample_plans
+        if sample is None:
+            return self.encoder.encode([self.plan_week() for _ in range(num_weeks)])
+        return sample(self, num_weeks, current_generator(self.rng))
+    
+    def _repeat_plan(self, plan: Dict[str, List[str]], num_weeks: int) -> EncodedPlans:
+        week = self.encoder.encode([plan])
+        return EncodedPlans(np.repeat(week.codes, num_weeks, axis=0),
+                            np.repeat(week.present, num_weeks, axis=0),
+                            self.encoder)
+    
+    def _sample_immediate_plans(self, num_weeks: int, generator) -> EncodedPlans:
+        """Vectorized _immediate_planning: a random ordered 3-subset per week"""
+        encoder = self.encoder
+        plans = self._repeat_plan(self._vague_days(), num_weeks)
+        
+        # Bits of every possible 'today' entry, by slot and activity
+        slot_bits = np.array([[encoder.bit(f"{prefix}{activity}")
+                               for activity in self.activities]
+                              for prefix in ('NOW: ', 'Maybe later: ', 'If time: ')],
+                             dtype=np.uint64)
+        picks = np.argsort(generator.random((num_weeks, len(self.activities))),
+                           axis=1)[:, :3]
+        today = encoder.days.index('TODAY')
+        plans.codes[:, today] = np.bitwise_or.reduce(
+            slot_bits[np.arange(3), picks], axis=1)
+        plans.present[:, today] = True
+        return plans
+    
+    def evaluate_plan_consistency(self, num_weeks: int = 4, encoded: bool = False) -> float:
         """
         Measure how consistent plans are across multiple weeks.
         ASD should show highest consistency.
+        
+        Args:
+            num_weeks: Weeks to plan
+            encoded: Sample bitset-encoded weeks and compare them in one
+                NumPy pass (suited to Monte Carlo over very many weeks)
         """
+        if encoded:
+            return plan_consistency(self.sample_plans(num_weeks))
+        
         plans = [self.plan_week() for _ in range(num_weeks)]
         
         # Simple consistency metric: how similar are the plans?
@@ -122,3 +181,8 @@ class TemporalPlanningTask:
                     days_compared += 1
         
         return total_similarity / days_compared if days_compared > 0 else 0
+
+
+register_probes(TemporalPlanningTask, [
+    'plan_week', 'sample_plans', 'evaluate_plan_consistency', '_compare_plans'
+])
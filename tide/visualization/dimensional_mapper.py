@@ -2,11 +2,28 @@
 Visualization tools for dimensional mapping of cognitive architectures.
 """
 
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import List, Dict
 from ..core.dimensional_space import DimensionalSpace
+from ..core.registry import get_architecture
+from .landscape import compute_integration_landscape
+
+STYLE = 'seaborn-v0_8-whitegrid'
+PALETTE = 'husl'
+
+
+def _styled(method):
+    """Build a figure under the mapper's style, leaving the global rcParams as they were"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with plt.style.context(STYLE):
+            sns.set_palette(PALETTE)
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class DimensionalMapper:
     """
@@ -15,13 +32,13 @@ class DimensionalMapper:
     
     def __init__(self):
         self.space = DimensionalSpace()
-        self.setup_style()
     
     def setup_style(self):
-        """Set up clean, scientific visualization style"""
-        plt.style.use('seaborn-v0_8-whitegrid')
-        sns.set_palette("husl")
+        """Set up clean, scientific visualization style for all later plots"""
+        plt.style.use(STYLE)
+        sns.set_palette(PALETTE)
     
+    @_styled
     def create_architecture_comparison(self, elements: List[str] = None):
         """
         Create comparison visualization of how elements map across architectures.
@@ -83,57 +100,36 @@ class DimensionalMapper:
         ax.axvline(x=0.5, color='gray', linestyle='--', alpha=0.5)
         
         # Add legend for critical elements
-        if architecture == 'NT':
-            ax.text(0.02, 0.98, 'Self: Internal\nTime: External', 
-                   transform=ax.transAxes, verticalalignment='top',
-                   bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-        elif architecture == 'ASD':
-            ax.text(0.02, 0.98, 'Self: External\nTime: External', 
-                   transform=ax.transAxes, verticalalignment='top',
-                   bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.5))
-        elif architecture == 'ADHD':
-            ax.text(0.02, 0.98, 'Self: Internal\nTime: Internal', 
-                   transform=ax.transAxes, verticalalignment='top',
-                   bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.5))
+        spec = get_architecture(architecture)
+        ax.text(0.02, 0.98, spec.legend, 
+               transform=ax.transAxes, verticalalignment='top',
+               bbox=dict(boxstyle='round', facecolor=spec.style.facecolor, alpha=0.5))
     
-    def create_integration_landscape(self):
+    @_styled
+    def create_integration_landscape(self, resolution: int = 20, seed=None):
         """
         Create 3D visualization of integration landscape for each architecture.
         Shows how self-time binding varies across dimensional space.
+        
+        Args:
+            resolution: Grid points per axis
+            seed: Seed for noisy landscapes (None uses the global NumPy RNG)
         """
         fig = plt.figure(figsize=(15, 5))
         
         architectures = ['NT', 'ASD', 'ADHD']
         for idx, arch in enumerate(architectures):
             ax = fig.add_subplot(1, 3, idx + 1, projection='3d')
-            self._plot_integration_landscape(ax, arch)
+            self._plot_integration_landscape(ax, arch, resolution, seed)
             ax.set_title(f'{arch} Integration Landscape', fontsize=14)
         
         plt.tight_layout()
         return fig
     
-    def _plot_integration_landscape(self, ax, architecture: str):
+    def _plot_integration_landscape(self, ax, architecture: str,
+                                    resolution: int = 20, seed=None):
         """Plot 3D integration landscape for single architecture"""
-        # Create grid
-        internal = np.linspace(0, 1, 20)
-        external = np.linspace(0, 1, 20)
-        I, E = np.meshgrid(internal, external)
-        
-        # Compute integration strength at each point
-        Z = np.zeros_like(I)
-        for i in range(20):
-            for j in range(20):
-                # Simulate integration based on architecture
-                if architecture == 'NT':
-                    # Peak when self is internal and time is external
-                    Z[i, j] = np.exp(-((I[i,j]-0.8)**2 + (E[i,j]-0.2)**2))
-                elif architecture == 'ASD':
-                    # Peak when both are external
-                    Z[i, j] = np.exp(-((I[i,j]-0.2)**2 + (E[i,j]-0.2)**2))
-                elif architecture == 'ADHD':
-                    # Peak when both are internal but unstable
-                    Z[i, j] = np.exp(-((I[i,j]-0.8)**2 + (E[i,j]-0.8)**2))
-                    Z[i, j] += 0.2 * np.random.normal()  # Add noise
+        I, E, Z = compute_integration_landscape(architecture, resolution, seed)
         
         # Create surface plot
         surf = ax.plot_surface(I, E, Z, cmap='viridis', alpha=0.8)
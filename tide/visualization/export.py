@@ -0,0 +1,166 @@
+"""
+Headless batch figure export.
+
+Renders many DimensionalMapper figures straight to files through
+off-screen canvases, optionally across a process pool. Worker processes
+switch to a headless backend; the calling process keeps its own (e.g. a
+notebook's inline backend) and renders each figure on an Agg canvas.
+Each process reuses one mapper, and every figure is closed as soon as it
+is saved, so memory stays flat however many figures are exported.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+# Figure kind -> DimensionalMapper method building it
+FIGURE_BUILDERS = {
+    'architecture_comparison': 'create_architecture_comparison',
+    'integration_landscape': 'create_integration_landscape',
+}
+
+EXPORT_FORMATS = ('png', 'svg', 'pdf')
+
+
+class FigureSpec:
+    """
+    One figure to render.
+
+    Args:
+        kind: Figure kind (see FIGURE_BUILDERS)
+        path: Output file; the format is taken from its extension
+        dpi: Output resolution
+        **options: Keyword arguments for the builder, e.g. elements for
+            'architecture_comparison' or resolution/seed for
+            'integration_landscape'
+    """
+
+    def __init__(self, kind: str, path: str, dpi: int = 100, **options):
+        if kind not in FIGURE_BUILDERS:
+            raise ValueError(f"Unknown figure kind: {kind}")
+        fmt = os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported figure format for {path!r}; "
+                             f"expected one of {EXPORT_FORMATS}")
+        self.kind = kind
+        self.path = path
+        self.format = fmt
+        self.dpi = dpi
+        self.options = options
+
+    def __repr__(self) -> str:
+        return f"FigureSpec({self.kind!r}, {self.path!r})"
+
+
+class ExportResult:
+    """
+    Timing of one exported figure.
+
+    Attributes:
+        path: File written
+        kind: Figure kind
+        build_seconds: Time spent building the figure
+        save_seconds: Time spent rendering and writing the file
+        pid: Process that rendered the figure
+    """
+
+    def __init__(self, path: str, kind: str, build_seconds: float,
+                 save_seconds: float, pid: int):
+        self.path = path
+        self.kind = kind
+        self.build_seconds = build_seconds
+        self.save_seconds = save_seconds
+        self.pid = pid
+
+    @property
+    def seconds(self) -> float:
+        return self.build_seconds + self.save_seconds
+
+    def as_dict(self) -> Dict:
+        return {'path': self.path, 'kind': self.kind,
+                'build_seconds': self.build_seconds,
+                'save_seconds': self.save_seconds,
+                'seconds': self.seconds, 'pid': self.pid}
+
+    def __repr__(self) -> str:
+        return f"ExportResult({self.path!r}, seconds={self.seconds:.4f})"
+
+
+# Per-process mapper, created by _init_worker or the first in-process export
+_mapper = None
+
+
+def _init_worker(backend: str = 'Agg'):
+    """Select the headless backend and create the mapper of a worker process"""
+    global _mapper
+    import matplotlib
+    matplotlib.use(backend, force=True)
+    from .dimensional_mapper import DimensionalMapper
+    _mapper = DimensionalMapper()
+
+
+def _render(spec: FigureSpec, offscreen: bool = False) -> ExportResult:
+    """
+    Build, save and close one figure (executed in a worker process, or
+    with `offscreen` in the calling process)
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    fig = getattr(_mapper, FIGURE_BUILDERS[spec.kind])(**spec.options)
+    if offscreen:
+        # Render on an Agg canvas instead of the process's own backend
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        FigureCanvasAgg(fig)
+    built = time.perf_counter()
+    try:
+        fig.savefig(spec.path, format=spec.format, dpi=spec.dpi, bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    saved = time.perf_counter()
+    return ExportResult(spec.path, spec.kind, built - start, saved - built, os.getpid())
+
+
+def export_figures(specs: Sequence[FigureSpec], workers: int = 1,
+                   chunksize: int = None, backend: str = 'Agg') -> List[ExportResult]:
+    """
+    Render figure specs to files.
+
+    Args:
+        specs: Figures to render
+        workers: Worker processes; 1 renders in the calling process, on
+            Agg canvases and without changing its backend
+        chunksize: Specs sent to a worker per task (defaults to an even
+            split into a few tasks per worker)
+        backend: Matplotlib backend of the worker processes
+
+    Returns:
+        ExportResult per spec, in spec order
+    """
+    specs = list(specs)
+    if workers <= 1:
+        global _mapper
+        if _mapper is None:
+            from .dimensional_mapper import DimensionalMapper
+            _mapper = DimensionalMapper()
+        return [_render(spec, offscreen=True) for spec in specs]
+
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(backend,)) as executor:
+        return list(executor.map(_render, specs, chunksize=chunksize))
+
+
+def summarize_timings(results: Sequence[ExportResult]) -> Dict[str, Dict[str, float]]:
+    """Per-kind figure count, mean and max render time in seconds"""
+    summary = {}
+    for kind in dict.fromkeys(result.kind for result in results):
+        seconds = [result.seconds for result in results if result.kind == kind]
+        summary[kind] = {
+            'count': len(seconds),
+            'mean_seconds': sum(seconds) / len(seconds),
+            'max_seconds': max(seconds)
+        }
+    return summary
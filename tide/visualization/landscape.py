@@ -0,0 +1,116 @@
+"""
+Integration landscape surfaces.
+
+Evaluates an architecture's integration landscape over a whole meshgrid at
+once, at any resolution, and keeps recently computed surfaces in an LRU
+cache so re-rendering a figure skips recomputation. Needs only NumPy, so
+surfaces can be computed headless and plotted elsewhere.
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional, Sequence
+from ..core.registry import get_architecture
+
+
+class Landscape(NamedTuple):
+    """Integration surface Z over the (internal, external) grid I, E"""
+    internal: np.ndarray
+    external: np.ndarray
+    strength: np.ndarray
+
+
+class LandscapeCache:
+    """Keyed LRU cache of computed landscapes"""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Landscape]:
+        landscape = self._entries.get(key)
+        if landscape is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return landscape
+
+    def put(self, key: Hashable, landscape: Landscape):
+        self._entries[key] = landscape
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+LANDSCAPE_CACHE = LandscapeCache()
+
+
+def compute_integration_landscape(architecture: str, resolution: int = 20,
+                                  seed=None, peak: Sequence[float] = None,
+                                  noise: float = None,
+                                  cache: LandscapeCache = LANDSCAPE_CACHE) -> Landscape:
+    """
+    Compute an architecture's integration landscape.
+
+    The surface is a Gaussian bump at the style's landscape peak plus, for
+    unstable styles, a noise field. Everything is evaluated as whole-grid
+    array operations.
+
+    Args:
+        architecture: Registered architecture type
+        resolution: Grid points per axis
+        seed: Seed for the noise field. None draws from the global NumPy
+            RNG (cell by cell in row-major order, as the original plotting
+            loop did) and such surfaces are never cached.
+        peak: Override the style's [internal, external] peak
+        noise: Override the style's noise level
+        cache: Cache to use; None disables caching
+
+    Returns:
+        Landscape of read-only (resolution, resolution) arrays
+    """
+    style = get_architecture(architecture).style
+    peak = tuple(float(x) for x in (style.landscape_peak if peak is None else peak))
+    noise = float(style.landscape_noise if noise is None else noise)
+    if resolution < 2:
+        raise ValueError(f"Resolution must be at least 2, got {resolution}")
+
+    # Noise-free surfaces do not depend on the seed
+    cacheable = cache is not None and (noise == 0 or seed is not None)
+    key = (architecture, resolution, seed if noise else None, peak, noise)
+    if cacheable:
+        landscape = cache.get(key)
+        if landscape is not None:
+            return landscape
+
+    axis = np.linspace(0, 1, resolution)
+    internal, external = np.meshgrid(axis, axis)
+    strength = np.exp(-((internal - peak[0]) ** 2 + (external - peak[1]) ** 2))
+    if noise:
+        if seed is None:
+            field = np.random.normal(size=strength.shape)
+        else:
+            field = np.random.default_rng(seed).standard_normal(strength.shape)
+        strength += noise * field
+
+    for array in (internal, external, strength):
+        array.flags.writeable = False
+    landscape = Landscape(internal, external, strength)
+    if cacheable:
+        cache.put(key, landscape)
+    return landscape